@@ -37,10 +37,18 @@ CREATE TABLE IF NOT EXISTS sources (
     uploaded_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
     processed_at TIMESTAMP WITH TIME ZONE,
     metadata JSONB DEFAULT '{}'::jsonb,
+    content_hash TEXT,
+    chunk_hashes TEXT[] NOT NULL DEFAULT '{}',
     CONSTRAINT sources_objective_name_unique UNIQUE (objective_id, name)
 );
 
+-- Store content uncompressed out of line: extraction reads it in windows with
+-- substring(), which only fetches the needed TOAST chunks when the value is not
+-- compressed (a compressed value is decompressed from the start for every window)
+ALTER TABLE sources ALTER COLUMN content SET STORAGE EXTERNAL;
+
 CREATE INDEX idx_sources_objective_id ON sources(objective_id);
+CREATE INDEX idx_sources_content_hash ON sources(content_hash);
 CREATE INDEX idx_sources_extraction_status ON sources(extraction_status);
 CREATE INDEX idx_sources_uploaded_at ON sources(uploaded_at DESC);
 
@@ -82,6 +90,152 @@ CREATE INDEX idx_chat_messages_created_at ON chat_messages(created_at DESC);
 CREATE INDEX idx_chat_messages_role ON chat_messages(role);
 CREATE INDEX idx_chat_messages_deleted_at ON chat_messages(deleted_at) WHERE deleted_at IS NULL;
 
+-- ============================================
+-- GRAPH STATS TABLE
+-- ============================================
+-- Per-objective entity and relationship counts by type, maintained by the graph
+-- write paths in the same transaction and rebuilt by the reconcile job
+CREATE TABLE IF NOT EXISTS graph_stats (
+    objective_id UUID NOT NULL REFERENCES objectives(id) ON DELETE CASCADE,
+    element_kind TEXT NOT NULL CHECK (element_kind IN ('ENTITY', 'RELATIONSHIP')),
+    element_type TEXT NOT NULL,
+    element_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (objective_id, element_kind, element_type)
+);
+
+-- ============================================
+-- ENTITY NAMES TABLE
+-- ============================================
+-- Relational mirror of Entity vertex names for indexed keyword, prefix and fuzzy
+-- search; kept in sync by the graph write paths in the same transaction
+CREATE TABLE IF NOT EXISTS entity_names (
+    entity_id UUID PRIMARY KEY,
+    name TEXT NOT NULL,
+    entity_type TEXT NOT NULL,
+    objective_ids UUID[] NOT NULL DEFAULT '{}'
+);
+
+CREATE INDEX idx_entity_names_name_trgm ON entity_names USING gin (lower(name) gin_trgm_ops);
+CREATE INDEX idx_entity_names_objective_ids ON entity_names USING gin (objective_ids);
+
+-- ============================================
+-- LLM CACHE TABLE
+-- ============================================
+-- Structured extraction outputs keyed by a hash of provider, model, temperature,
+-- prompt template and input text, so identical chunks skip the LLM; evicted
+-- least recently used first once the total size exceeds Settings.llm_cache_max_mb
+CREATE TABLE IF NOT EXISTS llm_cache (
+    cache_key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    response JSONB NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    hit_count BIGINT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    last_used_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX idx_llm_cache_last_used_at ON llm_cache(last_used_at);
+
+-- Lookup outcomes of every worker since the cache was created, including lookups
+-- of entries evicted since, so the hit rate covers all extraction processes
+CREATE TABLE IF NOT EXISTS llm_cache_counters (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    hits BIGINT NOT NULL DEFAULT 0,
+    misses BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO llm_cache_counters DEFAULT VALUES ON CONFLICT DO NOTHING;
+
+-- ============================================
+-- CHUNK EXTRACTIONS TABLE
+-- ============================================
+-- Entities and relationships extracted from a chunk, keyed by the chunk's content
+-- hash, so a chunk seen before (re-uploads, shared boilerplate) is linked to the
+-- new source without calling the LLM again. The model and prompt hash (provider,
+-- temperature, prompt templates and output schemas) are part of the key, so a
+-- changed extractor extracts again instead of reusing stale results
+CREATE TABLE IF NOT EXISTS chunk_extractions (
+    chunk_hash TEXT NOT NULL,
+    extraction_mode TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    entities JSONB NOT NULL,
+    relationships JSONB NOT NULL,
+    reuse_count BIGINT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    last_used_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (chunk_hash, extraction_mode, model, prompt_hash)
+);
+
+-- ============================================
+-- SOURCE CHUNKS TABLE
+-- ============================================
+-- Per-chunk extraction checkpoints, written in the transaction that writes the
+-- chunk to the graph; a resumed or retried extraction skips COMPLETED chunks and
+-- a removed chunk's (chunk_hash, extraction_mode) points at its stored results
+CREATE TABLE IF NOT EXISTS source_chunks (
+    source_id UUID NOT NULL REFERENCES sources(id) ON DELETE CASCADE,
+    chunk_hash TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    status TEXT NOT NULL CHECK (status IN ('COMPLETED', 'FAILED')),
+    extraction_mode TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (source_id, chunk_hash)
+);
+
+-- ============================================
+-- JOBS TABLE
+-- ============================================
+-- Durable background work (source extraction) claimed by worker processes with
+-- FOR UPDATE SKIP LOCKED, lowest priority value first (extraction uses the chunk
+-- count, so small sources finish first); a RUNNING job whose lease expired is
+-- claimable again
+CREATE TABLE IF NOT EXISTS jobs (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    kind TEXT NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    status TEXT NOT NULL DEFAULT 'QUEUED' CHECK (status IN ('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED')),
+    priority BIGINT NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    locked_by TEXT,
+    locked_until TIMESTAMP WITH TIME ZONE,
+    heartbeat_at TIMESTAMP WITH TIME ZONE,
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX idx_jobs_queued ON jobs(priority, run_after, created_at) WHERE status = 'QUEUED';
+CREATE INDEX idx_jobs_running_lease ON jobs(locked_until) WHERE status = 'RUNNING';
+-- At most one active job per source, so two workers never extract it at once
+CREATE UNIQUE INDEX idx_jobs_active_source ON jobs(kind, (payload->>'source_id'))
+    WHERE status IN ('QUEUED', 'RUNNING');
+
+-- ============================================
+-- OBJECTIVE COUNTERS TABLE
+-- ============================================
+-- One row per objective, maintained by the triggers below so objective stats are a
+-- primary-key read instead of a sources x sessions x messages join
+CREATE TABLE IF NOT EXISTS objective_counters (
+    objective_id UUID PRIMARY KEY REFERENCES objectives(id) ON DELETE CASCADE,
+    source_count BIGINT NOT NULL DEFAULT 0,
+    completed_sources BIGINT NOT NULL DEFAULT 0,
+    failed_sources BIGINT NOT NULL DEFAULT 0,
+    session_count BIGINT NOT NULL DEFAULT 0,
+    message_count BIGINT NOT NULL DEFAULT 0,
+    last_processed_at TIMESTAMP WITH TIME ZONE,
+    last_chat_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
 -- ============================================
 -- TRIGGERS FOR UPDATED_AT
 -- ============================================
@@ -98,27 +252,161 @@ CREATE TRIGGER update_objectives_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- ============================================
+-- TRIGGERS FOR OBJECTIVE COUNTERS
+-- ============================================
+CREATE OR REPLACE FUNCTION objective_counters_on_objective()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO objective_counters (objective_id) VALUES (NEW.id)
+    ON CONFLICT (objective_id) DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER objective_counters_objective_insert
+    AFTER INSERT ON objectives
+    FOR EACH ROW
+    EXECUTE FUNCTION objective_counters_on_objective();
+
+-- Subtract the old row's contribution and add the new one's
+CREATE OR REPLACE FUNCTION objective_counters_on_source()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE objective_counters SET
+            source_count = source_count - 1,
+            completed_sources = completed_sources - (OLD.extraction_status = 'COMPLETED')::int,
+            failed_sources = failed_sources - (OLD.extraction_status = 'FAILED')::int,
+            updated_at = NOW()
+        WHERE objective_id = OLD.objective_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE objective_counters SET
+            source_count = source_count + 1,
+            completed_sources = completed_sources + (NEW.extraction_status = 'COMPLETED')::int,
+            failed_sources = failed_sources + (NEW.extraction_status = 'FAILED')::int,
+            last_processed_at = GREATEST(last_processed_at, NEW.processed_at),
+            updated_at = NOW()
+        WHERE objective_id = NEW.objective_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER objective_counters_source_insert_delete
+    AFTER INSERT OR DELETE ON sources
+    FOR EACH ROW
+    EXECUTE FUNCTION objective_counters_on_source();
+
+CREATE TRIGGER objective_counters_source_update
+    AFTER UPDATE OF objective_id, extraction_status, processed_at ON sources
+    FOR EACH ROW
+    EXECUTE FUNCTION objective_counters_on_source();
+
+CREATE OR REPLACE FUNCTION objective_counters_on_session()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE objective_counters SET
+            session_count = session_count + 1,
+            last_chat_at = GREATEST(last_chat_at, NEW.last_message_at),
+            updated_at = NOW()
+        WHERE objective_id = NEW.objective_id;
+        RETURN NULL;
+    ELSIF TG_OP = 'UPDATE' THEN
+        UPDATE objective_counters SET
+            last_chat_at = GREATEST(last_chat_at, NEW.last_message_at),
+            updated_at = NOW()
+        WHERE objective_id = NEW.objective_id;
+        RETURN NULL;
+    END IF;
+    -- BEFORE DELETE: the cascade removes the session's messages after the session row is
+    -- gone, when their own trigger can no longer resolve the objective, so count them here
+    UPDATE objective_counters SET
+        session_count = session_count - 1,
+        message_count = message_count - (
+            SELECT COUNT(*) FROM chat_messages
+            WHERE session_id = OLD.id AND deleted_at IS NULL
+        ),
+        updated_at = NOW()
+    WHERE objective_id = OLD.objective_id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER objective_counters_session_insert
+    AFTER INSERT ON chat_sessions
+    FOR EACH ROW
+    EXECUTE FUNCTION objective_counters_on_session();
+
+CREATE TRIGGER objective_counters_session_update
+    AFTER UPDATE OF last_message_at ON chat_sessions
+    FOR EACH ROW
+    EXECUTE FUNCTION objective_counters_on_session();
+
+CREATE TRIGGER objective_counters_session_delete
+    BEFORE DELETE ON chat_sessions
+    FOR EACH ROW
+    EXECUTE FUNCTION objective_counters_on_session();
+
+-- Only messages that are not soft-deleted count
+CREATE OR REPLACE FUNCTION objective_counters_on_message()
+RETURNS TRIGGER AS $$
+DECLARE
+    delta INT := 0;
+    session_id_ UUID;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.deleted_at IS NULL THEN
+        delta := delta - 1;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.deleted_at IS NULL THEN
+        delta := delta + 1;
+    END IF;
+    IF delta <> 0 THEN
+        session_id_ := CASE WHEN TG_OP = 'DELETE' THEN OLD.session_id ELSE NEW.session_id END;
+        UPDATE objective_counters oc SET
+            message_count = message_count + delta,
+            updated_at = NOW()
+        FROM chat_sessions cs
+        WHERE cs.id = session_id_ AND oc.objective_id = cs.objective_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER objective_counters_message_insert_delete
+    AFTER INSERT OR DELETE ON chat_messages
+    FOR EACH ROW
+    EXECUTE FUNCTION objective_counters_on_message();
+
+CREATE TRIGGER objective_counters_message_update
+    AFTER UPDATE OF deleted_at ON chat_messages
+    FOR EACH ROW
+    EXECUTE FUNCTION objective_counters_on_message();
+
 -- ============================================
 -- VIEWS FOR ANALYTICS
 -- ============================================
 
--- Objective statistics view
+-- Objective statistics view (counters are maintained by triggers, see above)
 CREATE OR REPLACE VIEW objective_stats AS
 SELECT
     o.id,
     o.name,
     o.status,
-    COUNT(DISTINCT s.id) AS source_count,
-    COUNT(DISTINCT s.id) FILTER (WHERE s.extraction_status = 'COMPLETED') AS completed_sources,
-    COUNT(DISTINCT s.id) FILTER (WHERE s.extraction_status = 'FAILED') AS failed_sources,
-    COUNT(DISTINCT cs.id) AS session_count,
-    COUNT(DISTINCT cm.id) AS message_count,
-    MAX(s.processed_at) AS last_processed_at,
-    MAX(cs.last_message_at) AS last_chat_at
+    oc.source_count,
+    oc.completed_sources,
+    oc.failed_sources,
+    oc.session_count,
+    oc.message_count,
+    oc.last_processed_at,
+    oc.last_chat_at,
+    (SELECT COALESCE(SUM(gs.element_count), 0) FROM graph_stats gs
+     WHERE gs.objective_id = o.id AND gs.element_kind = 'ENTITY') AS entity_count,
+    (SELECT COALESCE(SUM(gs.element_count), 0) FROM graph_stats gs
+     WHERE gs.objective_id = o.id AND gs.element_kind = 'RELATIONSHIP') AS relationship_count
 FROM objectives o
-LEFT JOIN sources s ON o.id = s.objective_id
-LEFT JOIN chat_sessions cs ON o.id = cs.objective_id
-LEFT JOIN chat_messages cm ON cs.id = cm.session_id AND cm.deleted_at IS NULL
-GROUP BY o.id, o.name, o.status;
+JOIN objective_counters oc ON oc.objective_id = o.id;
 
 \echo 'Database schema created successfully'
@@ -3,9 +3,10 @@ Conversation Agent for KETA.
 """
 
 import logging
-from typing import Any
+from typing import Any, Optional
 from uuid import UUID
 
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
 
 from packages.agents.base import BaseAgent
@@ -26,14 +27,15 @@ class ConversationAgent(BaseAgent):
     Agent for answering questions using the knowledge graph.
     """
 
-    def __init__(self, db_pool: DatabasePool) -> None:
+    def __init__(self, db_pool: DatabasePool, llm: Optional[BaseChatModel] = None) -> None:
         """
         Initialize the conversation agent.
 
         Args:
             db_pool: Database connection pool
+            llm: Language model (optional, will create default if not provided)
         """
-        super().__init__(name="ConversationAgent", db_pool=db_pool)
+        super().__init__(name="ConversationAgent", db_pool=db_pool, llm=llm)
 
         # Initialize graph repository and tools
         self.graph_repo = KnowledgeGraphRepository(db_pool, self.settings.graph_name)
@@ -4,40 +4,108 @@ Extraction Agent for KETA.
 
 import logging
 from datetime import datetime
-from typing import Any, Optional
-from uuid import UUID, uuid4
+from typing import Any, AsyncIterable, AsyncIterator, Optional
+from uuid import UUID
+
+from langchain_core.language_models import BaseChatModel
 
 from packages.agents.base import BaseAgent
+from packages.agents.pipeline import Pipeline, PipelineStage
+from packages.agents.scheduler import LLMScheduler
 from packages.agents.state import AgentState
-from packages.agents.tools.extraction import EntityExtractor, RelationshipExtractor
+from packages.agents.tools.extraction import (
+    EntityExtractionOutput,
+    EntityExtractor,
+    JointExtractionOutput,
+    JointExtractor,
+    RelationshipExtractionOutput,
+    RelationshipExtractor,
+)
+from packages.agents.tools.llm_cache import LLMResponseCache, extractor_fingerprint
+from packages.graph.identity import entity_id_for
 from packages.graph.repository import KnowledgeGraphRepository
+from packages.shared.config import ExtractionMode
 from packages.shared.database import DatabasePool
+from packages.shared.repositories.chunk_extractions import ChunkExtractionsRepository
+from packages.shared.repositories.llm_cache import LLMCacheRepository
+from packages.shared.repositories.objectives import ObjectivesRepository
+from packages.shared.repositories.source_chunks import (
+    CHUNK_COMPLETED,
+    CHUNK_FAILED,
+    SourceChunksRepository,
+)
 from packages.shared.repositories.sources import SourcesRepository
-from packages.shared.text_processing import chunk_text_iterator, extract_text_snippet
+from packages.shared.text_processing import (
+    content_hash,
+    extract_text_snippet,
+    stream_source_chunks,
+)
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of resolved chunks written in one transaction
+WRITE_BATCH_CHUNKS = 8
+
+# Maximum number of chunk hashes looked up in chunk_extractions per query
+LOOKUP_BATCH_CHUNKS = 64
+
+# Characters read for the document node's snippet
+SNIPPET_LENGTH = 500
+
 
 class ExtractionAgent(BaseAgent):
     """
     Agent for extracting entities and relationships from text documents.
     """
 
-    def __init__(self, db_pool: DatabasePool) -> None:
+    def __init__(self, db_pool: DatabasePool, llm: Optional[BaseChatModel] = None) -> None:
         """
         Initialize the extraction agent.
 
         Args:
             db_pool: Database connection pool
+            llm: Language model (optional, will create default if not provided)
         """
-        super().__init__(name="ExtractionAgent", db_pool=db_pool)
+        super().__init__(name="ExtractionAgent", db_pool=db_pool, llm=llm)
 
         # Initialize tools
-        self.entity_extractor = EntityExtractor(self.llm)
-        self.relationship_extractor = RelationshipExtractor(self.llm)
+        self.llm_cache: Optional[LLMResponseCache] = None
+        if self.settings.llm_cache_enabled:
+            self.llm_cache = LLMResponseCache(
+                LLMCacheRepository(db_pool),
+                self.llm,
+                max_bytes=self.settings.llm_cache_max_mb * 1024 * 1024,
+            )
+        # One LLM call budget for every source this agent extracts at the same time
+        self.llm_scheduler = LLMScheduler(self.settings.llm_concurrency)
+
+        # LLM failures surface so the chunk is checkpointed as failed and retried
+        self.entity_extractor = EntityExtractor(
+            self.llm, cache=self.llm_cache, raise_errors=True
+        )
+        self.relationship_extractor = RelationshipExtractor(
+            self.llm, cache=self.llm_cache, raise_errors=True
+        )
+        self.joint_extractor = JointExtractor(self.llm, cache=self.llm_cache, raise_errors=True)
+        # Stored chunk extractions are reused only for the same model and prompts
+        self.extractor_fingerprints = {
+            ExtractionMode.TWO_CALL: extractor_fingerprint(
+                self.llm,
+                [
+                    (self.entity_extractor.prompt, EntityExtractionOutput),
+                    (self.relationship_extractor.prompt, RelationshipExtractionOutput),
+                ],
+            ),
+            ExtractionMode.JOINT: extractor_fingerprint(
+                self.llm, [(self.joint_extractor.prompt, JointExtractionOutput)]
+            ),
+        }
 
         # Initialize repositories
         self.sources_repo = SourcesRepository(db_pool)
+        self.objectives_repo = ObjectivesRepository(db_pool)
+        self.chunk_extractions_repo = ChunkExtractionsRepository(db_pool)
+        self.source_chunks_repo = SourceChunksRepository(db_pool)
         self.graph_repo = KnowledgeGraphRepository(db_pool, self.settings.graph_name)
 
         logger.info("ExtractionAgent initialized with entity and relationship extractors")
@@ -46,6 +114,13 @@ class ExtractionAgent(BaseAgent):
         """
         Execute extraction on a source document.
 
+        Chunks checkpointed as COMPLETED for this source are skipped, so a
+        resumed or retried run only extracts the chunks that failed or were
+        never reached, and edited content only the chunks that changed.
+        Checkpointed chunks no longer in the content are retracted from the
+        graph. Chunks whose extraction fails are checkpointed as FAILED and
+        fail the source once the others are written.
+
         Args:
             state: Agent state with source_id
 
@@ -61,43 +136,26 @@ class ExtractionAgent(BaseAgent):
             return self._add_error(state, "No source_id provided")
 
         try:
-            # Load source
-            source = await self.sources_repo.get_by_id(source_id)
+            # Load source; the content is streamed from the database chunk by chunk
+            source = await self.sources_repo.get_without_content(source_id)
             if not source:
                 return self._add_error(state, f"Source {source_id} not found")
 
-            # Update status to PROCESSING
-            await self.sources_repo.update_extraction_status(
-                source_id,
-                "PROCESSING",
-                {
-                    "current_stage": "chunking",
-                    "total_chunks": 0,
-                    "processed_chunks": 0,
-                    "entities_extracted": 0,
-                    "relationships_extracted": 0,
-                },
-            )
-
-            # Extract content
-            content = source["content"]
             source_name = source["name"]
+            objective_id = source["objective_id"]
+            # Chunk count of the content as uploaded, until the stream is through
+            expected_chunks = source["chunk_count"]
 
-            # Chunk the document
-            chunks = list(
-                chunk_text_iterator(content, self.settings.max_chunk_size, overlap=500)
-            )
-            total_chunks = len(chunks)
-
-            self._log_execution(f"Split document into {total_chunks} chunks")
+            # Skip chunks an earlier run of this source already wrote to the graph
+            completed = await self.source_chunks_repo.get_completed(source_id)
 
-            # Update progress
+            # Update status to PROCESSING
             await self.sources_repo.update_extraction_status(
                 source_id,
                 "PROCESSING",
                 {
                     "current_stage": "extracting_entities",
-                    "total_chunks": total_chunks,
+                    "total_chunks": expected_chunks,
                     "processed_chunks": 0,
                     "entities_extracted": 0,
                     "relationships_extracted": 0,
@@ -105,125 +163,66 @@ class ExtractionAgent(BaseAgent):
             )
 
             # Create document node in graph
-            snippet = extract_text_snippet(content, 500)
+            head = await self.sources_repo.get_content_slice(source_id, 0, SNIPPET_LENGTH + 1)
             await self.graph_repo.create_document(
                 doc_id=source_id,
                 title=source_name,
                 chunk_index=0,  # Simplified for POC - treat as single doc
-                text_snippet=snippet,
-            )
-
-            # Track all entities and relationships
-            all_entities = []
-            all_relationships = []
-            entity_name_to_id = {}  # Map entity names to IDs for relationship creation
-
-            # Process each chunk
-            for chunk_index, chunk_text in chunks:
-                self._log_execution(f"Processing chunk {chunk_index + 1}/{total_chunks}")
-
-                # Extract entities from chunk
-                entities = await self.entity_extractor.extract(chunk_text)
-
-                # Store entities in graph
-                for entity in entities:
-                    # Check if entity already exists (by name)
-                    existing = await self.graph_repo.find_entity_by_name(entity["name"])
-
-                    if existing and "id" in existing:
-                        entity_id = UUID(existing["id"])
-                        logger.info(f"Entity '{entity['name']}' already exists")
-                    else:
-                        # Create new entity
-                        entity_id = UUID(entity["id"])
-                        await self.graph_repo.create_entity(
-                            entity_id=entity_id,
-                            name=entity["name"],
-                            entity_type=entity["type"],
-                            source_ids=[source_id],
-                            confidence=entity["confidence"],
-                            extraction_method=entity["extraction_method"],
-                        )
-
-                        # Link to document
-                        await self.graph_repo.link_entity_to_document(
-                            entity_id=entity_id,
-                            doc_id=source_id,
-                            chunk_index=0,
-                            mention_count=1,
-                        )
-
-                        # Link to source for provenance
-                        await self.graph_repo.link_entity_to_source(
-                            entity_id=entity_id,
-                            doc_id=source_id,
-                            chunk_index=0,
-                            confidence=entity["confidence"],
-                            extraction_method=entity["extraction_method"],
-                        )
-
-                    # Track for relationship extraction
-                    entity_name_to_id[entity["name"]] = entity_id
-                    all_entities.append(entity)
+                text_snippet=extract_text_snippet(head, SNIPPET_LENGTH),
+            )
 
-                # Extract relationships from chunk
-                if len(entities) >= 2:
-                    relationships = await self.relationship_extractor.extract(
-                        chunk_text, entities
-                    )
+            # Run the chunks through the extraction pipeline as they are read
+            mode = await self._extraction_mode(objective_id)
+            self._log_execution(f"Extraction mode: {mode.value}")
+            run = _ExtractionRun(
+                self,
+                source_id,
+                objective_id,
+                expected_chunks,
+                mode,
+                completed=completed,
+                priority=state.get("priority", expected_chunks),
+            )
+            await run.execute(
+                stream_source_chunks(self.sources_repo.iter_content(source_id), self.settings)
+            )
+            total_chunks = run.total_chunks
+            self._log_execution(
+                f"Split document into {total_chunks} chunks, "
+                f"{run.skipped_chunks} already completed"
+            )
 
-                    # Store relationships in graph
-                    for rel in relationships:
-                        entity1_name = rel["entity1_name"]
-                        entity2_name = rel["entity2_name"]
-
-                        # Get entity IDs
-                        entity1_id = entity_name_to_id.get(entity1_name)
-                        entity2_id = entity_name_to_id.get(entity2_name)
-
-                        if entity1_id and entity2_id:
-                            await self.graph_repo.create_relationship(
-                                entity1_id=entity1_id,
-                                entity2_id=entity2_id,
-                                relationship_type=rel["relationship_type"],
-                                description=rel["description"],
-                                source_ids=[source_id],
-                                confidence=rel["confidence"],
-                            )
-                            all_relationships.append(rel)
-
-                # Update progress
+            removed = {h: m for h, m in completed.items() if h not in run.chunk_hashes}
+            if removed:
+                kept = {h: completed.get(h) or mode.value for h in run.chunk_hashes}
+                await self._retract_removed_chunks(source_id, removed, kept, mode)
+
+            progress = run.progress()
+            if run.failed_chunks:
+                # The written chunks stay checkpointed; a retry extracts only the failed ones
+                index, error = run.failed_chunks[0]
+                message = (
+                    f"{len(run.failed_chunks)} of {total_chunks} chunks failed "
+                    f"(chunk {index}: {error})"
+                )
                 await self.sources_repo.update_extraction_status(
-                    source_id,
-                    "PROCESSING",
-                    {
-                        "current_stage": "extracting_entities",
-                        "total_chunks": total_chunks,
-                        "processed_chunks": chunk_index + 1,
-                        "entities_extracted": len(all_entities),
-                        "relationships_extracted": len(all_relationships),
-                    },
+                    source_id, "FAILED", {"current_stage": "failed", **progress}, error=message
                 )
+                return self._add_error(state, f"Extraction failed: {message}")
 
             # Mark as completed
             await self.sources_repo.update_extraction_status(
-                source_id,
-                "COMPLETED",
-                {
-                    "current_stage": "completed",
-                    "total_chunks": total_chunks,
-                    "processed_chunks": total_chunks,
-                    "entities_extracted": len(all_entities),
-                    "relationships_extracted": len(all_relationships),
-                },
+                source_id, "COMPLETED", {"current_stage": "completed", **progress}
             )
 
-            # Update state
-            state["entities"] = all_entities
-            state["relationships"] = all_relationships
+            # Update state; extracted entities and relationships are only counted,
+            # so a run's memory does not grow with the source
+            state["extraction_progress"] = progress
+            state["total_chunks"] = total_chunks
+            state["chunks_processed"] = progress["processed_chunks"]
             state["response"] = (
-                f"Extraction completed: {len(all_entities)} entities, "
-                f"{len(all_relationships)} relationships extracted"
+                f"Extraction completed: {run.entities_extracted} entities, "
+                f"{run.relationships_extracted} relationships extracted"
             )
 
             self._log_execution("Extraction completed successfully")
@@ -238,3 +237,440 @@ class ExtractionAgent(BaseAgent):
             )
 
             return self._add_error(state, f"Extraction failed: {e}")
+
+    async def _retract_removed_chunks(
+        self,
+        source_id: UUID,
+        removed: dict[str, Optional[str]],
+        current: dict[str, str],
+        mode: ExtractionMode,
+    ) -> None:
+        """
+        Retract the provenance of chunks that an edit removed from a source.
+
+        Which entities the removed chunks mentioned, and which of them the
+        remaining chunks still mention, comes from the stored chunk extractions
+        the checkpoints point at. The removed chunks' checkpoints are deleted in
+        the same transaction.
+
+        Args:
+            source_id: Source UUID
+            removed: Checkpointed chunk hashes no longer in the content, with their
+                extraction mode (None if unknown)
+            current: Chunk hashes of the content with their extraction mode
+            mode: Current extraction mode, assumed where a checkpoint has none
+        """
+        removed_extractions = await self._stored_extractions(
+            {chunk_hash: removed_mode or mode.value for chunk_hash, removed_mode in removed.items()}
+        )
+
+        mentions: dict[str, int] = {}
+        for extraction in removed_extractions.values():
+            for entity in extraction["entities"]:
+                entity_id = str(entity_id_for(entity["name"], entity["type"]))
+                mentions[entity_id] = mentions.get(entity_id, 0) + 1
+
+        # The remaining chunks can be many; read their extractions a batch at a time
+        still_mentioned: set[str] = set()
+        current_items = list(current.items())
+        for start in range(0, len(current_items), LOOKUP_BATCH_CHUNKS):
+            extractions = await self._stored_extractions(
+                dict(current_items[start : start + LOOKUP_BATCH_CHUNKS])
+            )
+            still_mentioned.update(
+                str(entity_id_for(entity["name"], entity["type"]))
+                for extraction in extractions.values()
+                for entity in extraction["entities"]
+            )
+
+        removed_hashes = sorted(removed)
+        async with self.db_pool.transaction() as conn:
+            result = await self.graph_repo.retract_chunks(
+                source_id,
+                removed_hashes,
+                mentions,
+                [entity_id for entity_id in mentions if entity_id not in still_mentioned],
+                conn=conn,
+            )
+            await self.source_chunks_repo.delete(source_id, removed_hashes, conn=conn)
+        self._log_execution(
+            f"Retracted {len(removed)} removed chunks: {result['relationships_deleted']} "
+            f"relationships, {result['entities_deleted']} entities deleted"
+        )
+
+    async def _stored_extractions(self, modes: dict[str, str]) -> dict[str, dict[str, Any]]:
+        """Fetch stored extractions for chunk hashes mapped to their extraction mode."""
+        by_mode: dict[str, list[str]] = {}
+        for chunk_hash, chunk_mode in modes.items():
+            by_mode.setdefault(chunk_mode, []).append(chunk_hash)
+        extractions: dict[str, dict[str, Any]] = {}
+        for chunk_mode, hashes in by_mode.items():
+            extractions.update(await self.chunk_extractions_repo.get_latest(hashes, chunk_mode))
+        return extractions
+
+    async def _extraction_mode(self, objective_id: UUID) -> ExtractionMode:
+        """
+        Resolve the extraction mode for an objective.
+
+        An "extraction_mode" key in the objective's metadata overrides
+        Settings.extraction_mode.
+
+        Args:
+            objective_id: Objective UUID
+
+        Returns:
+            Extraction mode
+        """
+        objective = await self.objectives_repo.get_by_id(objective_id)
+        override = (objective["metadata"] or {}).get("extraction_mode") if objective else None
+        if override:
+            try:
+                return ExtractionMode(override)
+            except ValueError:
+                logger.warning(
+                    f"Ignoring unknown extraction_mode {override!r} on objective {objective_id}"
+                )
+        return self.settings.extraction_mode
+
+
+class _ExtractionRun:
+    """
+    Extraction of one source as a pipeline of bounded stages.
+
+    entity_llm -> relationship_llm -> resolution -> graph_writer, or
+    joint_llm -> resolution -> graph_writer in joint mode. The LLM stages run
+    extraction_concurrency workers each; resolution restores chunk order and
+    maps names to the deterministic entity IDs; the writer drains up to
+    WRITE_BATCH_CHUNKS resolved chunks per transaction. The database and the LLM
+    are busy at the same time, and full queues hold back upstream stages.
+
+    Chunks whose content hash was extracted before in the same mode, with the
+    same model and prompts, carry the stored results through the LLM stages
+    untouched; only provenance is written.
+    Every LLM call holds a slot of the agent's LLMScheduler at the run's
+    priority, so concurrent runs share one budget and small sources go first.
+    A chunk whose LLM call fails carries the error to the writer instead of
+    stopping the run; every written batch checkpoints its chunks in
+    source_chunks in the same transaction.
+
+    Chunks are fed as they are streamed, and a chunk is dropped once written:
+    the run keeps counters, the name to ID map and, when resuming, the chunk
+    hashes, so its memory stays bounded however large the source.
+    """
+
+    def __init__(
+        self,
+        agent: ExtractionAgent,
+        source_id: UUID,
+        objective_id: UUID,
+        total_chunks: int,
+        mode: ExtractionMode = ExtractionMode.TWO_CALL,
+        completed: Optional[dict[str, Optional[str]]] = None,
+        priority: int = 0,
+    ) -> None:
+        self.agent = agent
+        self.source_id = source_id
+        self.objective_id = objective_id
+        # Expected chunk count until the stream ends, then the actual one
+        self.total_chunks = total_chunks
+        self.mode = mode
+        # Model and prompt hash that stored chunk extractions must match to be reused
+        self.fingerprint = agent.extractor_fingerprints[mode]
+        self.completed = completed or {}
+        self.priority = priority
+        self.chunk_hashes: set[str] = set()
+        self.streamed_chunks = 0
+        self.skipped_chunks = 0
+        self.reused_chunks = 0
+        self.failed_chunks: list[tuple[int, str]] = []
+
+        self.entities_extracted = 0
+        self.relationships_extracted = 0
+        self.written_chunks = 0
+        self.entity_name_to_id: dict[str, UUID] = {}
+        self._pending: dict[int, dict[str, Any]] = {}
+        self._next_index = 0
+        self._fed_chunks = 0
+
+        concurrency = max(1, agent.settings.extraction_concurrency)
+        if mode == ExtractionMode.JOINT:
+            llm_stages = [
+                PipelineStage(
+                    "joint_llm", self._extract_jointly, workers=concurrency, queue_size=concurrency
+                ),
+            ]
+        else:
+            llm_stages = [
+                PipelineStage(
+                    "entity_llm",
+                    self._extract_entities,
+                    workers=concurrency,
+                    queue_size=concurrency,
+                ),
+                PipelineStage(
+                    "relationship_llm",
+                    self._extract_relationships,
+                    workers=concurrency,
+                    queue_size=concurrency,
+                ),
+            ]
+        self.pipeline = Pipeline(
+            [
+                *llm_stages,
+                PipelineStage("resolution", self._resolve, queue_size=concurrency),
+                PipelineStage(
+                    "graph_writer",
+                    self._write,
+                    batch_size=WRITE_BATCH_CHUNKS,
+                    queue_size=WRITE_BATCH_CHUNKS * 2,
+                ),
+            ],
+            source_name="chunking",
+        )
+
+    async def execute(self, chunks: AsyncIterable[tuple[int, str]]) -> None:
+        """
+        Extract and write streamed (index, text) chunks; raises the first stage failure.
+
+        Chunks checkpointed in completed are skipped. LLM failures do not
+        raise; the chunks are collected in failed_chunks.
+        """
+        await self.pipeline.run(self._prepare(chunks))
+        self.total_chunks = self.streamed_chunks
+
+    async def _prepare(
+        self, chunks: AsyncIterable[tuple[int, str]]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Hash chunks, skip completed ones and attach stored results a batch at a time."""
+        batch: list[tuple[int, str, str]] = []
+        async for index, text in chunks:
+            self.streamed_chunks += 1
+            chunk_hash = content_hash(text)
+            if self.completed:
+                # Only needed to find the checkpointed chunks an edit removed
+                self.chunk_hashes.add(chunk_hash)
+                if chunk_hash in self.completed:
+                    self.skipped_chunks += 1
+                    continue
+            batch.append((index, text, chunk_hash))
+            if len(batch) == LOOKUP_BATCH_CHUNKS:
+                for chunk in await self._lookup(batch):
+                    yield chunk
+                batch = []
+        for chunk in await self._lookup(batch):
+            yield chunk
+
+    async def _lookup(self, batch: list[tuple[int, str, str]]) -> list[dict[str, Any]]:
+        if not batch:
+            return []
+        known = await self.agent.chunk_extractions_repo.get_many(
+            [chunk_hash for _, _, chunk_hash in batch], self.mode.value, *self.fingerprint
+        )
+        chunks = []
+        for index, text, chunk_hash in batch:
+            stored = known.get(chunk_hash)
+            if stored is not None:
+                self.reused_chunks += 1
+            chunks.append(
+                {
+                    # Resolution orders by position; index is the chunk's place in the source
+                    "position": self._fed_chunks,
+                    "index": index,
+                    "text": text,
+                    "hash": chunk_hash,
+                    "reused": stored is not None,
+                    "entities": list(stored["entities"]) if stored else [],
+                    "relationships": list(stored["relationships"]) if stored else [],
+                }
+            )
+            self._fed_chunks += 1
+        return chunks
+
+    def progress(self) -> dict[str, Any]:
+        """Progress counters of the run, as stored in extraction_progress."""
+        return {
+            "total_chunks": max(self.total_chunks, self.streamed_chunks),
+            "processed_chunks": self.skipped_chunks + self.written_chunks,
+            "entities_extracted": self.entities_extracted,
+            "relationships_extracted": self.relationships_extracted,
+            "reused_chunks": self.reused_chunks,
+            "skipped_chunks": self.skipped_chunks,
+            "failed_chunks": len(self.failed_chunks),
+        }
+
+    async def _extract_entities(self, batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        for chunk in batch:
+            if not chunk["reused"]:
+                try:
+                    async with self.agent.llm_scheduler.slot(self.priority):
+                        chunk["entities"] = await self.agent.entity_extractor.extract(
+                            chunk["text"]
+                        )
+                except Exception as e:
+                    chunk["error"] = str(e)
+        return batch
+
+    async def _extract_jointly(self, batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        for chunk in batch:
+            text = chunk.pop("text")
+            if not chunk["reused"]:
+                try:
+                    async with self.agent.llm_scheduler.slot(self.priority):
+                        chunk["entities"], chunk["relationships"] = (
+                            await self.agent.joint_extractor.extract(text)
+                        )
+                except Exception as e:
+                    chunk["error"] = str(e)
+        return batch
+
+    async def _extract_relationships(self, batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        for chunk in batch:
+            if not chunk["reused"] and "error" not in chunk and len(chunk["entities"]) >= 2:
+                try:
+                    async with self.agent.llm_scheduler.slot(self.priority):
+                        chunk["relationships"] = await self.agent.relationship_extractor.extract(
+                            chunk["text"], chunk["entities"]
+                        )
+                except Exception as e:
+                    chunk["error"] = str(e)
+            del chunk["text"]
+        return batch
+
+    async def _resolve(self, batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Release chunks in index order with relationship endpoints resolved to IDs."""
+        for chunk in batch:
+            self._pending[chunk["position"]] = chunk
+
+        ready = []
+        while self._next_index in self._pending:
+            chunk = self._pending.pop(self._next_index)
+            self._next_index += 1
+
+            # A failed chunk writes nothing, not even the part that succeeded
+            if "error" in chunk:
+                chunk["entities"], chunk["relationships"] = [], []
+
+            # Store what the LLM returned before relationships are filtered against
+            # this source's entities
+            elif not chunk["reused"] and chunk["entities"]:
+                chunk["extracted"] = {
+                    "entities": chunk["entities"],
+                    "relationships": chunk["relationships"],
+                }
+
+            for entity in chunk["entities"]:
+                self.entity_name_to_id[entity["name"]] = entity_id_for(
+                    entity["name"], entity["type"]
+                )
+
+            # Link to document and source for provenance
+            mentions: dict[UUID, dict[str, Any]] = {}
+            for entity in chunk["entities"]:
+                entity_id = self.entity_name_to_id[entity["name"]]
+                mention = mentions.setdefault(
+                    entity_id,
+                    {
+                        "entity_id": entity_id,
+                        "mention_count": 0,
+                        "confidence": entity["confidence"],
+                        "extraction_method": entity["extraction_method"],
+                    },
+                )
+                mention["mention_count"] += 1
+                mention["confidence"] = max(mention["confidence"], entity["confidence"])
+            chunk["mentions"] = mentions
+
+            # Resolve relationship endpoints to entity IDs
+            chunk["resolved"] = []
+            kept = []
+            for rel in chunk["relationships"]:
+                entity1_id = self.entity_name_to_id.get(rel["entity1_name"])
+                entity2_id = self.entity_name_to_id.get(rel["entity2_name"])
+                if entity1_id and entity2_id:
+                    chunk["resolved"].append(
+                        {
+                            **rel,
+                            "entity1_id": entity1_id,
+                            "entity2_id": entity2_id,
+                            "chunk_hash": chunk["hash"],
+                        }
+                    )
+                    kept.append(rel)
+            chunk["relationships"] = kept
+            ready.append(chunk)
+        return ready
+
+    async def _write(self, batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Write a batch of resolved chunks in one transaction and report progress."""
+        entities = [entity for chunk in batch for entity in chunk["entities"]]
+        resolved = [rel for chunk in batch for rel in chunk["resolved"]]
+        mentions: dict[UUID, dict[str, Any]] = {}
+        for chunk in batch:
+            for entity_id, mention in chunk["mentions"].items():
+                merged = mentions.get(entity_id)
+                if merged is None:
+                    mentions[entity_id] = dict(mention)
+                else:
+                    merged["mention_count"] += mention["mention_count"]
+                    merged["confidence"] = max(merged["confidence"], mention["confidence"])
+
+        graph_repo = self.agent.graph_repo
+        async with self.agent.db_pool.transaction() as conn:
+            await graph_repo.upsert_entities(
+                entities, self.source_id, objective_id=self.objective_id, conn=conn
+            )
+            await graph_repo.link_mentions(
+                self.source_id,
+                list(mentions.values()),
+                chunk_index=0,  # Simplified for POC - treat as single doc
+                conn=conn,
+            )
+            await graph_repo.create_relationships(
+                resolved,
+                source_ids=[self.source_id],
+                objective_id=self.objective_id,
+                conn=conn,
+            )
+            await self.agent.chunk_extractions_repo.put_many(
+                {chunk["hash"]: chunk["extracted"] for chunk in batch if "extracted" in chunk},
+                self.mode.value,
+                *self.fingerprint,
+                conn=conn,
+            )
+            await self.agent.source_chunks_repo.record(
+                self.source_id,
+                [
+                    {
+                        "chunk_hash": chunk["hash"],
+                        "chunk_index": chunk["index"],
+                        "status": CHUNK_FAILED if "error" in chunk else CHUNK_COMPLETED,
+                        "error": chunk.get("error"),
+                    }
+                    for chunk in batch
+                ],
+                self.mode.value,
+                conn=conn,
+            )
+
+        for chunk in batch:
+            if "error" in chunk:
+                self.failed_chunks.append((chunk["index"], chunk["error"]))
+            self.entities_extracted += len(chunk["entities"])
+            self.relationships_extracted += len(chunk["relationships"])
+        done = self.skipped_chunks + self.written_chunks
+        self.written_chunks += len(batch)
+        progress = self.progress()
+        self.agent._log_execution(
+            f"Wrote chunks {done + 1}-{done + len(batch)}/{progress['total_chunks']}"
+        )
+
+        await self.agent.sources_repo.update_extraction_status(
+            self.source_id,
+            "PROCESSING",
+            {
+                "current_stage": "extracting_entities",
+                **progress,
+                "stages": self.pipeline.metrics(),
+            },
+        )
+        return []
@@ -3,7 +3,7 @@ Agent orchestrator for KETA using LangGraph.
 """
 
 import logging
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal, Optional
 
 from langgraph.graph import END, StateGraph
 
@@ -11,6 +11,9 @@ from packages.agents.extraction_agent import ExtractionAgent
 from packages.agents.state import AgentState
 from packages.shared.database import DatabasePool
 
+if TYPE_CHECKING:
+    from packages.agents.conversation_agent import ConversationAgent
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,20 +22,27 @@ class AgentOrchestrator:
     Orchestrator for routing and managing KETA agents using LangGraph.
     """
 
-    def __init__(self, db_pool: DatabasePool) -> None:
+    def __init__(
+        self,
+        db_pool: DatabasePool,
+        extraction_agent: Optional[ExtractionAgent] = None,
+        conversation_agent: Optional["ConversationAgent"] = None,
+    ) -> None:
         """
         Initialize the orchestrator.
 
         Args:
             db_pool: Database connection pool
+            extraction_agent: Prebuilt extraction agent (optional, will create if not provided)
+            conversation_agent: Prebuilt conversation agent (optional, will create if not provided)
         """
         self.db_pool = db_pool
 
         # Initialize agents (import here to avoid circular imports)
         from packages.agents.conversation_agent import ConversationAgent
 
-        self.extraction_agent = ExtractionAgent(db_pool)
-        self.conversation_agent = ConversationAgent(db_pool)
+        self.extraction_agent = extraction_agent or ExtractionAgent(db_pool)
+        self.conversation_agent = conversation_agent or ConversationAgent(db_pool)
 
         # Build the graph
         self.graph = self._build_graph()
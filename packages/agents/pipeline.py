@@ -0,0 +1,165 @@
+"""
+Bounded asyncio pipelines for KETA agents.
+
+A pipeline is a chain of stages connected by bounded queues. Each stage runs
+one or more worker tasks that take items (optionally a batch of whatever is
+already queued) from its inbox, hand them to an async handler and put the
+handler's outputs into the next stage's inbox. Full queues block the stage
+upstream, so a slow stage throttles the ones before it instead of letting
+work pile up in memory.
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable, Optional, Union
+
+# Ends a worker; each stage receives one per worker once its upstream is drained
+_DONE = object()
+
+Handler = Callable[[list[Any]], Awaitable[list[Any]]]
+
+
+async def _gather_or_cancel(tasks: list[asyncio.Task]) -> None:
+    """Wait for all tasks; on the first failure cancel the rest and re-raise."""
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class PipelineStage:
+    """One stage of a Pipeline."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Handler,
+        workers: int = 1,
+        batch_size: int = 1,
+        queue_size: int = 1,
+    ) -> None:
+        """
+        Initialize the stage.
+
+        Args:
+            name: Stage name used in metrics
+            handler: Async function mapping a batch of inputs to a list of outputs
+            workers: Number of concurrent worker tasks
+            batch_size: Maximum number of queued items handed to the handler at once
+            queue_size: Capacity of the stage's inbox
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.inbox: asyncio.Queue = asyncio.Queue(max(1, queue_size))
+        self.processed = 0
+
+    async def _take(self) -> tuple[list[Any], bool]:
+        """Wait for an item, then drain up to batch_size; True once the stage is done."""
+        item = await self.inbox.get()
+        if item is _DONE:
+            return [], True
+        batch = [item]
+        while len(batch) < self.batch_size:
+            try:
+                item = self.inbox.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _work(self, downstream: Optional["PipelineStage"]) -> None:
+        done = False
+        while not done:
+            batch, done = await self._take()
+            if not batch:
+                continue
+            outputs = await self.handler(batch)
+            self.processed += len(batch)
+            if downstream is not None:
+                for output in outputs:
+                    await downstream.inbox.put(output)
+
+    async def run(self, downstream: Optional["PipelineStage"]) -> None:
+        """Run the workers until upstream is drained, then signal the next stage."""
+        await _gather_or_cancel(
+            [asyncio.create_task(self._work(downstream)) for _ in range(self.workers)]
+        )
+        if downstream is not None:
+            for _ in range(downstream.workers):
+                await downstream.inbox.put(_DONE)
+
+
+class Pipeline:
+    """Chain of PipelineStages fed from an iterable source."""
+
+    def __init__(self, stages: list[PipelineStage], source_name: str = "source") -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Stages in order; the last stage's outputs are discarded
+            source_name: Name of the feeding step in metrics
+        """
+        self.stages = stages
+        self.source_name = source_name
+        self.fed = 0
+        self._started: Optional[float] = None
+
+    async def _feed(self, items: Union[Iterable[Any], AsyncIterable[Any]]) -> None:
+        first = self.stages[0]
+        if isinstance(items, AsyncIterable):
+            async for item in items:
+                await first.inbox.put(item)
+                self.fed += 1
+        else:
+            for item in items:
+                await first.inbox.put(item)
+                self.fed += 1
+        for _ in range(first.workers):
+            await first.inbox.put(_DONE)
+
+    async def run(self, items: Union[Iterable[Any], AsyncIterable[Any]]) -> None:
+        """
+        Push items through all stages and wait until the last stage is done.
+
+        Args:
+            items: Source items, sync or async, consumed lazily as the first stage has room
+
+        Raises:
+            Exception: The first exception raised by any stage; the other stages are cancelled
+        """
+        self._started = time.perf_counter()
+        tasks = [asyncio.create_task(self._feed(items))]
+        for i, stage in enumerate(self.stages):
+            downstream = self.stages[i + 1] if i + 1 < len(self.stages) else None
+            tasks.append(asyncio.create_task(stage.run(downstream)))
+        await _gather_or_cancel(tasks)
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """
+        Per-stage queue depth, processed count and throughput.
+
+        Returns:
+            Mapping of stage name to {"queue_depth", "processed", "items_per_second"}
+        """
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+
+        def entry(queue_depth: int, processed: int) -> dict[str, Any]:
+            rate = processed / elapsed if elapsed > 0 else 0.0
+            return {
+                "queue_depth": queue_depth,
+                "processed": processed,
+                "items_per_second": round(rate, 3),
+            }
+
+        metrics = {self.source_name: entry(0, self.fed)}
+        for stage in self.stages:
+            metrics[stage.name] = entry(stage.inbox.qsize(), stage.processed)
+        return metrics
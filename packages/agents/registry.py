@@ -0,0 +1,117 @@
+"""
+Application-scoped agent registry for KETA.
+"""
+
+import logging
+import time
+from typing import Optional, TypeVar
+
+from langchain_core.language_models import BaseChatModel
+
+from packages.agents.conversation_agent import ConversationAgent
+from packages.agents.extraction_agent import ExtractionAgent
+from packages.agents.orchestrator import AgentOrchestrator
+from packages.shared.config import get_settings
+from packages.shared.database import DatabasePool
+from packages.shared.llm_factory import create_llm
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AgentRegistry:
+    """
+    Long-lived holder for agents, their LLM client and the compiled orchestrator graph.
+
+    Building agents creates LLM clients, prompt templates and structured-output chains,
+    and the orchestrator compiles a LangGraph state graph. The registry does this once
+    at application startup so that request handlers only look agents up.
+    """
+
+    def __init__(self) -> None:
+        self._llm: Optional[BaseChatModel] = None
+        self._extraction_agent: Optional[ExtractionAgent] = None
+        self._conversation_agent: Optional[ConversationAgent] = None
+        self._orchestrator: Optional[AgentOrchestrator] = None
+        self.setup_seconds: float = 0.0
+
+    def initialize(self, db_pool: DatabasePool, llm: Optional[BaseChatModel] = None) -> None:
+        """
+        Build the shared LLM client, agents and orchestrator.
+
+        Args:
+            db_pool: Database connection pool
+            llm: Language model (optional, will create default if not provided)
+        """
+        if self._orchestrator is not None:
+            logger.warning("Agent registry already initialized")
+            return
+
+        started = time.perf_counter()
+
+        self._llm = llm if llm is not None else create_llm(get_settings())
+        self._extraction_agent = ExtractionAgent(db_pool, llm=self._llm)
+        self._conversation_agent = ConversationAgent(db_pool, llm=self._llm)
+        self._orchestrator = AgentOrchestrator(
+            db_pool,
+            extraction_agent=self._extraction_agent,
+            conversation_agent=self._conversation_agent,
+        )
+
+        self.setup_seconds = time.perf_counter() - started
+        logger.info(f"Agent registry initialized in {self.setup_seconds * 1000:.1f} ms")
+
+    def close(self) -> None:
+        """Release the agents and the shared LLM client."""
+        self._orchestrator = None
+        self._extraction_agent = None
+        self._conversation_agent = None
+        self._llm = None
+        logger.info("Agent registry closed")
+
+    def _require(self, value: Optional[T]) -> T:
+        if value is None:
+            raise RuntimeError("Agent registry not initialized")
+        return value
+
+    @property
+    def llm(self) -> BaseChatModel:
+        """Shared language model client."""
+        return self._require(self._llm)
+
+    @property
+    def extraction_agent(self) -> ExtractionAgent:
+        """Shared extraction agent."""
+        return self._require(self._extraction_agent)
+
+    @property
+    def conversation_agent(self) -> ConversationAgent:
+        """Shared conversation agent."""
+        return self._require(self._conversation_agent)
+
+    @property
+    def orchestrator(self) -> AgentOrchestrator:
+        """Shared orchestrator with a compiled state graph."""
+        return self._require(self._orchestrator)
+
+    @property
+    def is_initialized(self) -> bool:
+        """Check if the registry is initialized."""
+        return self._orchestrator is not None
+
+
+# Global agent registry instance
+agent_registry = AgentRegistry()
+
+
+async def get_agent_registry() -> AgentRegistry:
+    """
+    Dependency for getting the agent registry.
+
+    Returns:
+        Agent registry instance
+    """
+    if not agent_registry.is_initialized:
+        raise RuntimeError("Agent registry not initialized")
+    return agent_registry
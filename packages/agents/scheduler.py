@@ -0,0 +1,83 @@
+"""
+Shared LLM concurrency budget for extraction.
+"""
+
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+
+class LLMScheduler:
+    """
+    Limits the LLM calls in flight across every extraction in a process.
+
+    Waiting calls are granted in priority order, lowest first and then by
+    arrival. Extractions use the number of chunks their source has as the
+    priority, so a small source is not stuck behind a large one's queue of
+    calls; finishing the short jobs first minimizes mean completion time.
+    """
+
+    def __init__(self, limit: int) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            limit: LLM calls allowed in flight at the same time
+        """
+        self.limit = max(1, limit)
+        self.active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+
+    @asynccontextmanager
+    async def slot(self, priority: int = 0) -> AsyncIterator[None]:
+        """
+        Hold one LLM call slot for the duration of the block.
+
+        Args:
+            priority: Lower runs first
+        """
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: int) -> None:
+        # Released slots pass straight to a waiter, so a free slot means nobody waits
+        if self.active < self.limit:
+            self.active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._arrivals), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                # Granted the slot just as the caller was cancelled: pass it on
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        Get current slot usage.
+
+        Returns:
+            Dictionary with limit, active and waiting
+        """
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "waiting": sum(1 for _, _, future in self._waiters if not future.done()),
+        }
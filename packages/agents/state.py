@@ -53,3 +53,4 @@ class AgentState(TypedDict, total=False):
     extraction_progress: Optional[dict[str, Any]]  # Extraction progress tracking
     chunks_processed: int  # Number of chunks processed
     total_chunks: int  # Total chunks to process
+    priority: int  # LLM scheduling priority, lower first (defaults to the chunk count)
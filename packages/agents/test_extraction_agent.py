@@ -0,0 +1,482 @@
+"""Unit tests for the extraction agent pipeline."""
+import asyncio
+import tracemalloc
+from contextlib import asynccontextmanager
+from typing import Callable
+from uuid import uuid4
+
+from langchain_core.runnables import RunnableLambda
+
+from packages.agents.extraction_agent import WRITE_BATCH_CHUNKS, ExtractionAgent
+from packages.graph.identity import entity_id_for
+from packages.shared.text_processing import EstimateTokenizer, content_hash
+
+
+class FakeDatabasePool:
+    @asynccontextmanager
+    async def transaction(self):
+        yield "conn"
+
+
+class FakeSourcesRepository:
+    def __init__(self, content: str) -> None:
+        self.content = content
+        self.source = {"name": "doc", "objective_id": uuid4(), "chunk_count": 0}
+        self.progress: list[dict] = []
+
+    async def get_without_content(self, source_id):
+        return self.source
+
+    async def get_content_slice(self, source_id, start, length):
+        return self.content[start : start + length]
+
+    async def iter_content(self, source_id):
+        yield self.content
+
+    async def update_extraction_status(self, source_id, status, progress=None, error=None):
+        self.progress.append({"status": status, **(progress or {})})
+
+
+class FakeObjectivesRepository:
+    def __init__(self, metadata: dict) -> None:
+        self.metadata = metadata
+
+    async def get_by_id(self, objective_id):
+        return {"id": objective_id, "metadata": self.metadata}
+
+
+class FakeChunkExtractionsRepository:
+    def __init__(self) -> None:
+        self.stored: dict[tuple[str, str, str, str], dict] = {}
+
+    async def get_many(self, chunk_hashes, extraction_mode, model, prompt_hash):
+        keys = {h: (h, extraction_mode, model, prompt_hash) for h in chunk_hashes}
+        return {h: self.stored[key] for h, key in keys.items() if key in self.stored}
+
+    async def get_latest(self, chunk_hashes, extraction_mode):
+        latest = {}
+        for (chunk_hash, mode, _, _), result in self.stored.items():
+            if chunk_hash in chunk_hashes and mode == extraction_mode:
+                latest[chunk_hash] = result
+        return latest
+
+    async def put_many(self, extractions, extraction_mode, model, prompt_hash, conn=None):
+        for chunk_hash, result in extractions.items():
+            self.stored.setdefault((chunk_hash, extraction_mode, model, prompt_hash), result)
+
+
+class FakeSourceChunksRepository:
+    def __init__(self) -> None:
+        self.checkpoints: dict[tuple, dict] = {}
+
+    async def get_completed(self, source_id):
+        return {
+            chunk_hash: checkpoint["mode"]
+            for (checkpointed_id, chunk_hash), checkpoint in self.checkpoints.items()
+            if checkpointed_id == source_id and checkpoint["status"] == "COMPLETED"
+        }
+
+    async def record(self, source_id, chunks, extraction_mode, conn=None):
+        for chunk in chunks:
+            self.checkpoints[(source_id, chunk["chunk_hash"])] = {
+                "status": chunk["status"], "mode": extraction_mode, "index": chunk["chunk_index"]
+            }
+
+    async def delete(self, source_id, chunk_hashes=None, conn=None):
+        for key in list(self.checkpoints):
+            if key[0] == source_id and (chunk_hashes is None or key[1] in chunk_hashes):
+                del self.checkpoints[key]
+
+
+class FakeGraphRepository:
+    def __init__(self) -> None:
+        self.writes: list[dict] = []
+        self.retractions: list[dict] = []
+
+    async def create_document(self, **kwargs):
+        pass
+
+    async def upsert_entities(self, entities, source_id, objective_id=None, conn=None):
+        self.writes.append({"entities": [e["name"] for e in entities]})
+        return {}
+
+    async def link_mentions(self, source_id, mentions, chunk_index=0, conn=None):
+        self.writes[-1]["mentions"] = {m["entity_id"]: m["mention_count"] for m in mentions}
+
+    async def create_relationships(self, relationships, source_ids, objective_id=None, conn=None):
+        self.writes[-1]["relationships"] = relationships
+        return len(relationships)
+
+    async def retract_chunks(
+        self, source_id, chunk_hashes, mentions, unmentioned_entity_ids, conn=None
+    ):
+        self.retractions.append(
+            {
+                "chunk_hashes": chunk_hashes,
+                "mentions": mentions,
+                "unmentioned": unmentioned_entity_ids,
+            }
+        )
+        return {"relationships_deleted": 0, "entities_updated": 0, "entities_deleted": 0}
+
+
+class FakeLLM:
+    """Stands in for the chat model; tests replace the extractors' extract methods."""
+
+    def __init__(self, model_name: str = "fake-model") -> None:
+        self.model_name = model_name
+
+    def with_structured_output(self, schema):
+        return RunnableLambda(lambda _: schema())
+
+
+def patch_chunks(monkeypatch, texts: Callable[[], list[str]]) -> None:
+    """Make the agent extract texts() as the source's chunks."""
+
+    async def stream_source_chunks(slices, settings=None):
+        async for _ in slices:
+            pass
+        for index, text in enumerate(texts()):
+            yield index, text
+
+    monkeypatch.setattr(
+        "packages.agents.extraction_agent.stream_source_chunks", stream_source_chunks
+    )
+
+
+def make_agent(content, objective_metadata=None, model_name="fake-model"):
+    agent = ExtractionAgent(FakeDatabasePool(), llm=FakeLLM(model_name))
+    agent.sources_repo = FakeSourcesRepository(content)
+    agent.objectives_repo = FakeObjectivesRepository(objective_metadata or {})
+    agent.chunk_extractions_repo = FakeChunkExtractionsRepository()
+    agent.source_chunks_repo = FakeSourceChunksRepository()
+    agent.graph_repo = FakeGraphRepository()
+    return agent
+
+
+class TestExtractionPipeline:
+    """Test that concurrent extraction writes results in chunk order."""
+
+    async def test_out_of_order_llm_results_are_written_in_chunk_order(self, monkeypatch):
+        agent = make_agent("")
+        chunks = [(i, f"chunk {i}") for i in range(WRITE_BATCH_CHUNKS + 3)]
+        patch_chunks(monkeypatch, lambda: [text for _, text in chunks])
+
+        async def extract_entities(text):
+            index = int(text.split()[1])
+            # Later chunks finish first
+            await asyncio.sleep(0.001 * (len(chunks) - index))
+            return [
+                {"name": f"Person {index}", "type": "PERSON", "confidence": 0.9,
+                 "extraction_method": "llm_structured"},
+                {"name": "Acme", "type": "ORGANIZATION", "confidence": 0.8,
+                 "extraction_method": "llm_structured"},
+            ]
+
+        async def extract_relationships(text, entities):
+            return [
+                {"entity1_name": entities[0]["name"], "entity2_name": "Acme",
+                 "relationship_type": "WORKS_AT", "description": "", "confidence": 0.7},
+                {"entity1_name": entities[0]["name"], "entity2_name": "Nobody",
+                 "relationship_type": "KNOWS", "description": "", "confidence": 0.5},
+            ]
+
+        agent.entity_extractor.extract = extract_entities
+        agent.relationship_extractor.extract = extract_relationships
+
+        state = await agent.execute({"source_id": uuid4(), "agent_path": [], "errors": []})
+
+        assert not state.get("errors")
+        written = [name for write in agent.graph_repo.writes for name in write["entities"]]
+        assert written[::2] == [f"Person {i}" for i in range(len(chunks))]
+        assert all(
+            len(write["entities"]) <= 2 * WRITE_BATCH_CHUNKS for write in agent.graph_repo.writes
+        )
+        acme = entity_id_for("Acme", "ORGANIZATION")
+        assert sum(write["mentions"][acme] for write in agent.graph_repo.writes) == len(chunks)
+        rels = [rel for write in agent.graph_repo.writes for rel in write["relationships"]]
+        assert len(rels) == len(chunks)
+        assert rels[0]["entity1_id"] == entity_id_for("Person 0", "PERSON")
+        assert state["extraction_progress"]["relationships_extracted"] == len(chunks)
+
+        progress = agent.sources_repo.progress
+        processing = [p for p in progress if p["status"] == "PROCESSING" and "stages" in p]
+        assert processing[-1]["processed_chunks"] == len(chunks)
+        assert processing[-1]["stages"]["entity_llm"]["processed"] == len(chunks)
+        assert progress[-1]["status"] == "COMPLETED"
+
+    async def test_llm_failure_marks_source_failed(self):
+        agent = make_agent("Some text about Acme.")
+
+        async def extract_entities(text):
+            raise RuntimeError("LLM unavailable")
+
+        agent.entity_extractor.extract = extract_entities
+
+        state = await agent.execute({"source_id": uuid4(), "agent_path": [], "errors": []})
+
+        assert "LLM unavailable" in state["errors"][-1]
+        assert agent.sources_repo.progress[-1]["status"] == "FAILED"
+
+    async def test_objective_can_select_joint_mode(self):
+        agent = make_agent(
+            "Ada Lovelace worked with Charles Babbage.", {"extraction_mode": "joint"}
+        )
+        calls = []
+
+        async def extract_jointly(text):
+            calls.append(text)
+            entities = [
+                {"name": name, "type": "PERSON", "confidence": 0.9,
+                 "extraction_method": "llm_structured"}
+                for name in ("Ada Lovelace", "Charles Babbage")
+            ]
+            relationships = [
+                {"entity1_name": "Ada Lovelace", "entity2_name": "Charles Babbage",
+                 "relationship_type": "WORKED_WITH", "description": "", "confidence": 0.8},
+            ]
+            return entities, relationships
+
+        async def unexpected(*args):
+            raise AssertionError("two-call extractors must not run in joint mode")
+
+        agent.joint_extractor.extract = extract_jointly
+        agent.entity_extractor.extract = unexpected
+        agent.relationship_extractor.extract = unexpected
+
+        state = await agent.execute({"source_id": uuid4(), "agent_path": [], "errors": []})
+
+        assert not state.get("errors")
+        assert len(calls) == 1
+        assert state["extraction_progress"]["relationships_extracted"] == 1
+        stages = agent.sources_repo.progress[-2]["stages"]
+        assert "joint_llm" in stages and "entity_llm" not in stages
+
+
+class TestChunkReuse:
+    """Test that chunks extracted before are linked without calling the LLM."""
+
+    async def test_known_chunks_skip_the_llm(self):
+        agent = make_agent("Ada Lovelace worked with Charles Babbage.")
+        calls = []
+
+        async def extract_entities(text):
+            calls.append(text)
+            return [
+                {"name": "Ada Lovelace", "type": "PERSON", "confidence": 0.9,
+                 "extraction_method": "llm_structured"},
+                {"name": "Charles Babbage", "type": "PERSON", "confidence": 0.9,
+                 "extraction_method": "llm_structured"},
+            ]
+
+        async def extract_relationships(text, entities):
+            calls.append(text)
+            return [
+                {"entity1_name": "Ada Lovelace", "entity2_name": "Charles Babbage",
+                 "relationship_type": "WORKED_WITH", "description": "", "confidence": 0.8},
+            ]
+
+        agent.entity_extractor.extract = extract_entities
+        agent.relationship_extractor.extract = extract_relationships
+
+        first = await agent.execute({"source_id": uuid4(), "agent_path": [], "errors": []})
+        second = await agent.execute({"source_id": uuid4(), "agent_path": [], "errors": []})
+
+        assert len(calls) == 2
+        assert second["extraction_progress"]["entities_extracted"] == 2
+        assert second["response"] == first["response"]
+        # The re-upload is still linked to the graph as its own source
+        assert len(agent.graph_repo.writes) == 2
+        assert agent.graph_repo.writes[1]["entities"] == agent.graph_repo.writes[0]["entities"]
+        assert agent.graph_repo.writes[1]["relationships"][0]["entity1_id"] == entity_id_for(
+            "Ada Lovelace", "PERSON"
+        )
+        assert agent.sources_repo.progress[-1]["reused_chunks"] == 1
+
+    async def test_model_change_extracts_again(self):
+        calls = []
+
+        async def extract_entities(text):
+            calls.append(text)
+            return [{"name": "Ada Lovelace", "type": "PERSON", "confidence": 0.9,
+                     "extraction_method": "llm_structured"}]
+
+        stored = FakeChunkExtractionsRepository()
+        for model_name in ("fake-model", "other-model", "other-model"):
+            agent = make_agent("Ada Lovelace wrote notes.", model_name=model_name)
+            agent.chunk_extractions_repo = stored
+            agent.entity_extractor.extract = extract_entities
+            await agent.execute({"source_id": uuid4(), "agent_path": [], "errors": []})
+
+        # The second model does not reuse the first one's results, only its own
+        assert len(calls) == 2
+        assert len(stored.stored) == 2
+        assert agent.sources_repo.progress[-1]["reused_chunks"] == 1
+
+
+class TestIncrementalReextraction:
+    """Test that edited content only re-extracts and retracts the chunks that changed."""
+
+    async def test_only_changed_chunks_are_extracted(self, monkeypatch):
+        agent = make_agent("")
+        chunks = {"old": ["Ada Lovelace", "Charles Babbage", "Acme"]}
+        patch_chunks(monkeypatch, lambda: chunks["old"])
+        calls = []
+
+        async def extract_entities(text):
+            calls.append(text)
+            return [{"name": text, "type": "PERSON", "confidence": 0.9,
+                     "extraction_method": "llm_structured"}]
+
+        agent.entity_extractor.extract = extract_entities
+        source_id = uuid4()
+        await agent.execute({"source_id": source_id, "agent_path": [], "errors": []})
+
+        chunks["old"] = ["Ada Lovelace", "Grace Hopper", "Acme"]
+        calls.clear()
+        state = await agent.execute({"source_id": source_id, "agent_path": [], "errors": []})
+
+        assert not state.get("errors")
+        assert calls == ["Grace Hopper"]
+        babbage = str(entity_id_for("Charles Babbage", "PERSON"))
+        assert agent.graph_repo.retractions == [
+            {
+                "chunk_hashes": [content_hash("Charles Babbage")],
+                "mentions": {babbage: 1},
+                "unmentioned": [babbage],
+            }
+        ]
+        progress = agent.sources_repo.progress[-1]
+        assert (progress["total_chunks"], progress["skipped_chunks"]) == (3, 2)
+        checkpointed = await agent.source_chunks_repo.get_completed(source_id)
+        assert set(checkpointed) == {content_hash(text) for text in chunks["old"]}
+
+
+class TestCheckpointResume:
+    """Test that a retried extraction only redoes the chunks that failed."""
+
+    async def test_retry_extracts_only_failed_chunks(self, monkeypatch):
+        agent = make_agent("")
+        texts = [f"Person {i}" for i in range(WRITE_BATCH_CHUNKS + 2)]
+        patch_chunks(monkeypatch, lambda: texts)
+        calls = []
+        flaky = {"Person 3"}
+
+        async def extract_entities(text):
+            calls.append(text)
+            if text in flaky:
+                raise RuntimeError("rate limited")
+            return [{"name": text, "type": "PERSON", "confidence": 0.9,
+                     "extraction_method": "llm_structured"}]
+
+        agent.entity_extractor.extract = extract_entities
+        source_id = uuid4()
+
+        first = await agent.execute({"source_id": source_id, "agent_path": [], "errors": []})
+
+        assert "1 of 10 chunks failed (chunk 3: rate limited)" in first["errors"][-1]
+        assert agent.sources_repo.progress[-1]["status"] == "FAILED"
+        written = [name for write in agent.graph_repo.writes for name in write["entities"]]
+        assert written == [text for text in texts if text != "Person 3"]
+        checkpoint = agent.source_chunks_repo.checkpoints[(source_id, content_hash("Person 3"))]
+        assert (checkpoint["status"], checkpoint["index"]) == ("FAILED", 3)
+
+        flaky.clear()
+        calls.clear()
+        second = await agent.execute({"source_id": source_id, "agent_path": [], "errors": []})
+
+        assert not second.get("errors")
+        assert calls == ["Person 3"]
+        assert agent.graph_repo.writes[-1]["entities"] == ["Person 3"]
+        progress = agent.sources_repo.progress[-1]
+        assert progress["status"] == "COMPLETED"
+        assert (progress["processed_chunks"], progress["skipped_chunks"]) == (len(texts), 9)
+        assert agent.graph_repo.retractions == []
+
+
+class StreamedSourcesRepository(FakeSourcesRepository):
+    """Serves generated content in slices without ever holding all of it."""
+
+    def __init__(self, size: int, slice_chars: int) -> None:
+        super().__init__("")
+        self.size = size
+        self.slice = ("Ada Lovelace wrote notes on the Analytical Engine. " * 20 + "\n") * (
+            slice_chars // 1041
+        )
+
+    async def get_content_slice(self, source_id, start, length):
+        return self.slice[:length]
+
+    async def iter_content(self, source_id):
+        for _ in range(self.size // len(self.slice)):
+            yield self.slice
+
+    async def update_extraction_status(self, source_id, status, progress=None, error=None):
+        self.progress = [{"status": status, **(progress or {})}]
+
+
+class NullRepository:
+    """Accepts every write and remembers nothing."""
+
+    def __getattr__(self, name):
+        async def method(*args, **kwargs):
+            return {} if name in ("get_many", "get_completed") else None
+
+        return method
+
+
+class TestBoundedMemory:
+    """Test that extraction memory does not grow with the source."""
+
+    async def test_large_source_is_extracted_in_bounded_memory(self):
+        size = 200 * 1024 * 1024
+        agent = make_agent("")
+        agent.sources_repo = StreamedSourcesRepository(size, slice_chars=4 * 1024 * 1024)
+        agent.chunk_extractions_repo = NullRepository()
+        agent.source_chunks_repo = NullRepository()
+        agent.graph_repo = NullRepository()
+        agent._log_execution = lambda message: None
+        # A long-context model's chunks, so the run is a few thousand chunks
+        agent.settings = agent.settings.model_copy(update={"llm_context_tokens": 131072})
+
+        async def extract_jointly(text):
+            entities = [
+                {"name": f"Person {len(text) % 97}", "type": "PERSON", "confidence": 0.9,
+                 "extraction_method": "llm_structured"},
+            ]
+            return entities, []
+
+        agent.joint_extractor.extract = extract_jointly
+        agent.objectives_repo = FakeObjectivesRepository({"extraction_mode": "joint"})
+
+        tracemalloc.start()
+        try:
+            state = await agent.execute({"source_id": uuid4(), "agent_path": [], "errors": []})
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert not state.get("errors")
+        assert state["chunks_processed"] == state["total_chunks"] > 3000
+        # A 4 MB slice, the chunks in flight and the name map, not the 200 MB source
+        assert peak < 32 * 1024 * 1024
+
+
+class TestChunkBudget:
+    """Test that the prompt reserve covers the extraction prompts."""
+
+    def test_prompts_fit_the_reserve(self):
+        agent = make_agent("")
+        tokenizer = EstimateTokenizer()
+        entity_list = "\n".join(
+            f"- Entity with a fairly long name {i} (ORGANIZATION)" for i in range(50)
+        )
+        extractors = [
+            (agent.entity_extractor, {"text": ""}),
+            (agent.relationship_extractor, {"text": "", "entities": entity_list}),
+            (agent.joint_extractor, {"text": ""}),
+        ]
+
+        for extractor, inputs in extractors:
+            prompt = extractor.prompt.format(**inputs)
+            assert tokenizer.count_tokens(prompt) <= agent.settings.chunk_prompt_reserve_tokens
@@ -0,0 +1,91 @@
+"""Unit tests for the persistent LLM response cache."""
+from langchain_core.runnables import RunnableLambda
+
+from packages.agents.tools.extraction import EntityExtractionOutput, EntityExtractor
+from packages.agents.tools.llm_cache import LLMResponseCache
+
+
+class FakeLLMCacheRepository:
+    def __init__(self, fail: bool = False) -> None:
+        self.entries: dict[str, dict] = {}
+        self.fail = fail
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, cache_key):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        response = self.entries.get(cache_key)
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response
+
+    async def put(self, cache_key, provider, model, prompt_hash, response):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        self.entries.setdefault(cache_key, response)
+
+    async def evict(self, max_bytes):
+        return 0
+
+
+class FakeLLM:
+    """Counts structured-output calls and returns one entity named after the model."""
+
+    def __init__(self, model: str = "model-a") -> None:
+        self.model = model
+        self.temperature = 0.0
+        self.calls = 0
+
+    def with_structured_output(self, schema):
+        def respond(_prompt):
+            self.calls += 1
+            return EntityExtractionOutput(
+                entities=[{"name": self.model, "type": "PRODUCT", "confidence": 0.9}]
+            )
+
+        return RunnableLambda(respond)
+
+
+def make_extractor(llm, repository):
+    return EntityExtractor(llm, cache=LLMResponseCache(repository, llm, max_bytes=1024))
+
+
+class TestLLMResponseCache:
+    """Test cache hits, key composition and degraded operation."""
+
+    async def test_identical_chunk_is_served_from_cache(self):
+        llm = FakeLLM()
+        repository = FakeLLMCacheRepository()
+        extractor = make_extractor(llm, repository)
+
+        first = await extractor.extract("Ada Lovelace wrote programs.")
+        second = await extractor.extract("Ada Lovelace wrote programs.")
+
+        assert first == second
+        assert llm.calls == 1
+        assert (repository.hits, repository.misses) == (1, 1)
+
+    async def test_key_covers_model_and_text(self):
+        repository = FakeLLMCacheRepository()
+        llm_a, llm_b = FakeLLM("model-a"), FakeLLM("model-b")
+
+        await make_extractor(llm_a, repository).extract("same text")
+        await make_extractor(llm_a, repository).extract("other text")
+        entities = await make_extractor(llm_b, repository).extract("same text")
+
+        assert (llm_a.calls, llm_b.calls) == (2, 1)
+        assert entities[0]["name"] == "model-b"
+        assert len(repository.entries) == 3
+
+    async def test_database_errors_fall_back_to_the_llm(self):
+        llm = FakeLLM()
+        extractor = make_extractor(llm, FakeLLMCacheRepository(fail=True))
+
+        entities = await extractor.extract("Ada Lovelace wrote programs.")
+
+        assert [e["name"] for e in entities] == ["model-a"]
+        assert llm.calls == 1
+        assert extractor.chain.cache.errors == 2
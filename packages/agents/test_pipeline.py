@@ -0,0 +1,101 @@
+"""Unit tests for the bounded asyncio pipeline."""
+import asyncio
+
+import pytest
+
+from packages.agents.pipeline import Pipeline, PipelineStage
+
+
+class TestPipeline:
+    """Test stage chaining, batching, backpressure and failure handling."""
+
+    async def test_items_flow_through_all_stages(self):
+        written = []
+
+        async def double(batch):
+            return [item * 2 for item in batch]
+
+        async def sink(batch):
+            written.extend(batch)
+            return []
+
+        pipeline = Pipeline(
+            [PipelineStage("double", double, workers=3), PipelineStage("sink", sink)],
+            source_name="numbers",
+        )
+        await pipeline.run(range(10))
+
+        assert sorted(written) == [i * 2 for i in range(10)]
+        metrics = pipeline.metrics()
+        assert list(metrics) == ["numbers", "double", "sink"]
+        assert metrics["numbers"]["processed"] == 10
+        assert metrics["sink"]["processed"] == 10
+        assert metrics["sink"]["queue_depth"] == 0
+
+    async def test_batches_drain_queued_items(self):
+        release = asyncio.Event()
+        batches = []
+
+        async def gate(batch):
+            await release.wait()
+            return batch
+
+        async def sink(batch):
+            batches.append(batch)
+            return []
+
+        pipeline = Pipeline(
+            [
+                PipelineStage("gate", gate, queue_size=10),
+                PipelineStage("sink", sink, batch_size=4, queue_size=10),
+            ]
+        )
+        # Let the gate pass everything at once so the sink finds a full queue
+        task = asyncio.create_task(pipeline.run(range(6)))
+        await asyncio.sleep(0)
+        release.set()
+        await task
+
+        assert [item for batch in batches for item in batch] == list(range(6))
+        assert all(len(batch) <= 4 for batch in batches)
+
+    async def test_full_queues_hold_back_the_source(self):
+        release = asyncio.Event()
+
+        async def slow(batch):
+            await release.wait()
+            return []
+
+        pipeline = Pipeline([PipelineStage("slow", slow, queue_size=2)])
+        task = asyncio.create_task(pipeline.run(range(100)))
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        # One item in the handler plus a full inbox
+        assert pipeline.fed == 3
+        release.set()
+        await task
+        assert pipeline.fed == 100
+
+    async def test_failure_cancels_other_stages(self):
+        cancelled = asyncio.Event()
+
+        async def fail(batch):
+            if batch[0] == 3:
+                raise ValueError("bad chunk")
+            return batch
+
+        async def wait_forever(batch):
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return []
+
+        pipeline = Pipeline(
+            [PipelineStage("fail", fail, workers=2), PipelineStage("wait", wait_forever)]
+        )
+        with pytest.raises(ValueError, match="bad chunk"):
+            await asyncio.wait_for(pipeline.run(range(10)), timeout=1)
+        assert cancelled.is_set()
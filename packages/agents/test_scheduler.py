@@ -0,0 +1,57 @@
+"""Unit tests for the shared LLM concurrency budget."""
+import asyncio
+
+from packages.agents.scheduler import LLMScheduler
+
+
+class TestLLMScheduler:
+    """Test the slot limit, priority order and cancellation."""
+
+    async def test_waiting_calls_run_lowest_priority_first(self):
+        scheduler = LLMScheduler(limit=1)
+        release = asyncio.Event()
+        order = []
+
+        async def call(name, priority):
+            async with scheduler.slot(priority):
+                order.append(name)
+                await release.wait()
+
+        holder = asyncio.create_task(call("holder", 0))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(call(name, priority))
+            for name, priority in [("large", 50), ("small", 2), ("medium", 10), ("small-2", 2)]
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.metrics() == {"limit": 1, "active": 1, "waiting": 4}
+
+        release.set()
+        await asyncio.gather(holder, *waiters)
+
+        assert order == ["holder", "small", "small-2", "medium", "large"]
+        assert scheduler.metrics() == {"limit": 1, "active": 0, "waiting": 0}
+
+    async def test_cancelled_waiter_does_not_leak_a_slot(self):
+        scheduler = LLMScheduler(limit=2)
+        release = asyncio.Event()
+        peak = 0
+
+        async def call(priority=0):
+            nonlocal peak
+            async with scheduler.slot(priority):
+                peak = max(peak, scheduler.active)
+                await release.wait()
+
+        running = [asyncio.create_task(call()) for _ in range(2)]
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(call())
+        queued = asyncio.create_task(call(priority=5))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        release.set()
+        await asyncio.gather(*running, queued)
+
+        assert cancelled.cancelled()
+        assert peak == 2
+        assert scheduler.active == 0
@@ -0,0 +1,132 @@
+"""Unit tests for the extraction worker."""
+import asyncio
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+from packages.agents.worker import ExtractionWorker
+from packages.shared.repositories.jobs import EXTRACT_SOURCE
+
+
+class FakeDatabasePool:
+    @asynccontextmanager
+    async def transaction(self):
+        yield "conn"
+
+
+class FakeJobsRepository:
+    def __init__(self, lease_held: bool = True, fail_status: str = "QUEUED") -> None:
+        self.lease_held = lease_held
+        self.fail_status = fail_status
+        self.heartbeats = 0
+        self.outcomes: list[tuple] = []
+
+    async def heartbeat(self, job_id, worker_id, lease_seconds):
+        self.heartbeats += 1
+        return self.lease_held
+
+    async def complete(self, job_id, worker_id):
+        self.outcomes.append(("SUCCEEDED",))
+        return True
+
+    async def fail(self, job_id, worker_id, error, retry_delay_seconds):
+        self.outcomes.append(("FAILED", error, retry_delay_seconds))
+        return self.fail_status
+
+
+class FakeSourcesRepository:
+    def __init__(self) -> None:
+        self.statuses: list[tuple] = []
+
+    async def update_extraction_status(self, source_id, status, progress=None, error=None):
+        self.statuses.append((status, progress, error))
+
+
+class FakeAgent:
+    def __init__(self, errors=None, delay: float = 0.0) -> None:
+        self.errors = errors or []
+        self.delay = delay
+        self.states: list[dict] = []
+        self.sources_repo = FakeSourcesRepository()
+
+    async def execute(self, state):
+        self.states.append(state)
+        await asyncio.sleep(self.delay)
+        return {**state, "errors": self.errors}
+
+
+def make_job(attempts: int = 1) -> dict:
+    return {
+        "id": uuid4(),
+        "kind": EXTRACT_SOURCE,
+        "payload": {"source_id": str(uuid4())},
+        "attempts": attempts,
+        "max_attempts": 3,
+        "priority": 4,
+    }
+
+
+def make_worker(agent, jobs_repo):
+    worker = ExtractionWorker(FakeDatabasePool(), agent, concurrency=1, worker_id="test")
+    worker.jobs_repo = jobs_repo
+    return worker
+
+
+class TestExtractionWorker:
+    """Test job outcomes, retries and lease handling."""
+
+    async def test_successful_extraction_completes_job(self):
+        agent = FakeAgent()
+        jobs_repo = FakeJobsRepository()
+        job = make_job()
+
+        status = await make_worker(agent, jobs_repo).process(job)
+
+        assert status == "SUCCEEDED"
+        assert jobs_repo.outcomes == [("SUCCEEDED",)]
+        assert str(agent.states[0]["source_id"]) == job["payload"]["source_id"]
+
+    async def test_failed_attempt_is_retried(self):
+        agent = FakeAgent(errors=["Extraction failed: LLM unavailable"])
+        jobs_repo = FakeJobsRepository()
+        worker = make_worker(agent, jobs_repo)
+        job = make_job()
+
+        status = await worker.process(job)
+
+        assert status == "QUEUED"
+        delay = worker.settings.job_retry_delay_seconds
+        assert jobs_repo.outcomes == [("FAILED", "Extraction failed: LLM unavailable", delay)]
+        assert agent.sources_repo.statuses[-1] == (
+            "PROCESSING",
+            {"current_stage": "retry_scheduled"},
+            None,
+        )
+
+        agent.errors = []
+        assert await worker.process({**job, "attempts": 2}) == "SUCCEEDED"
+        assert agent.states[-1]["retry_count"] == 1
+
+    async def test_lost_lease_cancels_the_job(self):
+        agent = FakeAgent(delay=10)
+        jobs_repo = FakeJobsRepository(lease_held=False)
+        worker = make_worker(agent, jobs_repo)
+        worker.settings = worker.settings.model_copy(update={"job_heartbeat_seconds": 0.01})
+
+        status = await asyncio.wait_for(worker.process(make_job()), timeout=1)
+
+        assert status is None
+        assert jobs_repo.heartbeats == 1
+        assert jobs_repo.outcomes == []
+
+    async def test_expired_lease_on_last_attempt_fails_the_source(self):
+        agent = FakeAgent()
+        jobs_repo = FakeJobsRepository(fail_status="FAILED")
+        job = make_job(attempts=4)
+
+        status = await make_worker(agent, jobs_repo).process(job)
+
+        assert status == "FAILED"
+        assert agent.states == []
+        assert agent.sources_repo.statuses == [
+            ("FAILED", {"current_stage": "failed"}, "Lease expired on the last attempt")
+        ]
@@ -2,15 +2,16 @@
 Extraction tools for KETA agents.
 """
 
-import json
 import logging
-from typing import Any
-from uuid import UUID, uuid4
+from typing import Any, Optional
 
 from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 
+from packages.agents.tools.llm_cache import LLMResponseCache, StructuredChain
+from packages.graph.identity import entity_id_for
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,6 +50,41 @@ class RelationshipExtractionOutput(BaseModel):
     relationships: list[ExtractedRelationship] = Field(description="List of extracted relationships")
 
 
+class JointExtractionOutput(BaseModel):
+    """Output model for joint entity and relationship extraction."""
+
+    entities: list[ExtractedEntity] = Field(description="List of extracted entities")
+    relationships: list[ExtractedRelationship] = Field(
+        description="Relationships between the extracted entities"
+    )
+
+
+def _entity_dicts(entities: list[ExtractedEntity]) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": str(entity_id_for(entity.name, entity.type)),
+            "name": entity.name,
+            "type": entity.type,
+            "confidence": entity.confidence,
+            "extraction_method": "llm_structured",
+        }
+        for entity in entities
+    ]
+
+
+def _relationship_dicts(relationships: list[ExtractedRelationship]) -> list[dict[str, Any]]:
+    return [
+        {
+            "entity1_name": rel.entity1_name,
+            "entity2_name": rel.entity2_name,
+            "relationship_type": rel.relationship_type,
+            "description": rel.description,
+            "confidence": rel.confidence,
+        }
+        for rel in relationships
+    ]
+
+
 # ============================================
 # EXTRACTION TOOLS
 # ============================================
@@ -59,14 +95,22 @@ class EntityExtractor:
     Tool for extracting entities from text using LLM with structured output.
     """
 
-    def __init__(self, llm: BaseChatModel) -> None:
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        cache: Optional[LLMResponseCache] = None,
+        raise_errors: bool = False,
+    ) -> None:
         """
         Initialize the entity extractor.
 
         Args:
             llm: Language model
+            cache: Persistent cache for structured outputs (optional)
+            raise_errors: Re-raise LLM failures instead of returning no results
         """
         self.llm = llm
+        self.raise_errors = raise_errors
 
         # Create prompt template
         self.prompt = ChatPromptTemplate.from_messages(
@@ -96,7 +140,11 @@ Be thorough but precise. Only extract entities that are clearly identifiable."""
         )
 
         # Create structured output chain
-        self.chain = self.prompt | self.llm.with_structured_output(EntityExtractionOutput)
+        self.chain: StructuredChain = self.prompt | self.llm.with_structured_output(
+            EntityExtractionOutput
+        )
+        if cache is not None:
+            self.chain = cache.wrap(self.chain, self.prompt, EntityExtractionOutput)
 
     async def extract(self, text: str) -> list[dict[str, Any]]:
         """
@@ -110,24 +158,15 @@ Be thorough but precise. Only extract entities that are clearly identifiable."""
         """
         try:
             result = await self.chain.ainvoke({"text": text})
-
-            entities = []
-            for entity in result.entities:
-                entities.append(
-                    {
-                        "id": str(uuid4()),
-                        "name": entity.name,
-                        "type": entity.type,
-                        "confidence": entity.confidence,
-                        "extraction_method": "llm_structured",
-                    }
-                )
+            entities = _entity_dicts(result.entities)
 
             logger.info(f"Extracted {len(entities)} entities from text")
             return entities
 
         except Exception as e:
             logger.error(f"Entity extraction failed: {e}")
+            if self.raise_errors:
+                raise
             return []
 
 
@@ -136,14 +175,22 @@ class RelationshipExtractor:
     Tool for extracting relationships between entities using LLM.
     """
 
-    def __init__(self, llm: BaseChatModel) -> None:
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        cache: Optional[LLMResponseCache] = None,
+        raise_errors: bool = False,
+    ) -> None:
         """
         Initialize the relationship extractor.
 
         Args:
             llm: Language model
+            cache: Persistent cache for structured outputs (optional)
+            raise_errors: Re-raise LLM failures instead of returning no results
         """
         self.llm = llm
+        self.raise_errors = raise_errors
 
         # Create prompt template
         self.prompt = ChatPromptTemplate.from_messages(
@@ -177,7 +224,11 @@ Identify relationships between these entities based on the text.""",
         )
 
         # Create structured output chain
-        self.chain = self.prompt | self.llm.with_structured_output(RelationshipExtractionOutput)
+        self.chain: StructuredChain = self.prompt | self.llm.with_structured_output(
+            RelationshipExtractionOutput
+        )
+        if cache is not None:
+            self.chain = cache.wrap(self.chain, self.prompt, RelationshipExtractionOutput)
 
     async def extract(self, text: str, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """
@@ -202,21 +253,107 @@ Identify relationships between these entities based on the text.""",
 
             result = await self.chain.ainvoke({"text": text, "entities": entity_list})
 
-            relationships = []
-            for rel in result.relationships:
-                relationships.append(
-                    {
-                        "entity1_name": rel.entity1_name,
-                        "entity2_name": rel.entity2_name,
-                        "relationship_type": rel.relationship_type,
-                        "description": rel.description,
-                        "confidence": rel.confidence,
-                    }
-                )
+            relationships = _relationship_dicts(result.relationships)
 
             logger.info(f"Extracted {len(relationships)} relationships")
             return relationships
 
         except Exception as e:
             logger.error(f"Relationship extraction failed: {e}")
+            if self.raise_errors:
+                raise
             return []
+
+
+class JointExtractor:
+    """
+    Tool for extracting entities and the relationships between them in one LLM call.
+
+    Sends each chunk once instead of once per extractor, halving prompt tokens
+    at the cost of a larger structured output.
+    """
+
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        cache: Optional[LLMResponseCache] = None,
+        raise_errors: bool = False,
+    ) -> None:
+        """
+        Initialize the joint extractor.
+
+        Args:
+            llm: Language model
+            cache: Persistent cache for structured outputs (optional)
+            raise_errors: Re-raise LLM failures instead of returning no results
+        """
+        self.llm = llm
+        self.raise_errors = raise_errors
+
+        # Create prompt template
+        self.prompt = ChatPromptTemplate.from_messages(
+            [
+                (
+                    "system",
+                    """You are an expert at extracting entities and their relationships from text.
+
+First extract all named entities. Identify:
+- PERSON: Names of people
+- ORGANIZATION: Companies, institutions, organizations
+- LOCATION: Places, cities, countries, addresses
+- DATE: Dates, times, periods
+- PRODUCT: Products, services, tools
+- CONCEPT: Abstract concepts, theories, methods
+- EVENT: Named events, meetings, conferences
+
+For each entity, provide:
+- name: The exact text as it appears
+- type: One of the types above
+- confidence: How confident you are (0.0 to 1.0)
+
+Then identify relationships between the entities you extracted. For each relationship, provide:
+- entity1_name: Name of the first entity, exactly as in the entity list
+- entity2_name: Name of the second entity, exactly as in the entity list
+- relationship_type: Type of relationship (e.g., works_at, located_in, part_of, related_to)
+- description: Natural language description of the relationship
+- confidence: How confident you are (0.0 to 1.0)
+
+Be thorough but precise. Only extract entities that are clearly identifiable and relationships
+that are explicitly or strongly implied in the text.""",
+                ),
+                ("human", "Text to analyze:\n\n{text}"),
+            ]
+        )
+
+        # Create structured output chain
+        self.chain: StructuredChain = self.prompt | self.llm.with_structured_output(
+            JointExtractionOutput
+        )
+        if cache is not None:
+            self.chain = cache.wrap(self.chain, self.prompt, JointExtractionOutput)
+
+    async def extract(self, text: str) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """
+        Extract entities and relationships from text.
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            Tuple of (entities, relationships) as dictionaries
+        """
+        try:
+            result = await self.chain.ainvoke({"text": text})
+            entities = _entity_dicts(result.entities)
+            relationships = _relationship_dicts(result.relationships) if len(entities) >= 2 else []
+
+            logger.info(
+                f"Jointly extracted {len(entities)} entities and {len(relationships)} relationships"
+            )
+            return entities, relationships
+
+        except Exception as e:
+            logger.error(f"Joint extraction failed: {e}")
+            if self.raise_errors:
+                raise
+            return [], []
@@ -7,6 +7,8 @@ from typing import Any, Optional
 from uuid import UUID
 
 from packages.graph.repository import KnowledgeGraphRepository
+from packages.shared.models import NameMatch
+from packages.shared.models.age import AgeColumnKind
 
 logger = logging.getLogger(__name__)
 
@@ -58,14 +60,16 @@ class EntitySearchTool:
             List of entities
         """
         cypher = f"""
-            MATCH (e:Entity {{type: '{entity_type}'}})
+            MATCH (e:Entity {{type: $entity_type}})
             RETURN e
-            LIMIT {limit}
+            LIMIT {int(limit)}
         """
 
         try:
             logger.debug(f"[EntitySearchTool] Searching entities by type: {entity_type}, limit: {limit}")
-            results = await self.graph_repo.execute_cypher(cypher)
+            results = await self.graph_repo.execute_cypher(
+                cypher, params={"entity_type": entity_type}
+            )
             logger.info(f"Found {len(results)} entities of type {entity_type}")
             return results
         except Exception as e:
@@ -73,7 +77,7 @@ class EntitySearchTool:
             return []
 
     async def search_by_keyword(
-        self, keyword: str, limit: int = 10
+        self, keyword: str, limit: int = 10, fuzzy: bool = False
     ) -> list[dict[str, Any]]:
         """
         Search for entities containing a keyword in their name.
@@ -81,22 +85,16 @@ class EntitySearchTool:
         Args:
             keyword: Keyword to search for
             limit: Maximum number of results
+            fuzzy: Match similar names (typos, spelling variants) instead of substrings
 
         Returns:
-            List of entities
-        """
-        # AGE doesn't have great text search, so we'll use pattern matching
-        safe_keyword = keyword.replace("'", "\\'")
-        cypher = f"""
-            MATCH (e:Entity)
-            WHERE e.name =~ '(?i).*{safe_keyword}.*'
-            RETURN e
-            LIMIT {limit}
+            List of entities, best match first
         """
+        match = NameMatch.FUZZY if fuzzy else NameMatch.SUBSTRING
 
         try:
             logger.debug(f"[EntitySearchTool] Searching entities by keyword: '{keyword}', limit: {limit}")
-            results = await self.graph_repo.execute_cypher(cypher)
+            results = await self.graph_repo.find_entities_by_name(keyword, match, limit=limit)
             logger.info(f"Found {len(results)} entities matching keyword '{keyword}'")
             return results
         except Exception as e:
@@ -133,18 +131,20 @@ class RelationshipTraversalTool:
             List of related entities with relationship info
         """
         cypher = f"""
-            MATCH (e1:Entity {{id: '{entity_id}'}})-[r]-(e2:Entity)
+            MATCH (e1:Entity {{id: $entity_id}})-[r]-(e2:Entity)
             RETURN {{
                 source_entity: e1,
                 relationship: r,
                 target_entity: e2
             }}
-            LIMIT {limit}
+            LIMIT {int(limit)}
         """
 
         try:
             logger.debug(f"[RelationshipTraversalTool] Getting related entities for: {entity_id}, max_depth: {max_depth}, limit: {limit}")
-            results = await self.graph_repo.execute_cypher(cypher)
+            results = await self.graph_repo.execute_cypher(
+                cypher, params={"entity_id": str(entity_id)}
+            )
             logger.info(f"Found {len(results)} related entities for {entity_id}")
             return results
         except Exception as e:
@@ -164,17 +164,18 @@ class RelationshipTraversalTool:
         Returns:
             List of relationships
         """
-        cypher = f"""
-            MATCH (e1:Entity {{id: '{entity1_id}'}})-[r]-(e2:Entity {{id: '{entity2_id}'}})
-            RETURN {{
+        cypher = """
+            MATCH (e1:Entity {id: $entity1_id})-[r]-(e2:Entity {id: $entity2_id})
+            RETURN {
                 source_entity: e1,
                 relationship: r,
                 target_entity: e2
-            }}
+            }
         """
+        params = {"entity1_id": str(entity1_id), "entity2_id": str(entity2_id)}
 
         try:
-            results = await self.graph_repo.execute_cypher(cypher)
+            results = await self.graph_repo.execute_cypher(cypher, params=params)
             logger.info(f"Found {len(results)} relationships between entities")
             return results
         except Exception as e:
@@ -193,13 +194,18 @@ class RelationshipTraversalTool:
         Returns:
             List of relationship types with counts
         """
-        cypher = f"""
-            MATCH (e:Entity {{id: '{entity_id}'}})-[r:RELATED_TO]-(other)
+        cypher = """
+            MATCH (e:Entity {id: $entity_id})-[r:RELATED_TO]-(other)
             RETURN r.relationship_type as type, count(*) as count
         """
 
         try:
-            results = await self.graph_repo.execute_cypher(cypher)
+            rows = await self.graph_repo.execute_cypher_rows(
+                cypher,
+                [("type", AgeColumnKind.SCALAR), ("count", AgeColumnKind.SCALAR)],
+                params={"entity_id": str(entity_id)},
+            )
+            results = [{"type": rel_type, "count": count} for rel_type, count in rows]
             logger.info(f"Found {len(results)} relationship types")
             return results
         except Exception as e:
@@ -221,18 +227,21 @@ class GraphQueryTool:
         """
         self.graph_repo = graph_repo
 
-    async def execute_query(self, cypher_query: str) -> list[dict[str, Any]]:
+    async def execute_query(
+        self, cypher_query: str, params: Optional[dict[str, Any]] = None
+    ) -> list[dict[str, Any]]:
         """
         Execute a custom Cypher query.
 
         Args:
             cypher_query: Cypher query string
+            params: Parameter map referenced in the query as $name
 
         Returns:
             Query results
         """
         try:
-            results = await self.graph_repo.execute_cypher(cypher_query)
+            results = await self.graph_repo.execute_cypher(cypher_query, params=params)
             logger.info(f"Query returned {len(results)} results")
             return results
         except Exception as e:
@@ -253,7 +262,7 @@ class GraphQueryTool:
             Dictionary with entities and relationships
         """
         cypher = f"""
-            MATCH path = (center:Entity {{id: '{entity_id}'}})-[*1..{radius}]-(neighbor)
+            MATCH path = (center:Entity {{id: $entity_id}})-[*1..{int(radius)}]-(neighbor)
             WITH collect(distinct center) + collect(distinct neighbor) as nodes,
                  [r in relationships(path) | r] as rels
             UNWIND nodes as n
@@ -263,12 +272,14 @@ class GraphQueryTool:
         """
 
         try:
-            results = await self.graph_repo.execute_cypher(cypher)
-            if results:
-                return {
-                    "nodes": results[0].get("all_nodes", []),
-                    "relationships": results[0].get("all_rels", []),
-                }
+            rows = await self.graph_repo.execute_cypher_rows(
+                cypher,
+                [("all_nodes", AgeColumnKind.SCALAR), ("all_rels", AgeColumnKind.SCALAR)],
+                params={"entity_id": str(entity_id)},
+            )
+            if rows:
+                all_nodes, all_rels = rows[0]
+                return {"nodes": all_nodes or [], "relationships": all_rels or []}
             return {"nodes": [], "relationships": []}
         except Exception as e:
             logger.error(f"Failed to get entity neighborhood: {e}")
@@ -290,16 +301,24 @@ class GraphQueryTool:
         """
         cypher = f"""
             MATCH path = shortestPath(
-                (e1:Entity {{id: '{entity1_id}'}})-[*1..{max_depth}]-(e2:Entity {{id: '{entity2_id}'}})
+                (e1:Entity {{id: $entity1_id}})
+                -[*1..{int(max_depth)}]-
+                (e2:Entity {{id: $entity2_id}})
             )
             RETURN path, length(path) as path_length
         """
+        params = {"entity1_id": str(entity1_id), "entity2_id": str(entity2_id)}
 
         try:
-            results = await self.graph_repo.execute_cypher(cypher)
-            if results:
-                logger.info(f"Found shortest path of length {results[0].get('path_length')}")
-                return results[0]
+            rows = await self.graph_repo.execute_cypher_rows(
+                cypher,
+                [("path", AgeColumnKind.PATH), ("path_length", AgeColumnKind.SCALAR)],
+                params=params,
+            )
+            if rows:
+                path, path_length = rows[0]
+                logger.info(f"Found shortest path of length {path_length}")
+                return {"path": path.model_dump(), "path_length": path_length}
             return None
         except Exception as e:
             logger.error(f"Failed to find shortest path: {e}")
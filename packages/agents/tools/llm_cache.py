@@ -0,0 +1,217 @@
+"""
+Persistent cache for structured LLM outputs.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Optional, Protocol
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel
+
+from packages.shared.repositories.llm_cache import LLMCacheRepository
+
+logger = logging.getLogger(__name__)
+
+# Eviction scans the whole table, so it runs once per this many stored responses
+EVICT_EVERY_WRITES = 100
+
+
+class StructuredChain(Protocol):
+    """A structured-output chain as extractors call it: a Runnable or a CachedChain."""
+
+    async def ainvoke(self, inputs: dict[str, Any], /) -> Any: ...
+
+
+def _sha256(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _llm_identity(llm: BaseChatModel) -> tuple[str, str, Optional[float]]:
+    """Provider, model and temperature of a chat model, as far as it exposes them."""
+    provider = getattr(llm, "_llm_type", None) or type(llm).__name__
+    model = (
+        getattr(llm, "model_name", None)
+        or getattr(llm, "model", None)
+        or getattr(llm, "deployment_name", None)
+        or type(llm).__name__
+    )
+    temperature = getattr(llm, "temperature", None)
+    return str(provider), str(model), temperature
+
+
+def prompt_hash(prompt: ChatPromptTemplate, schema: type[BaseModel]) -> str:
+    """
+    Hash a prompt template together with its structured output schema.
+
+    Editing either the prompt text or the output model changes the hash, so
+    stale responses are never returned for a changed extractor.
+
+    Args:
+        prompt: Chat prompt template
+        schema: Pydantic model the LLM is asked to produce
+
+    Returns:
+        Hex digest
+    """
+    messages = [
+        (
+            type(message).__name__,
+            getattr(getattr(message, "prompt", None), "template", str(message)),
+        )
+        for message in prompt.messages
+    ]
+    return _sha256({"messages": messages, "schema": schema.model_json_schema()})
+
+
+def extractor_fingerprint(
+    llm: BaseChatModel, prompts: list[tuple[ChatPromptTemplate, type[BaseModel]]]
+) -> tuple[str, str]:
+    """
+    Identify the model and prompts that produce an extraction.
+
+    Built from the same parts the response cache keys on, so stored chunk
+    extractions are reused only while the LLM would have been asked the same.
+
+    Args:
+        llm: Language model the extractors call
+        prompts: Prompt template and output schema of each extractor involved
+
+    Returns:
+        Model name and a hash of the provider, temperature, prompts and schemas
+    """
+    provider, model, temperature = _llm_identity(llm)
+    return model, _sha256(
+        {
+            "provider": provider,
+            "temperature": temperature,
+            "prompts": [prompt_hash(prompt, schema) for prompt, schema in prompts],
+        }
+    )
+
+
+class CachedChain:
+    """
+    Structured-output chain that consults the LLM cache before invoking the model.
+
+    Exposes the chain's ``ainvoke`` so extractors can use it as a drop-in.
+    """
+
+    def __init__(
+        self,
+        cache: "LLMResponseCache",
+        chain: StructuredChain,
+        prompt: ChatPromptTemplate,
+        schema: type[BaseModel],
+    ) -> None:
+        self.cache = cache
+        self.chain = chain
+        self.schema = schema
+        self.prompt_hash = prompt_hash(prompt, schema)
+
+    async def ainvoke(self, inputs: dict[str, Any]) -> BaseModel:
+        """
+        Return the cached output for these inputs, or invoke the chain and store it.
+
+        Args:
+            inputs: Prompt variables
+
+        Returns:
+            Structured output
+        """
+        key = self.cache.key_for(self.prompt_hash, inputs)
+        cached = await self.cache.lookup(key)
+        if cached is not None:
+            return self.schema.model_validate(cached)
+
+        result: BaseModel = await self.chain.ainvoke(inputs)
+        await self.cache.store(key, self.prompt_hash, result.model_dump())
+        return result
+
+
+class LLMResponseCache:
+    """
+    Content-addressed cache of structured LLM outputs, stored in Postgres.
+
+    Entries are keyed by provider, model, temperature, prompt template hash and
+    a hash of the prompt inputs (the chunk text, plus the entity list for
+    relationship extraction). Database errors are logged and treated as misses,
+    so a cache outage only costs the LLM calls it would have saved.
+    """
+
+    def __init__(self, repository: LLMCacheRepository, llm: BaseChatModel, max_bytes: int) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            repository: LLM cache repository
+            llm: Language model whose outputs are cached
+            max_bytes: Size budget for all cached responses
+        """
+        self.repository = repository
+        self.provider, self.model, self.temperature = _llm_identity(llm)
+        self.max_bytes = max_bytes
+        self.errors = 0
+        self._writes_since_eviction = 0
+
+    def wrap(
+        self, chain: StructuredChain, prompt: ChatPromptTemplate, schema: type[BaseModel]
+    ) -> CachedChain:
+        """
+        Wrap a structured-output chain.
+
+        Args:
+            chain: ``prompt | llm.with_structured_output(schema)``
+            prompt: The chain's prompt template
+            schema: The chain's output model
+
+        Returns:
+            Chain with the same ``ainvoke`` signature
+        """
+        return CachedChain(self, chain, prompt, schema)
+
+    def key_for(self, prompt_hash: str, inputs: dict[str, Any]) -> str:
+        """
+        Build the cache key for one request.
+
+        Args:
+            prompt_hash: Hash from :func:`prompt_hash`
+            inputs: Prompt variables
+
+        Returns:
+            Hex digest
+        """
+        return _sha256(
+            {
+                "provider": self.provider,
+                "model": self.model,
+                "temperature": self.temperature,
+                "prompt": prompt_hash,
+                "inputs": _sha256(inputs),
+            }
+        )
+
+    async def lookup(self, key: str) -> Optional[dict[str, Any]]:
+        """Fetch a cached response; the repository counts the hit or miss."""
+        try:
+            return await self.repository.get(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"LLM cache lookup failed: {e}")
+            return None
+
+    async def store(self, key: str, prompt_hash: str, response: dict[str, Any]) -> None:
+        """Store a response and evict old entries every EVICT_EVERY_WRITES writes."""
+        try:
+            await self.repository.put(key, self.provider, self.model, prompt_hash, response)
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= EVICT_EVERY_WRITES:
+                self._writes_since_eviction = 0
+                evicted = await self.repository.evict(self.max_bytes)
+                if evicted:
+                    logger.info(f"Evicted {evicted} LLM cache entries")
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"LLM cache write failed: {e}")
@@ -0,0 +1,254 @@
+"""
+Extraction worker for KETA.
+
+Runs source extractions queued in keta.jobs, outside the API process:
+
+    python -m packages.agents.worker [--concurrency N]
+
+Any number of workers can run against the same database. Each claims jobs
+lowest priority value first with FOR UPDATE SKIP LOCKED, extends its lease
+with heartbeats while a job runs and requeues failed jobs with a growing delay
+until they run out of attempts. A job whose worker died is reclaimed once its lease expires, and
+every retry resumes from the source's chunk checkpoints.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+from typing import Any, Awaitable, Callable, Optional
+from uuid import UUID, uuid4
+
+from packages.agents.extraction_agent import ExtractionAgent
+from packages.shared.config import get_settings
+from packages.shared.database import DatabasePool
+from packages.shared.models import ExtractionStatus
+from packages.shared.repositories.jobs import EXTRACT_SOURCE, JobsRepository
+
+logger = logging.getLogger(__name__)
+
+
+class JobError(Exception):
+    """A job attempt failed."""
+
+
+class LeaseLostError(Exception):
+    """Another worker reclaimed the job after this worker's lease expired."""
+
+
+class ExtractionWorker:
+    """
+    Pulls extraction jobs from keta.jobs and runs up to ``concurrency`` at a time.
+    """
+
+    def __init__(
+        self,
+        db_pool: DatabasePool,
+        agent: ExtractionAgent,
+        concurrency: Optional[int] = None,
+        worker_id: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the worker.
+
+        Args:
+            db_pool: Database connection pool
+            agent: Extraction agent shared by all job slots, so they share its
+                LLM call budget
+            concurrency: Jobs run at the same time (optional, defaults to
+                Settings.worker_concurrency)
+            worker_id: Lease holder name (optional, defaults to host, PID and a random suffix)
+        """
+        self.settings = get_settings()
+        self.db_pool = db_pool
+        self.agent = agent
+        self.concurrency = max(1, concurrency or self.settings.worker_concurrency)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid4().hex[:6]}"
+        self.jobs_repo = JobsRepository(db_pool)
+        self.handlers: dict[str, Callable[[Any], Awaitable[None]]] = {
+            EXTRACT_SOURCE: self._extract_source,
+        }
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """
+        Claim and run jobs until stop is set; running jobs are finished first.
+
+        Args:
+            stop: Event that ends the worker
+        """
+        logger.info(f"Worker {self.worker_id} started with {self.concurrency} slots")
+        await asyncio.gather(*(self._slot(stop) for _ in range(self.concurrency)))
+        logger.info(f"Worker {self.worker_id} stopped")
+
+    async def _slot(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                job = await self.jobs_repo.claim(self.worker_id, self.settings.job_lease_seconds)
+            except Exception as e:
+                logger.error(f"Failed to claim a job: {e}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.settings.job_poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.process(job)
+
+    async def process(self, job: Any) -> Optional[str]:
+        """
+        Run one claimed job and record the outcome.
+
+        Args:
+            job: Claimed job record
+
+        Returns:
+            Final status (SUCCEEDED, QUEUED for a retry, FAILED), or None if the lease was lost
+        """
+        job_id = job["id"]
+        handler = self.handlers.get(job["kind"])
+        logger.info(f"Running job {job_id} ({job['kind']}), attempt {job['attempts']}")
+
+        try:
+            if handler is None:
+                raise JobError(f"Unknown job kind {job['kind']!r}")
+            if job["attempts"] > job["max_attempts"]:
+                # Reclaimed after its lease expired on the last attempt
+                raise JobError("Lease expired on the last attempt")
+            await self._with_heartbeat(job_id, handler(job))
+        except LeaseLostError:
+            logger.warning(f"Job {job_id} lease lost, leaving it to its new owner")
+            return None
+        except Exception as e:
+            delay = self.settings.job_retry_delay_seconds * job["attempts"]
+            status = await self.jobs_repo.fail(job_id, self.worker_id, str(e), delay)
+            logger.error(f"Job {job_id} attempt {job['attempts']} failed ({status}): {e}")
+            if status == "QUEUED":
+                await self._on_retry(job)
+            elif status == "FAILED":
+                await self._on_failure(job, str(e))
+            return status
+
+        if not await self.jobs_repo.complete(job_id, self.worker_id):
+            logger.warning(f"Job {job_id} finished after its lease was lost")
+            return None
+        logger.info(f"Job {job_id} succeeded")
+        return "SUCCEEDED"
+
+    async def _with_heartbeat(self, job_id: UUID, work: Awaitable[None]) -> None:
+        """Run work while extending the job's lease; cancel it if the lease is lost."""
+        task = asyncio.ensure_future(work)
+        lost = False
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=self.settings.job_heartbeat_seconds)
+            if done:
+                break
+            try:
+                held = await self.jobs_repo.heartbeat(
+                    job_id, self.worker_id, self.settings.job_lease_seconds
+                )
+            except Exception as e:
+                # Keep working; the lease covers a few missed heartbeats
+                logger.warning(f"Heartbeat for job {job_id} failed: {e}")
+                continue
+            if not held:
+                lost = True
+                task.cancel()
+                break
+        try:
+            await task
+        except asyncio.CancelledError:
+            if lost:
+                raise LeaseLostError(str(job_id))
+            raise
+
+    async def _extract_source(self, job: Any) -> None:
+        payload = job["payload"]
+        # A retry resumes: chunks an earlier attempt checkpointed are skipped
+        state = await self.agent.execute(
+            {
+                "source_id": UUID(payload["source_id"]),
+                "agent_path": [],
+                "errors": [],
+                "retry_count": job["attempts"] - 1,
+                "priority": job["priority"],
+            }
+        )
+        if state.get("errors"):
+            raise JobError(state["errors"][-1])
+
+    async def _on_retry(self, job: Any) -> None:
+        """Show a source whose extraction will be retried as processing, not failed."""
+        if job["kind"] != EXTRACT_SOURCE:
+            return
+        try:
+            await self.agent.sources_repo.update_extraction_status(
+                UUID(job["payload"]["source_id"]),
+                ExtractionStatus.PROCESSING.value,
+                {"current_stage": "retry_scheduled"},
+            )
+        except Exception as e:
+            logger.error(f"Failed to update extraction status: {e}")
+
+    async def _on_failure(self, job: Any, error: str) -> None:
+        """
+        Mark a source whose extraction ran out of attempts as failed.
+
+        The agent does this itself when an attempt fails, but not when the job
+        fails before the agent runs, e.g. after its lease expired on the last
+        attempt because the worker died mid-document.
+        """
+        if job["kind"] != EXTRACT_SOURCE:
+            return
+        try:
+            await self.agent.sources_repo.update_extraction_status(
+                UUID(job["payload"]["source_id"]),
+                ExtractionStatus.FAILED.value,
+                {"current_stage": "failed"},
+                error=error,
+            )
+        except Exception as e:
+            logger.error(f"Failed to update extraction status: {e}")
+
+
+async def _main() -> None:
+    from packages.shared.llm_factory import create_llm
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run KETA extraction jobs")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.worker_concurrency,
+        help="Extraction jobs run at the same time",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level.upper()),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    db_pool = DatabasePool()
+    await db_pool.initialize(
+        database_url=settings.database_url,
+        min_size=settings.db_pool_min_size,
+        max_size=settings.db_pool_max_size,
+        statement_cache_size=settings.db_statement_cache_size,
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    try:
+        agent = ExtractionAgent(db_pool, llm=create_llm(settings))
+        await ExtractionWorker(db_pool, agent, concurrency=args.concurrency).run(stop)
+    finally:
+        await db_pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -11,7 +11,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from packages.agents.registry import agent_registry
 from packages.api.routers import objectives, sources, chat, health, graph
+from packages.graph.migrations import apply_graph_migrations
 from packages.shared.config import get_settings
 from packages.shared.database import db_pool
 from packages.shared.models import ErrorResponse
@@ -43,16 +45,36 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             database_url=settings.database_url,
             min_size=settings.db_pool_min_size,
             max_size=settings.db_pool_max_size,
+            statement_cache_size=settings.db_statement_cache_size,
         )
         logger.info("Database pool initialized")
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         raise
 
+    # Create label tables and property indexes for graph lookups
+    if settings.graph_migrations_on_startup:
+        try:
+            await apply_graph_migrations(db_pool, settings.graph_name)
+        except Exception as e:
+            logger.error(f"Failed to apply graph migrations: {e}")
+            await db_pool.close()
+            raise
+
+    # Build agents, LLM client and orchestrator graph once for all requests
+    try:
+        agent_registry.initialize(db_pool)
+        logger.info("Agent registry initialized")
+    except Exception as e:
+        logger.error(f"Failed to initialize agents: {e}")
+        await db_pool.close()
+        raise
+
     yield
 
     # Cleanup
     logger.info("Shutting down KETA API...")
+    agent_registry.close()
     await db_pool.close()
     logger.info("Database pool closed")
 
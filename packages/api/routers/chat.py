@@ -8,6 +8,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from packages.agents.orchestrator import AgentOrchestrator
+from packages.agents.registry import AgentRegistry, get_agent_registry
 from packages.agents.state import AgentState
 from packages.shared.database import DatabasePool, get_db_pool
 from packages.shared.models import (
@@ -47,10 +48,10 @@ def get_objectives_repo(
 
 
 def get_orchestrator(
-    db_pool: DatabasePool = Depends(get_db_pool),
+    registry: AgentRegistry = Depends(get_agent_registry),
 ) -> AgentOrchestrator:
-    """Dependency for getting agent orchestrator."""
-    return AgentOrchestrator(db_pool)
+    """Dependency for getting the shared agent orchestrator."""
+    return registry.orchestrator
 
 
 @router.post("/chat/sessions", response_model=ChatSessionResponse, status_code=201)
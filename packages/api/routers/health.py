@@ -10,6 +10,7 @@ from fastapi import APIRouter, Depends
 from packages.shared.config import get_settings
 from packages.shared.database import DatabasePool, get_db_pool
 from packages.shared.models import HealthCheckResponse
+from packages.shared.repositories import LLMCacheRepository
 
 logger = logging.getLogger(__name__)
 
@@ -55,3 +56,36 @@ async def health_check(
         graph=graph_healthy,
         timestamp=datetime.utcnow(),
     )
+
+
+@router.get("/health/db")
+async def database_metrics(
+    db_pool: DatabasePool = Depends(get_db_pool),
+) -> dict:
+    """
+    Database pool metrics endpoint.
+
+    Returns:
+        Pool size, tracked AGE sessions and acquire-wait, setup and query timings
+    """
+    return db_pool.get_metrics()
+
+
+@router.get("/health/llm-cache")
+async def llm_cache_metrics(
+    db_pool: DatabasePool = Depends(get_db_pool),
+) -> dict:
+    """
+    LLM response cache metrics endpoint.
+
+    Hits and misses are counted in the database by every worker process, so
+    the hit rate covers all extraction runs.
+
+    Returns:
+        Whether the cache is enabled, the size of the stored entries, and the
+        hits, misses and hit rate of all lookups
+    """
+    return {
+        "enabled": get_settings().llm_cache_enabled,
+        "stored": await LLMCacheRepository(db_pool).get_stats(),
+    }
@@ -3,65 +3,120 @@ Sources CRUD endpoints.
 """
 
 import logging
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+import asyncpg
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 
-from packages.agents.extraction_agent import ExtractionAgent
+from packages.graph.repository import KnowledgeGraphRepository
+from packages.shared.config import get_settings
 from packages.shared.database import DatabasePool, get_db_pool
 from packages.shared.models import (
+    ExtractionOrder,
     ExtractionStatus,
     ExtractionStatusResponse,
+    ObjectiveExtractionStatus,
     SourceCreate,
     SourceResponse,
+    SourceUpdate,
 )
-from packages.shared.repositories import ObjectivesRepository
+from packages.shared.repositories import (
+    JobsRepository,
+    ObjectivesRepository,
+    SourceChunksRepository,
+)
+from packages.shared.repositories.jobs import EXTRACT_SOURCE
 from packages.shared.repositories.sources import SourcesRepository
+from packages.shared.text_processing import chunk_source, content_hash
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Metadata priority outranks any chunk count in the combined job priority
+_PRIORITY_STEP = 2**32
+
 
-async def run_extraction_task(source_id: UUID, db_pool: DatabasePool) -> None:
+def extraction_priority(
+    chunk_count: int,
+    metadata: Optional[dict] = None,
+    order: ExtractionOrder = ExtractionOrder.SMALLEST_FIRST,
+) -> int:
     """
-    Background task that executes extraction on a source document.
+    Compute the job priority of a source's extraction; lower runs first.
+
+    Smallest-first ordering minimizes the mean time until a source completes.
+    With ExtractionOrder.PRIORITY, a higher integer metadata["priority"] runs
+    first and sources of equal priority run smallest first.
 
     Args:
-        source_id: Source UUID to extract
-        db_pool: Database connection pool
+        chunk_count: Number of chunks in the source
+        metadata: Source metadata (optional)
+        order: Extraction order
+
+    Returns:
+        Job priority
     """
-    try:
-        logger.info(f"Starting extraction task for source {source_id}")
+    if order == ExtractionOrder.PRIORITY:
+        try:
+            rank = int((metadata or {}).get("priority", 0))
+        except (TypeError, ValueError):
+            rank = 0
+        return chunk_count - rank * _PRIORITY_STEP
+    return chunk_count
 
-        agent = ExtractionAgent(db_pool)
 
-        state = {
-            "source_id": source_id,
-            "agent_path": [],
-            "errors": [],
-            "retry_count": 0,
-        }
+async def enqueue_extraction(
+    jobs_repo: JobsRepository,
+    source_id: UUID,
+    priority: int = 0,
+    conn: Optional[asyncpg.Connection] = None,
+) -> Optional[asyncpg.Record]:
+    """
+    Queue an extraction job for the workers (python -m packages.agents.worker).
 
-        result_state = await agent.execute(state)
+    The job extracts the chunks not yet checkpointed for the source.
 
-        if result_state.get("errors"):
-            logger.warning(f"Extraction completed with errors: {result_state['errors']}")
-        else:
-            logger.info(f"Extraction task completed successfully for source {source_id}")
+    Args:
+        jobs_repo: Jobs repository
+        source_id: Source UUID to extract
+        priority: Job priority from extraction_priority
+        conn: Connection with an open transaction (optional)
 
-    except Exception as e:
-        logger.error(f"Extraction task failed for source {source_id}: {e}", exc_info=True)
+    Returns:
+        Created job record, or None if the source already has a QUEUED or
+        RUNNING job
+    """
+    return await jobs_repo.enqueue(
+        EXTRACT_SOURCE,
+        {"source_id": str(source_id)},
+        max_attempts=get_settings().job_max_attempts,
+        priority=priority,
+        conn=conn,
+    )
 
-        try:
-            sources_repo = SourcesRepository(db_pool)
-            await sources_repo.update_extraction_status(
-                source_id,
-                ExtractionStatus.FAILED.value,
-                error=str(e)
-            )
-        except Exception as update_error:
-            logger.error(f"Failed to update extraction status: {update_error}")
+
+def content_hashes(content: str) -> dict:
+    """
+    Hash a source's content and its chunks.
+
+    Chunk hashes use the chunking extraction will apply, so known chunks can be
+    matched against chunk_extractions before any LLM call and an edit can be
+    diffed against the previous version. Chunking and hashing a large source
+    takes a while, so handlers run this in the thread pool.
+
+    Args:
+        content: Source content
+
+    Returns:
+        Column values for content_hash and chunk_hashes
+    """
+    return {
+        "content_hash": content_hash(content),
+        "chunk_hashes": [content_hash(chunk) for _, chunk in chunk_source(content)],
+    }
 
 
 def get_sources_repo(
@@ -130,6 +185,8 @@ async def create_source(
         data["extraction_status"] = ExtractionStatus.PENDING.value
         data["extraction_progress"] = {}
 
+        data.update(await run_in_threadpool(content_hashes, source.content))
+
         record = await sources_repo.create(data)
         return SourceResponse(**dict(record))
 
@@ -203,19 +260,115 @@ async def get_source(
         raise HTTPException(status_code=500, detail="Failed to get source")
 
 
+@router.put("/sources/{source_id}", response_model=SourceResponse)
+async def update_source(
+    source_id: UUID,
+    source: SourceUpdate,
+    sources_repo: SourcesRepository = Depends(get_sources_repo),
+    db_pool: DatabasePool = Depends(get_db_pool),
+) -> SourceResponse:
+    """
+    Update a source.
+
+    New content of an extracted source is diffed against its chunk
+    checkpoints: a job is queued that extracts only added or changed chunks and
+    retracts the provenance of removed chunks from the knowledge graph.
+
+    Args:
+        source_id: Source UUID
+        source: Update data
+
+    Returns:
+        Updated source
+    """
+    try:
+        existing = await sources_repo.get_by_id(source_id)
+        if not existing:
+            raise HTTPException(status_code=404, detail="Source not found")
+
+        # Check name uniqueness if changing name
+        if source.name and source.name != existing["name"]:
+            name_exists = await sources_repo.get_by_objective_and_name(
+                existing["objective_id"], source.name
+            )
+            if name_exists:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Source with name '{source.name}' already exists for this objective",
+                )
+
+        data = source.model_dump(exclude_unset=True)
+        reextract = False
+        content = source.content
+        if content is not None and (
+            await run_in_threadpool(content_hash, content) != existing["content_hash"]
+        ):
+            if existing["extraction_status"] == ExtractionStatus.PROCESSING.value:
+                raise HTTPException(
+                    status_code=409, detail="Source content cannot change during extraction"
+                )
+            data.update(await run_in_threadpool(content_hashes, content))
+            # Sources that were never extracted completely are extracted in full later
+            reextract = existing["extraction_status"] == ExtractionStatus.COMPLETED.value
+            if reextract:
+                data["extraction_status"] = ExtractionStatus.PROCESSING.value
+                data["extraction_progress"] = {"current_stage": "queued"}
+
+        async with db_pool.transaction() as conn:
+            if reextract and not existing["chunk_hashes"]:
+                # Uploaded before chunk hashes were recorded: nothing to diff against, so
+                # the old graph contributions go and the new content is extracted in full
+                graph_repo = KnowledgeGraphRepository(db_pool, get_settings().graph_name)
+                await graph_repo.remove_source(source_id, conn=conn)
+            record = await sources_repo.update(source_id, data, conn=conn)
+            if record is None:
+                # Deleted since it was read
+                raise HTTPException(status_code=404, detail="Source not found")
+            if reextract:
+                job = await enqueue_extraction(
+                    JobsRepository(db_pool),
+                    source_id,
+                    extraction_priority(len(data["chunk_hashes"])),
+                    conn=conn,
+                )
+                if job is None:
+                    # Raising rolls back the content update
+                    raise HTTPException(
+                        status_code=409, detail="Source already has a queued extraction job"
+                    )
+
+        return SourceResponse(**dict(record))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to update source: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update source")
+
+
 @router.delete("/sources/{source_id}", status_code=204)
 async def delete_source(
     source_id: UUID,
     sources_repo: SourcesRepository = Depends(get_sources_repo),
+    db_pool: DatabasePool = Depends(get_db_pool),
 ) -> None:
     """
-    Delete a source.
+    Delete a source and everything it contributed to the knowledge graph.
+
+    The graph cleanup, graph statistics and the source row change in one transaction.
 
     Args:
         source_id: Source UUID
     """
     try:
-        deleted = await sources_repo.delete(source_id)
+        source = await sources_repo.get_by_id(source_id)
+        if not source:
+            raise HTTPException(status_code=404, detail="Source not found")
+
+        graph_repo = KnowledgeGraphRepository(db_pool, get_settings().graph_name)
+        async with db_pool.transaction() as conn:
+            await graph_repo.remove_source(source_id, conn=conn)
+            deleted = await sources_repo.delete(source_id, conn=conn)
         if not deleted:
             raise HTTPException(status_code=404, detail="Source not found")
 
@@ -229,37 +382,55 @@ async def delete_source(
 @router.post("/sources/{source_id}/extract", status_code=202)
 async def trigger_extraction(
     source_id: UUID,
-    background_tasks: BackgroundTasks,
     sources_repo: SourcesRepository = Depends(get_sources_repo),
     db_pool: DatabasePool = Depends(get_db_pool),
 ) -> dict:
     """
-    Trigger extraction for a source.
+    Queue extraction of a source for the extraction workers.
+
+    A failed or interrupted extraction resumes from its chunk checkpoints; a
+    completed source is removed from the graph and extracted again in full.
+    A source that is already PROCESSING, or has an active job, is refused with
+    409 so two workers never extract it at the same time.
 
     Args:
         source_id: Source UUID
-        background_tasks: FastAPI background tasks manager
         sources_repo: Sources repository
         db_pool: Database connection pool
 
     Returns:
-        Extraction trigger confirmation
+        Extraction trigger confirmation with the job ID
     """
     try:
         source = await sources_repo.get_by_id(source_id)
         if not source:
             raise HTTPException(status_code=404, detail="Source not found")
 
-        await sources_repo.update_extraction_status(
-            source_id, ExtractionStatus.PROCESSING.value, {"current_stage": "initializing"}
-        )
-
-        background_tasks.add_task(run_extraction_task, source_id, db_pool)
+        async with db_pool.transaction() as conn:
+            queued = await sources_repo.queue_source_for_extraction(source_id, conn=conn)
+            if queued is None:
+                raise HTTPException(status_code=409, detail="Source is already being extracted")
+            if queued["previous_status"] == ExtractionStatus.COMPLETED.value:
+                graph_repo = KnowledgeGraphRepository(db_pool, get_settings().graph_name)
+                await graph_repo.remove_source(source_id, conn=conn)
+                await SourceChunksRepository(db_pool).delete(source_id, conn=conn)
+            job = await enqueue_extraction(
+                JobsRepository(db_pool),
+                source_id,
+                extraction_priority(queued["chunk_count"]),
+                conn=conn,
+            )
+            if job is None:
+                # Raising rolls back the status change and the graph removal
+                raise HTTPException(
+                    status_code=409, detail="Source already has a queued extraction job"
+                )
 
         return {
             "message": "Extraction triggered",
             "source_id": str(source_id),
             "status": "PROCESSING",
+            "job_id": str(job["id"]),
         }
 
     except HTTPException:
@@ -302,3 +473,97 @@ async def get_extraction_status(
     except Exception as e:
         logger.error(f"Failed to get extraction status: {e}")
         raise HTTPException(status_code=500, detail="Failed to get extraction status")
+
+
+@router.post("/objectives/{objective_id}/extract", status_code=202)
+async def trigger_objective_extraction(
+    objective_id: UUID,
+    order: ExtractionOrder = Query(ExtractionOrder.SMALLEST_FIRST),
+    sources_repo: SourcesRepository = Depends(get_sources_repo),
+    objectives_repo: ObjectivesRepository = Depends(get_objectives_repo),
+    db_pool: DatabasePool = Depends(get_db_pool),
+) -> dict:
+    """
+    Queue extraction of all PENDING and FAILED sources of an objective.
+
+    Workers claim the jobs in the requested order, and all sources extracted
+    by a worker share its LLM call budget. Failed sources resume from their
+    chunk checkpoints.
+
+    Args:
+        objective_id: Objective UUID
+        order: smallest_first, or priority for metadata["priority"] (highest first)
+
+    Returns:
+        Number of queued sources and their job IDs
+    """
+    try:
+        objective = await objectives_repo.get_by_id(objective_id)
+        if not objective:
+            raise HTTPException(status_code=404, detail="Objective not found")
+
+        async with db_pool.transaction() as conn:
+            sources = await sources_repo.queue_for_extraction(objective_id, conn=conn)
+            jobs = await JobsRepository(db_pool).enqueue_many(
+                EXTRACT_SOURCE,
+                [
+                    (
+                        {"source_id": str(source["id"])},
+                        extraction_priority(source["chunk_count"], source["metadata"], order),
+                    )
+                    for source in sources
+                ],
+                max_attempts=get_settings().job_max_attempts,
+                conn=conn,
+            )
+
+        return {
+            "message": "Extraction triggered",
+            "objective_id": str(objective_id),
+            "order": order.value,
+            "queued_sources": len(jobs),
+            "job_ids": [str(job["id"]) for job in jobs],
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to trigger objective extraction: {e}")
+        raise HTTPException(status_code=500, detail="Failed to trigger objective extraction")
+
+
+@router.get(
+    "/objectives/{objective_id}/extraction-status", response_model=ObjectiveExtractionStatus
+)
+async def get_objective_extraction_status(
+    objective_id: UUID,
+    sources_repo: SourcesRepository = Depends(get_sources_repo),
+    objectives_repo: ObjectivesRepository = Depends(get_objectives_repo),
+) -> ObjectiveExtractionStatus:
+    """
+    Get extraction progress aggregated over an objective's sources.
+
+    Args:
+        objective_id: Objective UUID
+
+    Returns:
+        Source counts by extraction status and chunk, entity and relationship totals
+    """
+    try:
+        objective = await objectives_repo.get_by_id(objective_id)
+        if not objective:
+            raise HTTPException(status_code=404, detail="Objective not found")
+
+        summary = dict(await sources_repo.get_extraction_summary(objective_id))
+        total, processed = summary["total_chunks"], summary["processed_chunks"]
+        return ObjectiveExtractionStatus(
+            objective_id=objective_id,
+            percent_complete=round(100 * processed / total, 1) if total else 0.0,
+            **summary,
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get objective extraction status: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get objective extraction status")
@@ -0,0 +1,65 @@
+"""Unit tests for the sources endpoints."""
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from packages.api.routers.sources import update_source
+from packages.shared.models import ExtractionStatus, SourceUpdate
+
+
+class FakeConnection:
+    """Answers the job insert like ON CONFLICT DO NOTHING on an active job."""
+
+    async def fetchrow(self, query, *args):
+        return None
+
+
+class FakeDatabasePool:
+    def __init__(self) -> None:
+        self.rolled_back = False
+
+    @asynccontextmanager
+    async def transaction(self):
+        try:
+            yield FakeConnection()
+        except Exception:
+            self.rolled_back = True
+            raise
+
+
+class FakeSourcesRepository:
+    def __init__(self, source: dict) -> None:
+        self.source = source
+
+    async def get_by_id(self, source_id):
+        return self.source
+
+    async def update(self, source_id, data, conn=None):
+        return {**self.source, **data}
+
+
+class TestUpdateSource:
+    """Test re-extraction of changed content."""
+
+    async def test_changed_content_with_an_active_job_conflicts(self):
+        source_id = uuid4()
+        db_pool = FakeDatabasePool()
+        sources_repo = FakeSourcesRepository(
+            {
+                "id": source_id,
+                "name": "notes",
+                "extraction_status": ExtractionStatus.COMPLETED.value,
+                "content_hash": "old",
+                "chunk_hashes": ["old"],
+            }
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await update_source(
+                source_id, SourceUpdate(content="New content."), sources_repo, db_pool
+            )
+
+        assert exc_info.value.status_code == 409
+        assert db_pool.rolled_back
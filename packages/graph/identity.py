@@ -0,0 +1,43 @@
+"""
+Deterministic entity identity for the KETA knowledge graph.
+"""
+
+import re
+from uuid import UUID, uuid5
+
+# Namespace for entity UUIDs; changing it re-keys every entity
+ENTITY_NAMESPACE = UUID("5d3c6a0e-8f3b-4a57-9a1e-2f6b7c4d9e10")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_entity_key(name: str, entity_type: str) -> str:
+    """
+    Build the normalized identity key for an entity.
+
+    Names are case-folded with whitespace collapsed, types are upper-cased, so
+    "Acme  Corp" and "acme corp" of the same type share one key.
+
+    Args:
+        name: Entity name as extracted
+        entity_type: Entity type (PERSON, ORGANIZATION, etc.)
+
+    Returns:
+        Normalized "TYPE:name" key
+    """
+    normalized_name = _WHITESPACE.sub(" ", name).strip().casefold()
+    return f"{entity_type.strip().upper()}:{normalized_name}"
+
+
+def entity_id_for(name: str, entity_type: str) -> UUID:
+    """
+    Derive the entity UUID from its normalized (name, type) key.
+
+    Args:
+        name: Entity name as extracted
+        entity_type: Entity type
+
+    Returns:
+        UUIDv5 that is stable across runs, processes and sources
+    """
+    return uuid5(ENTITY_NAMESPACE, normalize_entity_key(name, entity_type))
@@ -0,0 +1,290 @@
+"""
+Versioned index migrations for the KETA knowledge graph.
+
+Apache AGE stores each vertex and edge label in its own table
+(``<graph>."Entity"``, ``<graph>."RELATED_TO"``, ...) with the properties in a
+single agtype column. AGE does not index those tables, so every property match
+is a sequential scan. The migrations below create the label tables up front and
+add the indexes the repositories rely on:
+
+- GIN on ``properties`` serves property-map matches such as
+  ``MATCH (e:Entity {id: $id})``, which AGE compiles to ``properties @> ...``
+- B-tree expression indexes serve ``WHERE e.name = $name`` style comparisons
+- B-tree indexes on vertex ``id`` and edge ``start_id``/``end_id`` serve traversals
+- GIN on ``RELATED_TO`` properties serves objective-scoped edge matches
+
+Entity names are additionally mirrored into ``keta.entity_names`` (trigram
+indexed) for name search; migration 3 backfills it from existing vertices.
+Migration 4 makes the Entity ``id`` property unique, so concurrent extraction
+workers can never create the same deterministic-ID entity twice.
+
+Applied versions are recorded per graph in ``keta.graph_migrations``. Run at API
+startup or from the command line::
+
+    python -m packages.graph.migrations [--graph keta_graph] [--status]
+"""
+
+import argparse
+import asyncio
+import logging
+import re
+from typing import Optional
+
+import asyncpg
+from pydantic import BaseModel, Field
+
+from packages.shared.database import DatabasePool
+
+logger = logging.getLogger(__name__)
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Serializes concurrent runs, e.g. several API workers starting at once
+_ADVISORY_LOCK_KEY = 0x6B657461
+
+VERTEX_LABELS = ("Entity", "Document")
+EDGE_LABELS = ("RELATED_TO", "MENTIONED_IN", "EXTRACTED_FROM")
+
+
+def _property(name: str) -> str:
+    """SQL expression AGE generates for reading a vertex or edge property."""
+    return f"""ag_catalog.agtype_access_operator(VARIADIC ARRAY[properties, '"{name}"'::agtype])"""
+
+
+class GraphMigration(BaseModel):
+    """One versioned set of DDL statements for a graph."""
+
+    version: int = Field(..., gt=0, description="Monotonic migration version")
+    name: str = Field(..., description="Short description")
+    statements: list[str] = Field(
+        ..., description="SQL statements; {graph} is replaced by the quoted graph schema"
+    )
+
+
+MIGRATIONS: list[GraphMigration] = [
+    GraphMigration(
+        version=1,
+        name="label table indexes",
+        statements=[
+            *(
+                f'CREATE INDEX IF NOT EXISTS "{label}_id_idx" '
+                f'ON {{graph}}."{label}" USING btree (id)'
+                for label in VERTEX_LABELS
+            ),
+            *(
+                f'CREATE INDEX IF NOT EXISTS "{label}_properties_gin" '
+                f'ON {{graph}}."{label}" USING gin (properties)'
+                for label in VERTEX_LABELS
+            ),
+            *(
+                f'CREATE INDEX IF NOT EXISTS "Entity_{prop}_idx" '
+                f'ON {{graph}}."Entity" USING btree ({_property(prop)})'
+                for prop in ("id", "name", "type")
+            ),
+            f'CREATE INDEX IF NOT EXISTS "Document_id_prop_idx" '
+            f'ON {{graph}}."Document" USING btree ({_property("id")})',
+            *(
+                f'CREATE INDEX IF NOT EXISTS "{label}_{column}_idx" '
+                f'ON {{graph}}."{label}" USING btree ({column})'
+                for label in EDGE_LABELS
+                for column in ("start_id", "end_id")
+            ),
+        ],
+    ),
+    GraphMigration(
+        version=2,
+        name="objective scoping",
+        statements=[
+            'CREATE INDEX IF NOT EXISTS "RELATED_TO_properties_gin" '
+            'ON {graph}."RELATED_TO" USING gin (properties)',
+            # Backfill objective_ids from the sources each element was extracted from
+            *(
+                f"""
+                UPDATE {{graph}}."{label}" AS t
+                SET properties = jsonb_set(
+                    t.properties::text::jsonb, '{{{{objective_ids}}}}', scoped.objective_ids
+                )::text::agtype
+                FROM (
+                    SELECT x.id, jsonb_agg(DISTINCT s.objective_id::text) AS objective_ids
+                    FROM {{graph}}."{label}" AS x
+                    CROSS JOIN LATERAL jsonb_array_elements_text(
+                        x.properties::text::jsonb -> 'source_ids'
+                    ) AS sid(value)
+                    JOIN keta.sources s ON s.id::text = sid.value
+                    GROUP BY x.id
+                ) AS scoped
+                WHERE t.id = scoped.id
+                  AND NOT t.properties::text::jsonb ? 'objective_ids'
+                """
+                for label in ("Entity", "RELATED_TO")
+            ),
+        ],
+    ),
+    GraphMigration(
+        version=3,
+        name="entity name index backfill",
+        statements=[
+            # Entities written before keta.entity_names existed
+            """
+            INSERT INTO keta.entity_names (entity_id, name, entity_type, objective_ids)
+            SELECT (p ->> 'id')::uuid, p ->> 'name', coalesce(p ->> 'type', 'UNKNOWN'),
+                   ARRAY(
+                       SELECT jsonb_array_elements_text(coalesce(p -> 'objective_ids', '[]'))
+                   )::uuid[]
+            FROM (SELECT properties::text::jsonb AS p FROM {graph}."Entity") AS e
+            WHERE p ? 'id' AND p ? 'name'
+            ON CONFLICT (entity_id) DO NOTHING
+            """,
+        ],
+    ),
+    GraphMigration(
+        version=4,
+        name="unique entity id",
+        statements=[
+            # Fails on a graph that already holds duplicate IDs; merge those first
+            'CREATE UNIQUE INDEX IF NOT EXISTS "Entity_id_prop_unique" '
+            f'ON {{graph}}."Entity" USING btree ({_property("id")})',
+        ],
+    ),
+]
+
+
+async def _ensure_labels(conn: asyncpg.Connection, graph_name: str) -> None:
+    """Create missing label tables so their indexes can be built before first use."""
+    existing = {
+        row["name"]
+        for row in await conn.fetch(
+            """
+            SELECT l.name FROM ag_catalog.ag_label l
+            JOIN ag_catalog.ag_graph g ON l.graph = g.graphid
+            WHERE g.name = $1
+            """,
+            graph_name,
+        )
+    }
+    for label in VERTEX_LABELS:
+        if label not in existing:
+            await conn.execute("SELECT ag_catalog.create_vlabel($1, $2)", graph_name, label)
+    for label in EDGE_LABELS:
+        if label not in existing:
+            await conn.execute("SELECT ag_catalog.create_elabel($1, $2)", graph_name, label)
+
+
+async def get_applied_versions(db_pool: DatabasePool, graph_name: str) -> list[int]:
+    """
+    Get the migration versions already applied to a graph.
+
+    Args:
+        db_pool: Database connection pool
+        graph_name: Name of the graph
+
+    Returns:
+        Sorted list of applied versions
+    """
+    exists = await db_pool.fetchval("SELECT to_regclass('keta.graph_migrations') IS NOT NULL")
+    if not exists:
+        return []
+    rows = await db_pool.fetch(
+        "SELECT version FROM keta.graph_migrations WHERE graph_name = $1 ORDER BY version",
+        graph_name,
+    )
+    return [row["version"] for row in rows]
+
+
+async def apply_graph_migrations(
+    db_pool: DatabasePool,
+    graph_name: str,
+    migrations: Optional[list[GraphMigration]] = None,
+) -> list[int]:
+    """
+    Apply pending graph index migrations in version order.
+
+    Each migration runs in its own transaction together with its bookkeeping
+    row, so a failed migration leaves no partial state behind.
+
+    Args:
+        db_pool: Database connection pool
+        graph_name: Name of the graph
+        migrations: Migrations to apply (optional, defaults to MIGRATIONS)
+
+    Returns:
+        Versions applied by this run
+
+    Raises:
+        ValueError: If the graph name is not a plain identifier
+    """
+    if not _IDENTIFIER.match(graph_name):
+        raise ValueError(f"Invalid graph name: {graph_name!r}")
+    migrations = sorted(migrations or MIGRATIONS, key=lambda m: m.version)
+
+    applied: list[int] = []
+    async with db_pool.transaction() as conn:
+        await conn.execute("SELECT pg_advisory_xact_lock($1)", _ADVISORY_LOCK_KEY)
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS keta.graph_migrations (
+                graph_name TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (graph_name, version)
+            )
+            """
+        )
+        await _ensure_labels(conn, graph_name)
+
+        done = {
+            row["version"]
+            for row in await conn.fetch(
+                "SELECT version FROM keta.graph_migrations WHERE graph_name = $1", graph_name
+            )
+        }
+        for migration in migrations:
+            if migration.version in done:
+                continue
+            async with conn.transaction():
+                for statement in migration.statements:
+                    await conn.execute(statement.format(graph=f'"{graph_name}"'))
+                await conn.execute(
+                    "INSERT INTO keta.graph_migrations (graph_name, version, name) "
+                    "VALUES ($1, $2, $3)",
+                    graph_name,
+                    migration.version,
+                    migration.name,
+                )
+            applied.append(migration.version)
+            logger.info(
+                f"Applied graph migration {migration.version} ({migration.name}) to '{graph_name}'"
+            )
+
+    if not applied:
+        logger.info(f"Graph '{graph_name}' indexes are up to date")
+    return applied
+
+
+async def _main() -> None:
+    from packages.shared.config import get_settings
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Apply KETA graph index migrations")
+    parser.add_argument("--graph", default=settings.graph_name, help="Graph name")
+    parser.add_argument("--status", action="store_true", help="Only list applied versions")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    db_pool = DatabasePool()
+    await db_pool.initialize(settings.database_url, min_size=1, max_size=1)
+    try:
+        if args.status:
+            applied = await get_applied_versions(db_pool, args.graph)
+            pending = [m.version for m in MIGRATIONS if m.version not in applied]
+            print(f"Graph '{args.graph}': applied={applied} pending={pending}")
+        else:
+            applied = await apply_graph_migrations(db_pool, args.graph)
+            print(f"Graph '{args.graph}': applied {applied or 'nothing'}")
+    finally:
+        await db_pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
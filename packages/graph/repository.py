@@ -2,25 +2,44 @@
 Knowledge graph repository for KETA.
 """
 
-import json
+import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 from uuid import UUID
 
+import asyncpg
+
+from packages.graph.identity import entity_id_for
 from packages.shared.database import DatabasePool
+from packages.shared.models import NameMatch
 from packages.shared.repositories.base import GraphRepository
+from packages.shared.repositories.entity_names import EntityNamesRepository
+from packages.shared.repositories.graph_stats import ENTITY, RELATIONSHIP, GraphStatsRepository
 from packages.shared.models.age import (
-    parse_agtype_to_edge,
+    AgeColumnKind,
     validate_entity_properties,
     validate_relationship_properties,
     EntityProperties,
+    GraphStatistics,
     RelationshipResult,
 )
-from packages.shared.models.age import parse_agtype_to_vertex
 
 logger = logging.getLogger(__name__)
 
+# Result columns for queries returning e1, r, e2
+RELATIONSHIP_COLUMNS = [
+    ("e1", AgeColumnKind.VERTEX),
+    ("r", AgeColumnKind.EDGE),
+    ("e2", AgeColumnKind.VERTEX),
+]
+
+# Maximum number of items sent in one UNWIND parameter list
+WRITE_BATCH_SIZE = 500
+
+# First key of the per-entity advisory locks taken before MERGE; the second is hashtext(id)
+ENTITY_LOCK_SPACE = 0x656E74
+
 
 class KnowledgeGraphRepository(GraphRepository):
     """
@@ -29,6 +48,8 @@ class KnowledgeGraphRepository(GraphRepository):
 
     def __init__(self, db_pool: DatabasePool, graph_name: str = "keta_graph") -> None:
         super().__init__(db_pool, graph_name)
+        self.stats_repo = GraphStatsRepository(db_pool)
+        self.names_repo = EntityNamesRepository(db_pool)
 
     async def create_entity(
         self,
@@ -55,25 +76,35 @@ class KnowledgeGraphRepository(GraphRepository):
         """
         now = datetime.utcnow().isoformat()
 
-        # Escape single quotes in name for Cypher
-        safe_name = name.replace("'", "\\'")
-
-        cypher = f"""
-            CREATE (e:Entity {{
-                id: '{entity_id}',
-                name: '{safe_name}',
-                type: '{entity_type}',
-                source_ids: {json.dumps([str(sid) for sid in source_ids])},
-                confidence: {confidence},
-                extraction_method: '{extraction_method}',
-                created_at: '{now}',
-                updated_at: '{now}'
-            }})
+        cypher = """
+            CREATE (e:Entity {
+                id: $id,
+                name: $name,
+                type: $type,
+                source_ids: $source_ids,
+                confidence: $confidence,
+                extraction_method: $extraction_method,
+                created_at: $now,
+                updated_at: $now
+            })
             RETURN e
         """
+        params = {
+            "id": str(entity_id),
+            "name": name,
+            "type": entity_type,
+            "source_ids": [str(sid) for sid in source_ids],
+            "confidence": confidence,
+            "extraction_method": extraction_method,
+            "now": now,
+        }
 
         try:
-            await self.execute_cypher(cypher, parse_results=False)
+            async with self.db_pool.transaction() as conn:
+                await self.execute_cypher(cypher, parse_results=False, params=params, conn=conn)
+                await self.names_repo.upsert(
+                    [{"id": entity_id, "name": name, "type": entity_type}], conn=conn
+                )
             logger.info(f"Created entity: {name} ({entity_type})")
             return {
                 "id": str(entity_id),
@@ -105,19 +136,24 @@ class KnowledgeGraphRepository(GraphRepository):
             Created document data
         """
         now = datetime.utcnow().isoformat()
-        safe_title = title.replace("'", "\\'")
-        safe_snippet = text_snippet[:500].replace("'", "\\'")
 
-        cypher = f"""
-            MERGE (d:Document {{id: '{doc_id}', chunk_index: {chunk_index}}})
-            SET d.title = '{safe_title}',
-                d.text_snippet = '{safe_snippet}',
-                d.created_at = '{now}'
+        cypher = """
+            MERGE (d:Document {id: $id, chunk_index: $chunk_index})
+            SET d.title = $title,
+                d.text_snippet = $text_snippet,
+                d.created_at = $now
             RETURN d
         """
+        params = {
+            "id": str(doc_id),
+            "chunk_index": chunk_index,
+            "title": title,
+            "text_snippet": text_snippet[:500],
+            "now": now,
+        }
 
         try:
-            await self.execute_cypher(cypher, parse_results=False)
+            await self.execute_cypher(cypher, parse_results=False, params=params)
             logger.info(f"Created/merged document: {title} (chunk {chunk_index})")
             return {"id": str(doc_id), "title": title, "chunk_index": chunk_index}
         except Exception as e:
@@ -147,21 +183,27 @@ class KnowledgeGraphRepository(GraphRepository):
         Returns:
             Created relationship data
         """
-        safe_desc = description.replace("'", "\\'")
-
-        cypher = f"""
-            MATCH (e1:Entity {{id: '{entity1_id}'}}), (e2:Entity {{id: '{entity2_id}'}})
-            CREATE (e1)-[r:RELATED_TO {{
-                relationship_type: '{relationship_type}',
-                description: '{safe_desc}',
-                confidence: {confidence},
-                source_ids: {json.dumps([str(sid) for sid in source_ids])}
-            }}]->(e2)
+        cypher = """
+            MATCH (e1:Entity {id: $entity1_id}), (e2:Entity {id: $entity2_id})
+            CREATE (e1)-[r:RELATED_TO {
+                relationship_type: $relationship_type,
+                description: $description,
+                confidence: $confidence,
+                source_ids: $source_ids
+            }]->(e2)
             RETURN r
         """
+        params = {
+            "entity1_id": str(entity1_id),
+            "entity2_id": str(entity2_id),
+            "relationship_type": relationship_type,
+            "description": description,
+            "confidence": confidence,
+            "source_ids": [str(sid) for sid in source_ids],
+        }
 
         try:
-            await self.execute_cypher(cypher, parse_results=False)
+            await self.execute_cypher(cypher, parse_results=False, params=params)
             logger.info(f"Created relationship: {relationship_type} ({confidence})")
             return {
                 "entity1_id": str(entity1_id),
@@ -189,17 +231,23 @@ class KnowledgeGraphRepository(GraphRepository):
             chunk_index: Document chunk index
             mention_count: Number of mentions
         """
-        cypher = f"""
-            MATCH (e:Entity {{id: '{entity_id}'}}), (d:Document {{id: '{doc_id}', chunk_index: {chunk_index}}})
-            CREATE (e)-[:MENTIONED_IN {{
-                mention_count: {mention_count},
+        cypher = """
+            MATCH (e:Entity {id: $entity_id}), (d:Document {id: $doc_id, chunk_index: $chunk_index})
+            CREATE (e)-[:MENTIONED_IN {
+                mention_count: $mention_count,
                 positions: [],
                 context_snippets: []
-            }}]->(d)
+            }]->(d)
         """
+        params = {
+            "entity_id": str(entity_id),
+            "doc_id": str(doc_id),
+            "chunk_index": chunk_index,
+            "mention_count": mention_count,
+        }
 
         try:
-            await self.execute_cypher(cypher, parse_results=False)
+            await self.execute_cypher(cypher, parse_results=False, params=params)
         except Exception as e:
             logger.warning(f"Failed to link entity to document: {e}")
 
@@ -223,20 +271,800 @@ class KnowledgeGraphRepository(GraphRepository):
         """
         now = datetime.utcnow().isoformat()
 
-        cypher = f"""
-            MATCH (e:Entity {{id: '{entity_id}'}}), (d:Document {{id: '{doc_id}', chunk_index: {chunk_index}}})
-            CREATE (e)-[:EXTRACTED_FROM {{
-                extraction_date: '{now}',
-                confidence: {confidence},
-                extraction_method: '{extraction_method}'
-            }}]->(d)
+        cypher = """
+            MATCH (e:Entity {id: $entity_id}), (d:Document {id: $doc_id, chunk_index: $chunk_index})
+            CREATE (e)-[:EXTRACTED_FROM {
+                extraction_date: $now,
+                confidence: $confidence,
+                extraction_method: $extraction_method
+            }]->(d)
         """
+        params = {
+            "entity_id": str(entity_id),
+            "doc_id": str(doc_id),
+            "chunk_index": chunk_index,
+            "now": now,
+            "confidence": confidence,
+            "extraction_method": extraction_method,
+        }
 
         try:
-            await self.execute_cypher(cypher, parse_results=False)
+            await self.execute_cypher(cypher, parse_results=False, params=params)
         except Exception as e:
             logger.warning(f"Failed to link entity to source: {e}")
 
+    async def _unwind(
+        self,
+        cypher_query: str,
+        key: str,
+        items: list[dict[str, Any]],
+        params: Optional[dict[str, Any]] = None,
+        columns: Optional[Sequence[tuple[str, AgeColumnKind]]] = None,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> list[tuple]:
+        """
+        Run an UNWIND statement over items in batches inside one transaction.
+
+        Args:
+            cypher_query: Cypher query unwinding the list parameter ``key``
+            key: Name of the list parameter
+            items: Items to write
+            params: Extra parameters shared by all batches
+            columns: Result columns to decode (optional, results are discarded if not provided)
+            conn: Connection with an open transaction (optional, opens one if not provided)
+
+        Returns:
+            Decoded result rows of all batches
+        """
+        if conn is None:
+            async with self.db_pool.transaction() as conn:
+                return await self._unwind(cypher_query, key, items, params, columns, conn)
+
+        rows: list[tuple] = []
+        for start in range(0, len(items), WRITE_BATCH_SIZE):
+            batch_params = {**(params or {}), key: items[start:start + WRITE_BATCH_SIZE]}
+            if columns:
+                rows.extend(
+                    await self.execute_cypher_rows(
+                        cypher_query, columns, params=batch_params, conn=conn
+                    )
+                )
+            else:
+                await self.execute_cypher(
+                    cypher_query, parse_results=False, params=batch_params, conn=conn
+                )
+        return rows
+
+    async def upsert_entities(
+        self,
+        entities: list[dict[str, Any]],
+        source_id: UUID,
+        objective_id: Optional[UUID] = None,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> dict[str, UUID]:
+        """
+        Create or update Entity nodes for a batch of extracted entities.
+
+        Entity IDs are derived from the normalized (name, type) key, so the write
+        is an idempotent MERGE on the ID with no lookup beforehand. Existing
+        entities keep their name and type, take the higher confidence and get
+        the source appended to their source_ids and the objective to their
+        objective_ids.
+
+        AGE's MERGE does not lock, so concurrent transactions could each create
+        the same ID. Each ID's advisory lock is taken first, in sorted order so
+        two batches never deadlock; a concurrent writer of the same entity
+        waits for this transaction and then merges onto its vertex. The unique
+        index from graph migration 4 backs this up.
+
+        Args:
+            entities: Extracted entities with name, type, confidence and extraction_method
+            source_id: Source the entities were extracted from
+            objective_id: Objective the source belongs to (optional)
+            conn: Connection with an open transaction (optional)
+
+        Returns:
+            Mapping of entity name to the entity UUID
+        """
+        if not entities:
+            return {}
+        if conn is None:
+            async with self.db_pool.transaction() as conn:
+                return await self.upsert_entities(entities, source_id, objective_id, conn)
+
+        now = datetime.utcnow().isoformat()
+
+        # Duplicate keys within one statement would race each other in MERGE
+        name_to_id: dict[str, UUID] = {}
+        unique: dict[UUID, dict[str, Any]] = {}
+        for entity in entities:
+            entity_id = entity_id_for(entity["name"], entity["type"])
+            name_to_id[entity["name"]] = entity_id
+            current = unique.get(entity_id)
+            if current is None or entity["confidence"] > current["confidence"]:
+                unique[entity_id] = {
+                    "id": str(entity_id),
+                    "name": entity["name"],
+                    "type": entity["type"],
+                    "confidence": entity["confidence"],
+                    "extraction_method": entity.get("extraction_method", "llm_structured"),
+                }
+
+        cypher = """
+            UNWIND $entities AS ent
+            MERGE (e:Entity {id: ent.id})
+            WITH e, ent, NOT coalesce($objective_id IN e.objective_ids, false) AS added
+            SET e.name = coalesce(e.name, ent.name),
+                e.type = coalesce(e.type, ent.type),
+                e.confidence = CASE
+                    WHEN e.confidence IS NULL OR ent.confidence > e.confidence THEN ent.confidence
+                    ELSE e.confidence
+                END,
+                e.extraction_method = coalesce(e.extraction_method, ent.extraction_method),
+                e.created_at = coalesce(e.created_at, $now),
+                e.updated_at = $now,
+                e.source_ids = CASE
+                    WHEN e.source_ids IS NULL THEN [$source_id]
+                    WHEN $source_id IN e.source_ids THEN e.source_ids
+                    ELSE e.source_ids + [$source_id]
+                END,
+                e.objective_ids = CASE
+                    WHEN $objective_id IS NULL THEN coalesce(e.objective_ids, [])
+                    WHEN e.objective_ids IS NULL THEN [$objective_id]
+                    WHEN $objective_id IN e.objective_ids THEN e.objective_ids
+                    ELSE e.objective_ids + [$objective_id]
+                END
+            RETURN e.type AS type, added
+        """
+        params = {
+            "source_id": str(source_id),
+            "objective_id": str(objective_id) if objective_id else None,
+            "now": now,
+        }
+
+        try:
+            await conn.execute(
+                """
+                SELECT pg_advisory_xact_lock($1, hashtext(ids.id))
+                FROM unnest($2::text[]) WITH ORDINALITY AS ids(id, ord)
+                ORDER BY ids.ord
+                """,
+                ENTITY_LOCK_SPACE,
+                sorted(str(entity_id) for entity_id in unique),
+            )
+            rows = await self._unwind(
+                cypher,
+                "entities",
+                list(unique.values()),
+                params=params,
+                columns=[("type", AgeColumnKind.SCALAR), ("added", AgeColumnKind.SCALAR)],
+                conn=conn,
+            )
+            await self.names_repo.upsert(list(unique.values()), objective_id, conn=conn)
+            if objective_id:
+                # Entities count toward an objective once, when first tagged with it
+                deltas: dict[str, int] = {}
+                for entity_type, added in rows:
+                    if added:
+                        deltas[entity_type] = deltas.get(entity_type, 0) + 1
+                await self.stats_repo.apply_deltas(objective_id, ENTITY, deltas, conn=conn)
+            logger.info(f"Upserted {len(unique)} entities for source {source_id}")
+            return name_to_id
+        except Exception as e:
+            logger.error(f"Failed to upsert {len(unique)} entities: {e}")
+            raise
+
+    async def link_mentions(
+        self,
+        doc_id: UUID,
+        mentions: list[dict[str, Any]],
+        chunk_index: int = 0,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> None:
+        """
+        Create MENTIONED_IN and EXTRACTED_FROM relationships for a batch of entities.
+
+        Existing links are reused, adding to their mention count.
+
+        Args:
+            doc_id: Document UUID
+            mentions: Items with entity_id, mention_count, confidence and extraction_method
+            chunk_index: Document chunk index
+            conn: Connection with an open transaction (optional)
+        """
+        if not mentions:
+            return
+
+        now = datetime.utcnow().isoformat()
+
+        cypher = """
+            UNWIND $mentions AS m
+            MATCH (e:Entity {id: m.entity_id}),
+                  (d:Document {id: $doc_id, chunk_index: $chunk_index})
+            MERGE (e)-[mi:MENTIONED_IN]->(d)
+            SET mi.mention_count = coalesce(mi.mention_count, 0) + m.mention_count,
+                mi.positions = coalesce(mi.positions, []),
+                mi.context_snippets = coalesce(mi.context_snippets, [])
+            MERGE (e)-[x:EXTRACTED_FROM]->(d)
+            SET x.extraction_date = $now,
+                x.confidence = m.confidence,
+                x.extraction_method = m.extraction_method
+        """
+        items = [
+            {
+                "entity_id": str(mention["entity_id"]),
+                "mention_count": mention.get("mention_count", 1),
+                "confidence": mention.get("confidence", 1.0),
+                "extraction_method": mention.get("extraction_method", "llm_structured"),
+            }
+            for mention in mentions
+        ]
+        params = {"doc_id": str(doc_id), "chunk_index": chunk_index, "now": now}
+
+        try:
+            await self._unwind(cypher, "mentions", items, params=params, conn=conn)
+        except Exception as e:
+            logger.error(f"Failed to link {len(items)} entities to document {doc_id}: {e}")
+            raise
+
+    async def create_relationships(
+        self,
+        relationships: list[dict[str, Any]],
+        source_ids: list[UUID],
+        objective_id: Optional[UUID] = None,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> int:
+        """
+        Create RELATED_TO relationships for a batch of entity pairs.
+
+        Args:
+            relationships: Items with entity1_id, entity2_id, relationship_type,
+                description, confidence and optionally the chunk_hash of the chunk
+                they were extracted from
+            source_ids: List of source UUIDs stored on every relationship
+            objective_id: Objective the sources belong to (optional)
+            conn: Connection with an open transaction (optional)
+
+        Returns:
+            Number of relationships created
+        """
+        if not relationships:
+            return 0
+        if conn is None:
+            async with self.db_pool.transaction() as conn:
+                return await self.create_relationships(
+                    relationships, source_ids, objective_id, conn
+                )
+
+        cypher = """
+            UNWIND $relationships AS rel
+            MATCH (e1:Entity {id: rel.entity1_id}), (e2:Entity {id: rel.entity2_id})
+            CREATE (e1)-[r:RELATED_TO {
+                relationship_type: rel.relationship_type,
+                description: rel.description,
+                confidence: rel.confidence,
+                chunk_hash: rel.chunk_hash,
+                source_ids: $source_ids,
+                objective_ids: $objective_ids
+            }]->(e2)
+            RETURN r.relationship_type AS type, count(*) AS created
+        """
+        items = [
+            {
+                "entity1_id": str(rel["entity1_id"]),
+                "entity2_id": str(rel["entity2_id"]),
+                "relationship_type": rel["relationship_type"],
+                "description": rel["description"],
+                "confidence": rel["confidence"],
+                "chunk_hash": rel.get("chunk_hash"),
+            }
+            for rel in relationships
+        ]
+
+        try:
+            rows = await self._unwind(
+                cypher,
+                "relationships",
+                items,
+                params={
+                    "source_ids": [str(sid) for sid in source_ids],
+                    "objective_ids": [str(objective_id)] if objective_id else [],
+                },
+                columns=[("type", AgeColumnKind.SCALAR), ("created", AgeColumnKind.SCALAR)],
+                conn=conn,
+            )
+            deltas: dict[str, int] = {}
+            for rel_type, count in rows:
+                deltas[rel_type] = deltas.get(rel_type, 0) + count
+            if objective_id:
+                await self.stats_repo.apply_deltas(objective_id, RELATIONSHIP, deltas, conn=conn)
+            created = sum(deltas.values())
+            logger.info(f"Created {created} relationships")
+            return created
+        except Exception as e:
+            logger.error(f"Failed to create {len(items)} relationships: {e}")
+            raise
+
+    @staticmethod
+    def _relationship_deltas(rel_rows: list[tuple]) -> dict[str, dict[str, int]]:
+        """Negative per-objective, per-type counts for deleted (type, objective_ids) rows."""
+        rel_deltas: dict[str, dict[str, int]] = {}
+        for rel_type, objective_ids in rel_rows:
+            for oid in objective_ids or []:
+                per_type = rel_deltas.setdefault(oid, {})
+                per_type[rel_type] = per_type.get(rel_type, 0) - 1
+        return rel_deltas
+
+    async def _drop_source_from_entities(
+        self, source_id: UUID, entity_rows: list[tuple], conn: asyncpg.Connection
+    ) -> tuple[list[dict[str, Any]], list[str], dict[str, dict[str, int]]]:
+        """
+        Drop a source from entities' source_ids and delete entities left without sources.
+
+        Objective IDs are recomputed from the remaining sources, and the entity
+        name index follows on the same connection.
+
+        Args:
+            source_id: Source UUID
+            entity_rows: (id, type, source_ids, objective_ids) rows of the entities
+            conn: Connection with an open transaction
+
+        Returns:
+            Tuple of (updated entities, deleted entity IDs, per-objective entity count deltas)
+        """
+        # Objectives of the sources the entities keep
+        remaining_ids = {
+            sid for _, _, sids, _ in entity_rows for sid in sids if sid != str(source_id)
+        }
+        source_objectives: dict[str, str] = {}
+        if remaining_ids:
+            records = await conn.fetch(
+                "SELECT id::text AS id, objective_id::text AS objective_id "
+                "FROM keta.sources WHERE id::text = ANY($1::text[])",
+                list(remaining_ids),
+            )
+            source_objectives = {r["id"]: r["objective_id"] for r in records}
+
+        updates: list[dict[str, Any]] = []
+        orphans: list[str] = []
+        entity_deltas: dict[str, dict[str, int]] = {}
+        for entity_id, entity_type, sids, oids in entity_rows:
+            kept = [sid for sid in sids if sid != str(source_id)]
+            kept_objectives = sorted(
+                {source_objectives[sid] for sid in kept if sid in source_objectives}
+            )
+            for oid in set(oids or []) - set(kept_objectives):
+                per_type = entity_deltas.setdefault(oid, {})
+                per_type[entity_type] = per_type.get(entity_type, 0) - 1
+            if kept:
+                updates.append(
+                    {"id": entity_id, "source_ids": kept, "objective_ids": kept_objectives}
+                )
+            else:
+                orphans.append(entity_id)
+
+        if updates:
+            await self._unwind(
+                """
+                UNWIND $updates AS u
+                MATCH (e:Entity {id: u.id})
+                SET e.source_ids = u.source_ids, e.objective_ids = u.objective_ids
+                """,
+                "updates",
+                updates,
+                conn=conn,
+            )
+        if orphans:
+            await self._unwind(
+                """
+                UNWIND $orphans AS o
+                MATCH (e:Entity {id: o.id})
+                DETACH DELETE e
+                """,
+                "orphans",
+                [{"id": entity_id} for entity_id in orphans],
+                conn=conn,
+            )
+        await self.names_repo.set_objectives(
+            {u["id"]: u["objective_ids"] for u in updates}, conn=conn
+        )
+        await self.names_repo.delete(orphans, conn=conn)
+        return updates, orphans, entity_deltas
+
+    async def _apply_removal_deltas(
+        self,
+        entity_deltas: dict[str, dict[str, int]],
+        rel_deltas: dict[str, dict[str, int]],
+        conn: asyncpg.Connection,
+    ) -> None:
+        for oid, deltas in entity_deltas.items():
+            await self.stats_repo.apply_deltas(UUID(oid), ENTITY, deltas, conn=conn)
+        for oid, deltas in rel_deltas.items():
+            await self.stats_repo.apply_deltas(UUID(oid), RELATIONSHIP, deltas, conn=conn)
+
+    async def remove_source(
+        self, source_id: UUID, conn: Optional[asyncpg.Connection] = None
+    ) -> dict[str, int]:
+        """
+        Remove everything a source contributed to the graph.
+
+        Deletes the source's RELATED_TO edges and Document node, drops the source
+        from entity source_ids, recomputes entity objective_ids from the remaining
+        sources and deletes entities left without sources. graph_stats is
+        updated on the same connection. Run this in the transaction that deletes
+        the source row.
+
+        Args:
+            source_id: Source UUID
+            conn: Connection with an open transaction (optional, opens one if not provided)
+
+        Returns:
+            Counts of deleted relationships, updated entities and deleted entities
+        """
+        if conn is None:
+            async with self.db_pool.transaction() as conn:
+                return await self.remove_source(source_id, conn)
+
+        params = {"source_id": str(source_id)}
+        scalar = AgeColumnKind.SCALAR
+
+        # Relationships are created per source, so they go with it
+        rel_rows = await self.execute_cypher_rows(
+            """
+            MATCH (:Entity)-[r:RELATED_TO {source_ids: [$source_id]}]->(:Entity)
+            WITH r, r.relationship_type AS type, r.objective_ids AS objective_ids
+            DELETE r
+            RETURN type, objective_ids
+            """,
+            [("type", scalar), ("objective_ids", scalar)],
+            params=params,
+            conn=conn,
+        )
+
+        entity_rows = await self.execute_cypher_rows(
+            """
+            MATCH (e:Entity {source_ids: [$source_id]})
+            RETURN e.id AS id, e.type AS type, e.source_ids AS source_ids,
+                   e.objective_ids AS objective_ids
+            """,
+            [("id", scalar), ("type", scalar), ("source_ids", scalar), ("objective_ids", scalar)],
+            params=params,
+            conn=conn,
+        )
+        updates, orphans, entity_deltas = await self._drop_source_from_entities(
+            source_id, entity_rows, conn
+        )
+        await self.execute_cypher(
+            "MATCH (d:Document {id: $source_id}) DETACH DELETE d",
+            parse_results=False,
+            params=params,
+            conn=conn,
+        )
+        await self._apply_removal_deltas(
+            entity_deltas, self._relationship_deltas(rel_rows), conn
+        )
+
+        logger.info(
+            f"Removed source {source_id} from graph: {len(rel_rows)} relationships deleted, "
+            f"{len(updates)} entities updated, {len(orphans)} entities deleted"
+        )
+        return {
+            "relationships_deleted": len(rel_rows),
+            "entities_updated": len(updates),
+            "entities_deleted": len(orphans),
+        }
+
+    async def retract_chunks(
+        self,
+        source_id: UUID,
+        chunk_hashes: list[str],
+        mentions: dict[str, int],
+        unmentioned_entity_ids: list[str],
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> dict[str, int]:
+        """
+        Remove what chunks that left a source contributed to the graph.
+
+        Deletes the source's RELATED_TO edges extracted from the chunks and
+        lowers MENTIONED_IN counts by the chunks' mentions. Entities no remaining
+        chunk of the source mentions lose their links to the source's document
+        and are dropped from it as in remove_source, which deletes them once
+        they have no sources left.
+
+        Args:
+            source_id: Source UUID
+            chunk_hashes: Content hashes of the removed chunks
+            mentions: Mention counts of the removed chunks per entity UUID string
+            unmentioned_entity_ids: Entity UUID strings no remaining chunk mentions
+            conn: Connection with an open transaction (optional, opens one if not provided)
+
+        Returns:
+            Counts of deleted relationships, updated entities and deleted entities
+        """
+        if conn is None:
+            async with self.db_pool.transaction() as conn:
+                return await self.retract_chunks(
+                    source_id, chunk_hashes, mentions, unmentioned_entity_ids, conn
+                )
+
+        params = {"source_id": str(source_id)}
+        scalar = AgeColumnKind.SCALAR
+
+        rel_rows = await self._unwind(
+            """
+            UNWIND $chunks AS c
+            MATCH (:Entity)-[r:RELATED_TO {chunk_hash: c.hash}]->(:Entity)
+            WHERE $source_id IN r.source_ids
+            WITH r, r.relationship_type AS type, r.objective_ids AS objective_ids
+            DELETE r
+            RETURN type, objective_ids
+            """,
+            "chunks",
+            [{"hash": chunk_hash} for chunk_hash in chunk_hashes],
+            params=params,
+            columns=[("type", scalar), ("objective_ids", scalar)],
+            conn=conn,
+        )
+
+        unmentioned = set(unmentioned_entity_ids)
+        still_mentioned = [
+            {"entity_id": entity_id, "mention_count": count}
+            for entity_id, count in mentions.items()
+            if entity_id not in unmentioned
+        ]
+        await self._unwind(
+            """
+            UNWIND $mentions AS m
+            MATCH (:Entity {id: m.entity_id})-[mi:MENTIONED_IN]->(:Document {id: $source_id})
+            SET mi.mention_count = CASE
+                WHEN mi.mention_count > m.mention_count THEN mi.mention_count - m.mention_count
+                ELSE 1
+            END
+            """,
+            "mentions",
+            still_mentioned,
+            params=params,
+            conn=conn,
+        )
+
+        unmentioned_items = [{"id": entity_id} for entity_id in sorted(unmentioned)]
+        await self._unwind(
+            """
+            UNWIND $entities AS ent
+            MATCH (:Entity {id: ent.id})-[l]->(:Document {id: $source_id})
+            DELETE l
+            """,
+            "entities",
+            unmentioned_items,
+            params=params,
+            conn=conn,
+        )
+        entity_rows = await self._unwind(
+            """
+            UNWIND $entities AS ent
+            MATCH (e:Entity {id: ent.id})
+            WHERE $source_id IN e.source_ids
+            RETURN e.id AS id, e.type AS type, e.source_ids AS source_ids,
+                   e.objective_ids AS objective_ids
+            """,
+            "entities",
+            unmentioned_items,
+            params=params,
+            columns=[
+                ("id", scalar), ("type", scalar), ("source_ids", scalar), ("objective_ids", scalar)
+            ],
+            conn=conn,
+        )
+        updates, orphans, entity_deltas = await self._drop_source_from_entities(
+            source_id, entity_rows, conn
+        )
+        await self._apply_removal_deltas(
+            entity_deltas, self._relationship_deltas(rel_rows), conn
+        )
+
+        logger.info(
+            f"Retracted {len(chunk_hashes)} chunks of source {source_id}: "
+            f"{len(rel_rows)} relationships deleted, {len(updates)} entities updated, "
+            f"{len(orphans)} entities deleted"
+        )
+        return {
+            "relationships_deleted": len(rel_rows),
+            "entities_updated": len(updates),
+            "entities_deleted": len(orphans),
+        }
+
+    async def search_entities(
+        self,
+        objective_id: UUID,
+        name: Optional[str] = None,
+        entity_type: Optional[str] = None,
+        limit: int = 100,
+        match: NameMatch = NameMatch.SUBSTRING,
+    ) -> list[dict[str, Any]]:
+        """
+        Search entities within an objective.
+
+        Scoping is one containment match on objective_ids, served by the GIN
+        index on the Entity properties, so the cost does not grow with the
+        number of sources in the objective. Name searches go through the
+        entity name index and are ranked by similarity.
+
+        Args:
+            objective_id: Objective UUID
+            name: Entity name search term (optional)
+            entity_type: Entity type (optional)
+            limit: Maximum number of entities
+            match: How the name term is matched
+
+        Returns:
+            List of entity property dicts
+        """
+        if name:
+            return await self.find_entities_by_name(
+                name, match, objective_id=objective_id, entity_type=entity_type, limit=limit
+            )
+
+        constraints = "objective_ids: [$objective_id]"
+        params: dict[str, Any] = {"objective_id": str(objective_id)}
+        if entity_type:
+            constraints += ", type: $entity_type"
+            params["entity_type"] = entity_type
+
+        cypher = f"""
+            MATCH (e:Entity {{{constraints}}})
+            RETURN e
+            LIMIT {int(limit)}
+        """
+
+        return await self.execute_cypher(cypher, params=params)
+
+    async def find_entities_by_name(
+        self,
+        term: str,
+        match: NameMatch = NameMatch.SUBSTRING,
+        objective_id: Optional[UUID] = None,
+        entity_type: Optional[str] = None,
+        limit: int = 10,
+    ) -> list[dict[str, Any]]:
+        """
+        Find entities by name through the trigram-indexed entity name table.
+
+        Args:
+            term: Search term
+            match: Substring, prefix or fuzzy matching
+            objective_id: Only entities of this objective (optional)
+            entity_type: Only entities of this type (optional)
+            limit: Maximum number of entities
+
+        Returns:
+            Entity property dicts, best match first, each with a "score" key
+        """
+        ranked = await self.names_repo.search(
+            term, match, objective_id=objective_id, entity_type=entity_type, limit=limit
+        )
+        if not ranked:
+            return []
+
+        cypher = """
+            UNWIND $ids AS entity_id
+            MATCH (e:Entity {id: entity_id})
+            RETURN e
+        """
+        results = await self.execute_cypher(
+            cypher, params={"ids": [entity_id for entity_id, _ in ranked]}
+        )
+        by_id = {entity["id"]: entity for entity in results}
+        return [
+            {**by_id[entity_id], "score": score}
+            for entity_id, score in ranked
+            if entity_id in by_id
+        ]
+
+    async def get_graph_statistics(self, objective_id: UUID) -> GraphStatistics:
+        """
+        Count an objective's entities and relationships by type in the database.
+
+        The entity and relationship counts run concurrently on separate
+        connections; only one row per type comes back.
+
+        Args:
+            objective_id: Objective UUID
+
+        Returns:
+            GraphStatistics with totals and per-type counts
+        """
+        entity_cypher = """
+            MATCH (e:Entity {objective_ids: [$objective_id]})
+            RETURN e.type AS type, count(*) AS count
+        """
+        relationship_cypher = """
+            MATCH (:Entity)-[r:RELATED_TO {objective_ids: [$objective_id]}]->(:Entity)
+            RETURN r.relationship_type AS type, count(*) AS count
+        """
+        columns = [("type", AgeColumnKind.SCALAR), ("count", AgeColumnKind.SCALAR)]
+        params = {"objective_id": str(objective_id)}
+
+        entity_rows, relationship_rows = await asyncio.gather(
+            self.execute_cypher_rows(entity_cypher, columns, params=params),
+            self.execute_cypher_rows(relationship_cypher, columns, params=params),
+        )
+
+        entity_type_counts = {rtype or "UNKNOWN": count for rtype, count in entity_rows}
+        relationship_type_counts = {
+            rtype or "UNKNOWN": count for rtype, count in relationship_rows
+        }
+        return GraphStatistics(
+            entity_count=sum(entity_type_counts.values()),
+            relationship_count=sum(relationship_type_counts.values()),
+            entity_type_counts=entity_type_counts,
+            relationship_type_counts=relationship_type_counts,
+        )
+
+    async def get_neighborhood(
+        self, entity_id: UUID, depth: int = 1, max_nodes: int = 100
+    ) -> Optional[dict[str, Any]]:
+        """
+        Get the depth-N ego graph of an entity in two queries.
+
+        The first query returns the center and its neighbors within ``depth``
+        RELATED_TO hops, keeping the ``max_nodes`` most confident ones. The second
+        returns the RELATED_TO edges induced by the kept nodes.
+
+        Args:
+            entity_id: Center entity UUID
+            depth: Traversal depth
+            max_nodes: Maximum number of neighbors (excluding the center)
+
+        Returns:
+            Dict with center (properties), nodes (properties of kept neighbors),
+            edges ((source_id, AgeEdge, target_id) tuples) and truncated, or None
+            if the entity does not exist
+        """
+        nodes_cypher = f"""
+            MATCH (center:Entity {{id: $entity_id}})
+            OPTIONAL MATCH (center)-[:RELATED_TO*1..{int(depth)}]-(n:Entity)
+            WHERE n.id <> $entity_id
+            WITH DISTINCT center, n
+            ORDER BY coalesce(n.confidence, 0.0) DESC
+            LIMIT {int(max_nodes) + 1}
+            RETURN center, collect(n) AS neighbors
+        """
+        rows = await self.execute_cypher_rows(
+            nodes_cypher,
+            [("center", AgeColumnKind.VERTEX), ("neighbors", AgeColumnKind.SCALAR)],
+            params={"entity_id": str(entity_id)},
+        )
+        if not rows or rows[0][0] is None:
+            return None
+
+        center, neighbors = rows[0]
+        truncated = len(neighbors) > max_nodes
+        nodes = [neighbor["properties"] for neighbor in neighbors[:max_nodes]]
+        node_ids = [str(entity_id)] + [node["id"] for node in nodes]
+
+        edges_cypher = """
+            UNWIND $node_ids AS node_id
+            MATCH (a:Entity {id: node_id})-[r:RELATED_TO]->(b:Entity)
+            WHERE b.id IN $node_ids
+            RETURN a.id AS source, r, b.id AS target
+        """
+        edges = await self.execute_cypher_rows(
+            edges_cypher,
+            [
+                ("source", AgeColumnKind.SCALAR),
+                ("r", AgeColumnKind.EDGE),
+                ("target", AgeColumnKind.SCALAR),
+            ],
+            params={"node_ids": node_ids},
+        )
+
+        return {
+            "center": center.properties,
+            "nodes": nodes,
+            "edges": edges,
+            "truncated": truncated,
+        }
+
     async def find_entity_by_name(self, name: str) -> Optional[EntityProperties]:
         """
         Find an entity by name with runtime validation.
@@ -250,11 +1078,10 @@ class KnowledgeGraphRepository(GraphRepository):
         Raises:
             AgeParseError: If entity data validation fails
         """
-        safe_name = name.replace("'", "\\'")
-        cypher = f"MATCH (e:Entity {{name: '{safe_name}'}}) RETURN e LIMIT 1"
+        cypher = "MATCH (e:Entity {name: $name}) RETURN e LIMIT 1"
 
         try:
-            results = await self.execute_cypher(cypher)
+            results = await self.execute_cypher(cypher, params={"name": name})
             if not results:
                 return None
             
@@ -286,13 +1113,13 @@ class KnowledgeGraphRepository(GraphRepository):
             AgeParseError: If any entity fails validation
         """
         cypher = f"""
-            MATCH (e:Entity)-[:EXTRACTED_FROM]->(d:Document {{id: '{source_id}'}})
+            MATCH (e:Entity)-[:EXTRACTED_FROM]->(d:Document {{id: $source_id}})
             RETURN e
-            LIMIT {limit}
+            LIMIT {int(limit)}
         """
 
         try:
-            results = await self.execute_cypher(cypher)
+            results = await self.execute_cypher(cypher, params={"source_id": str(source_id)})
             validated_entities = []
             
             for result in results:
@@ -326,24 +1153,18 @@ class KnowledgeGraphRepository(GraphRepository):
         """
         cypher = f"""
             MATCH (e1:Entity)-[r:RELATED_TO]->(e2:Entity)
-            WHERE '{source_id}' IN r.source_ids
+            WHERE $source_id IN r.source_ids
             RETURN e1, r, e2
-            LIMIT {limit}
+            LIMIT {int(limit)}
         """
 
         try:
-            # Use parse_results=False to get raw AGE structure
-            raw_results = await self.execute_cypher(cypher, parse_results=False)
+            rows = await self.execute_cypher_rows(
+                cypher, RELATIONSHIP_COLUMNS, params={"source_id": str(source_id)}
+            )
             validated_relationships = []
             
-            for row in raw_results:
-                row_dict = dict(row)
-                
-                # Parse raw AGE structures
-                source_vertex = parse_agtype_to_vertex(row_dict.get('e1', ''))
-                edge = parse_agtype_to_edge(row_dict.get('r', ''))
-                target_vertex = parse_agtype_to_vertex(row_dict.get('e2', ''))
-                
+            for source_vertex, edge, target_vertex in rows:
                 # Create validated relationship result
                 rel_result = RelationshipResult(
                     source_entity=source_vertex,
@@ -384,24 +1205,18 @@ class KnowledgeGraphRepository(GraphRepository):
             AgeParseError: If any data fails validation
         """
         cypher = f"""
-            MATCH (e1:Entity {{id: '{entity_id}'}})-[r:RELATED_TO]->(e2:Entity)
+            MATCH (e1:Entity {{id: $entity_id}})-[r:RELATED_TO]->(e2:Entity)
             RETURN e1, r, e2
-            LIMIT {limit}
+            LIMIT {int(limit)}
         """
 
         try:
-            # Use parse_results=False to get raw AGE structure
-            raw_results = await self.execute_cypher(cypher, parse_results=False)
+            rows = await self.execute_cypher_rows(
+                cypher, RELATIONSHIP_COLUMNS, params={"entity_id": str(entity_id)}
+            )
             validated_relationships = []
             
-            for row in raw_results:
-                row_dict = dict(row)
-                
-                # Parse and validate all components from raw AGE data
-                source_vertex = parse_agtype_to_vertex(row_dict.get('e1', ''))
-                edge = parse_agtype_to_edge(row_dict.get('r', ''))
-                target_vertex = parse_agtype_to_vertex(row_dict.get('e2', ''))
-                
+            for source_vertex, edge, target_vertex in rows:
                 # Create relationship result
                 rel_result = RelationshipResult(
                     source_entity=source_vertex,
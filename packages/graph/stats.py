@@ -0,0 +1,140 @@
+"""
+Reconciliation of the incrementally maintained graph statistics.
+
+``keta.graph_stats`` is updated by the extraction write path and by source
+deletion in the same transaction as the graph change. Writes that bypass the
+repository (manual Cypher, restores, bugs) make it drift, so this job recounts
+each objective from the graph, logs any difference and overwrites the rows::
+
+    python -m packages.graph.stats [--graph keta_graph] [--objective <uuid>] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from packages.graph.repository import KnowledgeGraphRepository
+from packages.shared.database import DatabasePool
+from packages.shared.models.age import GraphStatistics
+
+logger = logging.getLogger(__name__)
+
+
+class StatsDrift(BaseModel):
+    """Difference between stored and recounted statistics for one objective."""
+
+    objective_id: UUID
+    entity_type_deltas: dict[str, int] = Field(
+        default_factory=dict, description="Recounted minus stored, per entity type"
+    )
+    relationship_type_deltas: dict[str, int] = Field(
+        default_factory=dict, description="Recounted minus stored, per relationship type"
+    )
+
+    @property
+    def has_drift(self) -> bool:
+        return bool(self.entity_type_deltas or self.relationship_type_deltas)
+
+
+def _type_deltas(stored: dict[str, int], actual: dict[str, int]) -> dict[str, int]:
+    deltas = {t: actual.get(t, 0) - stored.get(t, 0) for t in set(stored) | set(actual)}
+    return {t: delta for t, delta in sorted(deltas.items()) if delta}
+
+
+def compute_drift(
+    objective_id: UUID, stored: GraphStatistics, actual: GraphStatistics
+) -> StatsDrift:
+    """
+    Compare stored statistics with counts recomputed from the graph.
+
+    Args:
+        objective_id: Objective UUID
+        stored: Counts read from keta.graph_stats
+        actual: Counts aggregated from the graph
+
+    Returns:
+        Per-type differences (empty when in sync)
+    """
+    return StatsDrift(
+        objective_id=objective_id,
+        entity_type_deltas=_type_deltas(stored.entity_type_counts, actual.entity_type_counts),
+        relationship_type_deltas=_type_deltas(
+            stored.relationship_type_counts, actual.relationship_type_counts
+        ),
+    )
+
+
+async def reconcile_graph_stats(
+    db_pool: DatabasePool,
+    graph_name: str,
+    objective_ids: Optional[list[UUID]] = None,
+    dry_run: bool = False,
+) -> list[StatsDrift]:
+    """
+    Rebuild graph_stats from the graph and report drift.
+
+    Args:
+        db_pool: Database connection pool
+        graph_name: Name of the graph
+        objective_ids: Objectives to reconcile (optional, defaults to all objectives)
+        dry_run: Only report drift, leave the table untouched
+
+    Returns:
+        Drift for every objective whose stored counts were wrong
+    """
+    graph_repo = KnowledgeGraphRepository(db_pool, graph_name)
+    if objective_ids is None:
+        rows = await db_pool.fetch("SELECT id FROM keta.objectives ORDER BY created_at")
+        objective_ids = [row["id"] for row in rows]
+
+    drifted: list[StatsDrift] = []
+    for objective_id in objective_ids:
+        stored, actual = await asyncio.gather(
+            graph_repo.stats_repo.get_objective_stats(objective_id),
+            graph_repo.get_graph_statistics(objective_id),
+        )
+        drift = compute_drift(objective_id, stored, actual)
+        if not drift.has_drift:
+            continue
+        drifted.append(drift)
+        logger.warning(
+            f"Graph stats drift for objective {objective_id}: "
+            f"entities {drift.entity_type_deltas}, relationships {drift.relationship_type_deltas}"
+        )
+        if not dry_run:
+            await graph_repo.stats_repo.replace_objective_stats(objective_id, actual)
+
+    logger.info(
+        f"Reconciled graph stats for {len(objective_ids)} objectives, {len(drifted)} drifted"
+    )
+    return drifted
+
+
+async def _main() -> None:
+    from packages.shared.config import get_settings
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Reconcile KETA graph statistics")
+    parser.add_argument("--graph", default=settings.graph_name, help="Graph name")
+    parser.add_argument(
+        "--objective", type=UUID, action="append", help="Objective to reconcile (repeatable)"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only report drift")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    db_pool = DatabasePool()
+    await db_pool.initialize(settings.database_url, min_size=1, max_size=2)
+    try:
+        drifted = await reconcile_graph_stats(db_pool, args.graph, args.objective, args.dry_run)
+        print(f"Graph '{args.graph}': {len(drifted)} objectives drifted")
+    finally:
+        await db_pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
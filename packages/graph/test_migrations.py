@@ -0,0 +1,152 @@
+"""Unit tests for graph index migrations."""
+import os
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+
+from packages.graph.migrations import (
+    EDGE_LABELS,
+    MIGRATIONS,
+    VERTEX_LABELS,
+    GraphMigration,
+    apply_graph_migrations,
+)
+
+
+class FakeConnection:
+    """Connection that records statements and keeps the migrations table in memory."""
+
+    def __init__(self, labels: set[str], applied: set[int]) -> None:
+        self.labels = labels
+        self.applied = applied
+        self.executed: list[str] = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def execute(self, query: str, *args) -> str:
+        self.executed.append(query)
+        if "INSERT INTO keta.graph_migrations" in query:
+            self.applied.add(args[1])
+        if "create_vlabel" in query or "create_elabel" in query:
+            self.labels.add(args[1])
+        return "OK"
+
+    async def fetch(self, query: str, *args) -> list:
+        if "ag_catalog.ag_label" in query:
+            return [{"name": label} for label in self.labels]
+        return [{"version": version} for version in self.applied]
+
+
+class FakeDatabasePool:
+    """Pool exposing only the transaction helper used by the migration runner."""
+
+    def __init__(self, conn: FakeConnection) -> None:
+        self.conn = conn
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield self.conn
+
+
+class TestApplyGraphMigrations:
+    """Test migration ordering and bookkeeping."""
+
+    async def test_fresh_graph_creates_labels_and_indexes(self):
+        conn = FakeConnection(labels=set(), applied=set())
+
+        applied = await apply_graph_migrations(FakeDatabasePool(conn), "keta_graph")
+
+        assert applied == [m.version for m in MIGRATIONS]
+        assert conn.labels == set(VERTEX_LABELS) | set(EDGE_LABELS)
+        index_statements = [q for q in conn.executed if q.startswith("CREATE INDEX")]
+        assert any('"keta_graph"."Entity" USING gin (properties)' in q for q in index_statements)
+        assert any(
+            '"keta_graph"."RELATED_TO" USING btree (start_id)' in q for q in index_statements
+        )
+
+    async def test_applied_versions_are_skipped(self):
+        conn = FakeConnection(labels=set(VERTEX_LABELS) | set(EDGE_LABELS), applied={1})
+        migrations = [
+            MIGRATIONS[0],
+            GraphMigration(version=2, name="extra", statements=["SELECT 2 FROM {graph}.x"]),
+        ]
+
+        applied = await apply_graph_migrations(FakeDatabasePool(conn), "keta_graph", migrations)
+
+        assert applied == [2]
+        assert not any(q.startswith("CREATE INDEX") for q in conn.executed)
+        assert 'SELECT 2 FROM "keta_graph".x' in conn.executed
+        assert not any("create_vlabel" in q for q in conn.executed)
+
+    async def test_rejects_invalid_graph_name(self):
+        conn = FakeConnection(labels=set(), applied=set())
+
+        with pytest.raises(ValueError):
+            await apply_graph_migrations(FakeDatabasePool(conn), "graph; DROP TABLE x")
+
+
+@pytest.mark.skipif(
+    not os.getenv("KETA_TEST_DATABASE_URL"),
+    reason="needs a PostgreSQL with Apache AGE (set KETA_TEST_DATABASE_URL)",
+)
+class TestIndexUsage:
+    """EXPLAIN the hot repository lookups against a scratch graph."""
+
+    @pytest.fixture
+    async def graph(self):
+        from packages.shared.database import DatabasePool
+
+        graph_name = f"keta_explain_{uuid4().hex[:8]}"
+        db_pool = DatabasePool()
+        await db_pool.initialize(os.environ["KETA_TEST_DATABASE_URL"], min_size=1, max_size=1)
+        await db_pool.execute(f"SELECT create_graph('{graph_name}')")
+        try:
+            await apply_graph_migrations(db_pool, graph_name)
+            yield db_pool, graph_name
+        finally:
+            await db_pool.execute(f"SELECT drop_graph('{graph_name}', true)")
+            await db_pool.close()
+
+    async def explain(self, db_pool, graph_name: str, cypher: str, params: dict) -> str:
+        async with db_pool.acquire() as conn:
+            # Label tables are tiny here, so rule out sequential scans to see the index choice
+            await conn.execute("SET enable_seqscan = off")
+            try:
+                rows = await conn.fetch(
+                    f"EXPLAIN SELECT * FROM cypher('{graph_name}', $$ {cypher} $$, $1) "
+                    "as (result agtype)",
+                    params,
+                )
+            finally:
+                await conn.execute("RESET enable_seqscan")
+        return "\n".join(row[0] for row in rows)
+
+    async def test_entity_id_match_uses_index(self, graph):
+        db_pool, graph_name = graph
+        plan = await self.explain(
+            db_pool, graph_name, "MATCH (e:Entity {id: $id}) RETURN e", {"id": str(uuid4())}
+        )
+        assert "Index" in plan and "Seq Scan" not in plan
+
+    async def test_entity_name_match_uses_index(self, graph):
+        db_pool, graph_name = graph
+        plan = await self.explain(
+            db_pool,
+            graph_name,
+            "MATCH (e:Entity {name: $name}) RETURN e LIMIT 1",
+            {"name": "Alice"},
+        )
+        assert "Index" in plan and "Seq Scan" not in plan
+
+    async def test_document_id_match_uses_index(self, graph):
+        db_pool, graph_name = graph
+        plan = await self.explain(
+            db_pool,
+            graph_name,
+            "MATCH (e:Entity)-[:EXTRACTED_FROM]->(d:Document {id: $id}) RETURN e",
+            {"id": str(uuid4())},
+        )
+        assert "Index" in plan and "Seq Scan" not in plan
@@ -0,0 +1,532 @@
+"""Unit tests for the knowledge graph repository."""
+import asyncio
+from contextlib import asynccontextmanager
+from uuid import UUID, uuid4
+
+from packages.graph.identity import entity_id_for, normalize_entity_key
+from packages.graph.repository import WRITE_BATCH_SIZE, KnowledgeGraphRepository
+from packages.shared.agtype import Edge, Vertex
+from packages.shared.models import NameMatch
+
+
+class FakeConnection:
+    """Records the SQL run on a transaction's connection."""
+
+    def __init__(self) -> None:
+        self.executed: list[tuple] = []
+        self.sources: dict[str, str] = {}
+
+    async def execute(self, query: str, *args) -> str:
+        self.executed.append((query, args))
+        return "OK"
+
+    async def executemany(self, query: str, args) -> None:
+        self.executed.append((query, list(args)))
+
+    async def fetch(self, query: str, *args) -> list:
+        return [
+            {"id": source_id, "objective_id": self.sources[source_id]}
+            for source_id in args[0]
+            if source_id in self.sources
+        ]
+
+
+class FakeDatabasePool:
+    """Records Cypher statements and the connection they ran on."""
+
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+        self.connections: list[FakeConnection] = []
+        self.responses: list[list] = []
+        self.fetched: list[tuple] = []
+        self.fetch_response: list = []
+
+    async def fetch(self, query: str, *args) -> list:
+        self.fetched.append((query, args))
+        return self.fetch_response
+
+    @property
+    def transactions(self) -> int:
+        return len(self.connections)
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.connections.append(FakeConnection())
+        yield self.connections[-1]
+
+    async def execute_cypher(
+        self, graph_name, cypher_query, params=None, columns=("result",), conn=None
+    ):
+        self.calls.append({"query": cypher_query, "params": params, "conn": conn})
+        if self.responses:
+            return self.responses.pop(0)
+        if "AS created" in cypher_query:
+            return [(rel["relationship_type"], 1) for rel in params["relationships"]]
+        if "AS type, added" in cypher_query:
+            return [(ent["type"], True) for ent in params["entities"]]
+        return []
+
+
+def stats_deltas(conn: FakeConnection) -> list[tuple]:
+    """(objective_id, kind, {type: delta}) for each graph_stats upsert on a connection."""
+    return [
+        (args[0], args[1], dict(zip(args[2], args[3])))
+        for query, args in conn.executed
+        if "INSERT INTO keta.graph_stats" in query
+    ]
+
+
+def make_entities(count: int) -> list[dict]:
+    return [
+        {
+            "id": str(uuid4()),
+            "name": f"Entity {i}",
+            "type": "PERSON",
+            "confidence": 0.9,
+            "extraction_method": "llm_structured",
+        }
+        for i in range(count)
+    ]
+
+
+class TestBulkWrites:
+    """Test that bulk writes batch UNWIND statements on one transaction."""
+
+    async def test_upsert_entities_batches_in_one_transaction(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+
+        ids = await repo.upsert_entities(make_entities(WRITE_BATCH_SIZE * 2 + 1), uuid4())
+
+        assert len(ids) == WRITE_BATCH_SIZE * 2 + 1
+        assert all(isinstance(entity_id, UUID) for entity_id in ids.values())
+        assert len(pool.calls) == 3
+        assert pool.transactions == 1
+        assert {id(call["conn"]) for call in pool.calls} == {id(pool.connections[0])}
+
+    async def test_upsert_entities_merges_on_normalized_key(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+        entities = make_entities(2)
+        entities[0]["name"] = "Acme  Corp"
+        entities[1]["name"] = "acme corp"
+        entities[1]["confidence"] = 0.95
+
+        ids = await repo.upsert_entities(entities, uuid4())
+
+        assert ids["Acme  Corp"] == ids["acme corp"] == entity_id_for("ACME CORP", "person")
+        sent = pool.calls[0]["params"]["entities"]
+        assert len(sent) == 1
+        assert sent[0]["confidence"] == 0.95
+        assert "MERGE (e:Entity {id: ent.id})" in pool.calls[0]["query"]
+
+    async def test_chunk_writes_share_caller_transaction(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+        source_id = uuid4()
+
+        async with pool.transaction() as conn:
+            ids = await repo.upsert_entities(make_entities(3), source_id, conn=conn)
+            await repo.link_mentions(
+                source_id, [{"entity_id": entity_id} for entity_id in ids.values()], conn=conn
+            )
+            entity_ids = list(ids.values())
+            created = await repo.create_relationships(
+                [
+                    {
+                        "entity1_id": entity_ids[0],
+                        "entity2_id": entity_ids[1],
+                        "relationship_type": "WORKS_WITH",
+                        "description": "colleagues",
+                        "confidence": 0.8,
+                    }
+                ],
+                source_ids=[source_id],
+                conn=conn,
+            )
+
+        assert created == 1
+        assert len(pool.calls) == 3
+        assert pool.transactions == 1
+        assert pool.calls[1]["params"]["mentions"][0]["mention_count"] == 1
+        assert pool.calls[2]["params"]["source_ids"] == [str(source_id)]
+
+    async def test_empty_batches_skip_database(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+
+        assert await repo.upsert_entities([], uuid4()) == {}
+        await repo.link_mentions(uuid4(), [])
+        assert await repo.create_relationships([], source_ids=[]) == 0
+        assert pool.calls == []
+
+
+class TestEntityIdentity:
+    """Test deterministic entity IDs."""
+
+    def test_normalized_key(self):
+        assert normalize_entity_key("  Ada\tLovelace ", "person") == "PERSON:ada lovelace"
+
+    def test_id_is_stable_and_type_scoped(self):
+        assert entity_id_for("Apple", "ORGANIZATION") == entity_id_for("apple", "ORGANIZATION")
+        assert entity_id_for("Apple", "ORGANIZATION") != entity_id_for("Apple", "PRODUCT")
+
+
+class LockingConnection(FakeConnection):
+    """Holds advisory locks like PostgreSQL until its transaction ends."""
+
+    def __init__(self, locks: dict) -> None:
+        super().__init__()
+        self.locks = locks
+        self.held: list[asyncio.Lock] = []
+
+    async def execute(self, query: str, *args) -> str:
+        if "pg_advisory_xact_lock" in query:
+            for key in args[1]:
+                lock = self.locks.setdefault((args[0], key), asyncio.Lock())
+                await lock.acquire()
+                self.held.append(lock)
+        return await super().execute(query, *args)
+
+
+class RacingMergePool(FakeDatabasePool):
+    """Emulates AGE's MERGE: look up, yield to other transactions, then create."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.locks: dict = {}
+        self.vertices: list[str] = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        conn = LockingConnection(self.locks)
+        self.connections.append(conn)
+        try:
+            yield conn
+        finally:
+            for lock in conn.held:
+                lock.release()
+
+    async def execute_cypher(
+        self, graph_name, cypher_query, params=None, columns=("result",), conn=None
+    ):
+        if "MERGE (e:Entity" not in cypher_query:
+            return []
+        rows = []
+        for ent in params["entities"]:
+            exists = ent["id"] in self.vertices
+            await asyncio.sleep(0)
+            if not exists:
+                self.vertices.append(ent["id"])
+            rows.append((ent["type"], not exists))
+        return rows
+
+
+class TestConcurrentUpserts:
+    """Test that parallel extractions never create an entity twice."""
+
+    async def test_concurrent_upserts_of_one_entity_create_one_vertex(self):
+        pool = RacingMergePool()
+        repo = KnowledgeGraphRepository(pool)
+        entity = {"name": "Ada Lovelace", "type": "PERSON", "confidence": 0.9}
+
+        await asyncio.gather(
+            repo.upsert_entities([dict(entity)], uuid4()),
+            repo.upsert_entities([dict(entity, name="ada  lovelace")], uuid4()),
+        )
+
+        assert pool.vertices == [str(entity_id_for("Ada Lovelace", "PERSON"))]
+
+    async def test_locks_are_taken_in_sorted_id_order(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+
+        await repo.upsert_entities(make_entities(5), uuid4())
+
+        locked = [
+            args for query, args in pool.connections[0].executed if "pg_advisory_xact_lock" in query
+        ]
+        assert len(locked) == 1
+        assert locked[0][1] == sorted(locked[0][1])
+
+
+class TestObjectiveScoping:
+    """Test that objective-scoped queries use one objective_ids predicate."""
+
+    async def test_search_entities_matches_objective_ids(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+        objective_id = uuid4()
+
+        await repo.search_entities(objective_id, entity_type="ORGANIZATION", limit=5)
+
+        call = pool.calls[0]
+        assert "{objective_ids: [$objective_id], type: $entity_type}" in call["query"]
+        assert " OR " not in call["query"]
+        assert call["params"] == {"objective_id": str(objective_id), "entity_type": "ORGANIZATION"}
+
+    async def test_writes_tag_objective(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+        objective_id = uuid4()
+
+        await repo.upsert_entities(make_entities(1), uuid4(), objective_id=objective_id)
+        await repo.create_relationships(
+            [
+                {
+                    "entity1_id": uuid4(),
+                    "entity2_id": uuid4(),
+                    "relationship_type": "PART_OF",
+                    "description": "",
+                    "confidence": 0.5,
+                }
+            ],
+            source_ids=[],
+            objective_id=objective_id,
+        )
+
+        assert pool.calls[0]["params"]["objective_id"] == str(objective_id)
+        assert pool.calls[1]["params"]["objective_ids"] == [str(objective_id)]
+
+
+class TestNeighborhood:
+    """Test the two-query neighborhood lookup."""
+
+    @staticmethod
+    def vertex(graph_id: int, entity_id: str, confidence: float) -> Vertex:
+        return Vertex(
+            graph_id,
+            "Entity",
+            {"id": entity_id, "name": entity_id, "type": "PERSON", "confidence": confidence},
+        )
+
+    async def test_neighborhood_caps_nodes_and_fetches_induced_edges(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+        center_id = uuid4()
+        center = self.vertex(1, str(center_id), 1.0)
+        neighbors = [self.vertex(i, f"n{i}", 1.0 - i / 10).to_dict() for i in range(2, 5)]
+        edge = Edge(10, "RELATED_TO", 1, 2, {"relationship_type": "KNOWS"})
+        pool.responses = [[(center, neighbors)], [(str(center_id), edge, "n2")]]
+
+        result = await repo.get_neighborhood(center_id, depth=2, max_nodes=2)
+
+        assert len(pool.calls) == 2
+        assert "*1..2" in pool.calls[0]["query"]
+        assert "LIMIT 3" in pool.calls[0]["query"]
+        assert pool.calls[1]["params"]["node_ids"] == [str(center_id), "n2", "n3"]
+        assert result["center"]["id"] == str(center_id)
+        assert [node["id"] for node in result["nodes"]] == ["n2", "n3"]
+        assert result["truncated"] is True
+        source, rel, target = result["edges"][0]
+        assert (source, rel.properties["relationship_type"], target) == (
+            str(center_id), "KNOWS", "n2"
+        )
+
+    async def test_missing_center_returns_none(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+        pool.responses = [[]]
+
+        assert await repo.get_neighborhood(uuid4()) is None
+        assert len(pool.calls) == 1
+
+
+class TestGraphStatistics:
+    """Test in-database statistics aggregation."""
+
+    async def test_counts_are_grouped_in_database_and_run_concurrently(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+        started = asyncio.Event()
+        in_flight = 0
+
+        async def execute_cypher(
+            graph_name, cypher_query, params=None, columns=("result",), conn=None
+        ):
+            nonlocal in_flight
+            in_flight += 1
+            if in_flight == 2:
+                started.set()
+            # Both queries must be in flight before either returns
+            await asyncio.wait_for(started.wait(), timeout=1)
+            pool.calls.append({"query": cypher_query, "params": params})
+            if "RELATED_TO" in cypher_query:
+                return [("WORKS_AT", 4)]
+            return [("PERSON", 3), ("ORGANIZATION", 2), (None, 1)]
+
+        pool.execute_cypher = execute_cypher
+
+        stats = await repo.get_graph_statistics(uuid4())
+
+        assert all("count(*)" in call["query"] for call in pool.calls)
+        assert stats.entity_count == 6
+        assert stats.entity_type_counts == {"PERSON": 3, "ORGANIZATION": 2, "UNKNOWN": 1}
+        assert stats.relationship_count == 4
+        assert stats.relationship_type_counts == {"WORKS_AT": 4}
+
+
+class TestGraphStatsMaintenance:
+    """Test that graph writes keep keta.graph_stats in step on the same connection."""
+
+    async def test_writes_apply_deltas_in_transaction(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+        objective_id = uuid4()
+        entities = make_entities(2)
+        entities[1]["type"] = "ORGANIZATION"
+
+        async with pool.transaction() as conn:
+            ids = await repo.upsert_entities(
+                entities, uuid4(), objective_id=objective_id, conn=conn
+            )
+            entity_ids = list(ids.values())
+            await repo.create_relationships(
+                [
+                    {
+                        "entity1_id": entity_ids[0],
+                        "entity2_id": entity_ids[1],
+                        "relationship_type": "WORKS_AT",
+                        "description": "",
+                        "confidence": 0.9,
+                    }
+                ],
+                source_ids=[],
+                objective_id=objective_id,
+                conn=conn,
+            )
+
+        assert stats_deltas(conn) == [
+            (objective_id, "ENTITY", {"PERSON": 1, "ORGANIZATION": 1}),
+            (objective_id, "RELATIONSHIP", {"WORKS_AT": 1}),
+        ]
+
+    async def test_existing_entities_are_not_recounted(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+        pool.responses = [[("PERSON", False)]]
+
+        await repo.upsert_entities(make_entities(1), uuid4(), objective_id=uuid4())
+
+        assert stats_deltas(pool.connections[0]) == []
+
+    async def test_remove_source_cleans_graph_and_decrements(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+        source_id, other_source, objective_id, other_objective = (str(uuid4()) for _ in range(4))
+        e1, e2, e3 = (str(uuid4()) for _ in range(3))
+        pool.responses = [
+            # Deleted relationships
+            [("WORKS_AT", [objective_id]), ("WORKS_AT", [objective_id])],
+            # Entities mentioning the source
+            [
+                (e1, "PERSON", [source_id], [objective_id]),
+                (e2, "PERSON", [source_id, other_source], [objective_id, other_objective]),
+                (e3, "ORGANIZATION", [other_source, source_id], [objective_id]),
+            ],
+        ]
+
+        async with pool.transaction() as conn:
+            conn.sources = {other_source: objective_id}
+            result = await repo.remove_source(UUID(source_id), conn=conn)
+
+        assert result == {"relationships_deleted": 2, "entities_updated": 2, "entities_deleted": 1}
+        queries = [call["query"] for call in pool.calls]
+        assert "DELETE r" in queries[0]
+        updates = pool.calls[2]["params"]["updates"]
+        assert [(u["id"], u["source_ids"], u["objective_ids"]) for u in updates] == [
+            (e2, [other_source], [objective_id]),
+            (e3, [other_source], [objective_id]),
+        ]
+        assert pool.calls[3]["params"]["orphans"] == [{"id": e1}]
+        assert "Document" in queries[4]
+        assert sorted(stats_deltas(conn), key=str) == sorted(
+            [
+                (UUID(objective_id), "ENTITY", {"PERSON": -1}),
+                (UUID(other_objective), "ENTITY", {"PERSON": -1}),
+                (UUID(objective_id), "RELATIONSHIP", {"WORKS_AT": -2}),
+            ],
+            key=str,
+        )
+
+    async def test_retract_chunks_drops_unmentioned_entities(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+        source_id, other_source, objective_id = (str(uuid4()) for _ in range(3))
+        e1, e2, e3 = (str(uuid4()) for _ in range(3))
+        pool.responses = [
+            # Relationships of the removed chunks
+            [("WORKS_AT", [objective_id])],
+            # Mention count update and document link deletion
+            [],
+            [],
+            # Entities no remaining chunk mentions
+            [
+                (e1, "PERSON", [source_id], [objective_id]),
+                (e3, "PERSON", [other_source, source_id], [objective_id]),
+            ],
+        ]
+
+        async with pool.transaction() as conn:
+            conn.sources = {other_source: objective_id}
+            result = await repo.retract_chunks(
+                UUID(source_id), ["hash-a"], {e1: 1, e2: 2, e3: 1}, [e1, e3], conn=conn
+            )
+
+        assert result == {"relationships_deleted": 1, "entities_updated": 1, "entities_deleted": 1}
+        assert pool.calls[0]["params"]["chunks"] == [{"hash": "hash-a"}]
+        assert pool.calls[1]["params"]["mentions"] == [{"entity_id": e2, "mention_count": 2}]
+        assert pool.calls[2]["params"]["entities"] == [{"id": i} for i in sorted([e1, e3])]
+        assert pool.calls[4]["params"]["updates"] == [
+            {"id": e3, "source_ids": [other_source], "objective_ids": [objective_id]}
+        ]
+        assert pool.calls[5]["params"]["orphans"] == [{"id": e1}]
+        assert stats_deltas(conn) == [
+            (UUID(objective_id), "ENTITY", {"PERSON": -1}),
+            (UUID(objective_id), "RELATIONSHIP", {"WORKS_AT": -1}),
+        ]
+
+
+class TestEntityNameSearch:
+    """Test name search through the entity name index."""
+
+    async def test_name_search_ranks_by_index(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+        objective_id = uuid4()
+        best, other = str(uuid4()), str(uuid4())
+        pool.fetch_response = [
+            {"entity_id": best, "score": 0.9},
+            {"entity_id": other, "score": 0.4},
+        ]
+        pool.responses = [[{"id": other, "name": "Acme Holdings"}, {"id": best, "name": "Acme"}]]
+
+        results = await repo.search_entities(
+            objective_id, name="ac%me", entity_type="ORGANIZATION", limit=5
+        )
+
+        query, args = pool.fetched[0]
+        assert "lower(name) LIKE $2" in query and "objective_ids @>" in query
+        assert args == ("ac%me", "%ac\\%me%", [objective_id], "ORGANIZATION", 5)
+        assert pool.calls[0]["params"] == {"ids": [best, other]}
+        assert [(r["id"], r["score"]) for r in results] == [(best, 0.9), (other, 0.4)]
+
+    async def test_fuzzy_search_without_hits_skips_graph(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+
+        assert await repo.find_entities_by_name("Acmee", NameMatch.FUZZY) == []
+        assert "lower(name) % $1" in pool.fetched[0][0]
+        assert pool.calls == []
+
+    async def test_writes_mirror_names(self):
+        pool = FakeDatabasePool()
+        repo = KnowledgeGraphRepository(pool)
+        objective_id = uuid4()
+
+        ids = await repo.upsert_entities(make_entities(2), uuid4(), objective_id=objective_id)
+
+        conn = pool.connections[0]
+        args = next(args for query, args in conn.executed if "keta.entity_names" in query)
+        assert sorted(args[0]) == sorted(ids.values())
+        assert args[3] == objective_id
@@ -0,0 +1,89 @@
+"""Unit tests for graph statistics reconciliation."""
+from uuid import uuid4
+
+from packages.graph import stats as stats_module
+from packages.graph.stats import compute_drift, reconcile_graph_stats
+from packages.shared.models.age import GraphStatistics
+
+
+def make_stats(entities: dict[str, int], relationships: dict[str, int]) -> GraphStatistics:
+    return GraphStatistics(
+        entity_count=sum(entities.values()),
+        relationship_count=sum(relationships.values()),
+        entity_type_counts=entities,
+        relationship_type_counts=relationships,
+    )
+
+
+class TestComputeDrift:
+    """Test drift detection between stored and recounted statistics."""
+
+    def test_reports_only_differing_types(self):
+        drift = compute_drift(
+            uuid4(),
+            stored=make_stats({"PERSON": 3, "ORGANIZATION": 1}, {"WORKS_AT": 2}),
+            actual=make_stats({"PERSON": 3, "PRODUCT": 2}, {"WORKS_AT": 2}),
+        )
+
+        assert drift.entity_type_deltas == {"ORGANIZATION": -1, "PRODUCT": 2}
+        assert drift.relationship_type_deltas == {}
+        assert drift.has_drift
+
+    def test_in_sync(self):
+        same = make_stats({"PERSON": 1}, {})
+        assert not compute_drift(uuid4(), same, same).has_drift
+
+
+class TestReconcile:
+    """Test that reconcile rewrites only drifted objectives."""
+
+    async def test_rewrites_drifted_objectives(self, monkeypatch):
+        in_sync, drifted = uuid4(), uuid4()
+        replaced = []
+
+        class FakeStatsRepository:
+            async def get_objective_stats(self, objective_id):
+                return make_stats({"PERSON": 1}, {})
+
+            async def replace_objective_stats(self, objective_id, stats, conn=None):
+                replaced.append((objective_id, stats.entity_type_counts))
+
+        class FakeGraphRepository:
+            def __init__(self, db_pool, graph_name):
+                self.stats_repo = FakeStatsRepository()
+
+            async def get_graph_statistics(self, objective_id):
+                if objective_id == drifted:
+                    return make_stats({"PERSON": 2}, {})
+                return make_stats({"PERSON": 1}, {})
+
+        monkeypatch.setattr(stats_module, "KnowledgeGraphRepository", FakeGraphRepository)
+
+        result = await reconcile_graph_stats(None, "keta_graph", [in_sync, drifted])
+
+        assert [d.objective_id for d in result] == [drifted]
+        assert replaced == [(drifted, {"PERSON": 2})]
+
+    async def test_dry_run_leaves_table(self, monkeypatch):
+        replaced = []
+
+        class FakeStatsRepository:
+            async def get_objective_stats(self, objective_id):
+                return make_stats({}, {})
+
+            async def replace_objective_stats(self, objective_id, stats, conn=None):
+                replaced.append(objective_id)
+
+        class FakeGraphRepository:
+            def __init__(self, db_pool, graph_name):
+                self.stats_repo = FakeStatsRepository()
+
+            async def get_graph_statistics(self, objective_id):
+                return make_stats({"PERSON": 1}, {})
+
+        monkeypatch.setattr(stats_module, "KnowledgeGraphRepository", FakeGraphRepository)
+
+        result = await reconcile_graph_stats(None, "keta_graph", [uuid4()], dry_run=True)
+
+        assert len(result) == 1
+        assert replaced == []
@@ -0,0 +1,241 @@
+"""
+Apache AGE agtype codec for KETA.
+
+agtype text is JSON with type annotations appended to some values:
+``{...}::vertex``, ``{...}::edge``, ``[...]::path`` and ``1.5::numeric``.
+The decoder rewrites the annotations into JSON in a single pass that skips
+over string literals, parses the result once with orjson and turns annotated
+values into lightweight Vertex, Edge and Path objects.
+"""
+
+import json
+import re
+from typing import Any, Optional
+
+import orjson
+
+# Marker key injected into annotated objects and marker element appended to paths.
+# They start with NUL, which cannot appear unescaped in agtype keys or strings.
+_TAG = "\x00agtype"
+_PATH_SENTINEL = "\x00path"
+
+# A JSON string literal, matched whole so annotation text inside strings is kept,
+# or one of the annotations with the JSON it is rewritten to by group number
+_ANNOTATION = re.compile(
+    r'("[^"\\]*(?:\\.[^"\\]*)*")|(\}::vertex)|(\}::edge)|(\]::path)|(::numeric)'
+)
+_REWRITES = {
+    2: ',"\\u0000agtype":"v"}',
+    3: ',"\\u0000agtype":"e"}',
+    4: ',"\\u0000path"]',
+    5: "",
+}
+
+
+class Vertex:
+    """AGE vertex decoded from agtype."""
+
+    __slots__ = ("id", "label", "properties")
+
+    def __init__(self, id: int, label: str, properties: dict[str, Any]) -> None:
+        self.id = id
+        self.label = label
+        self.properties = properties
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the vertex in AGE's JSON shape."""
+        return {"id": self.id, "label": self.label, "properties": self.properties}
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Vertex) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"Vertex(id={self.id}, label={self.label!r}, properties={self.properties!r})"
+
+
+class Edge:
+    """AGE edge decoded from agtype."""
+
+    __slots__ = ("id", "label", "start_id", "end_id", "properties")
+
+    def __init__(
+        self, id: int, label: str, start_id: int, end_id: int, properties: dict[str, Any]
+    ) -> None:
+        self.id = id
+        self.label = label
+        self.start_id = start_id
+        self.end_id = end_id
+        self.properties = properties
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the edge in AGE's JSON shape."""
+        return {
+            "id": self.id,
+            "label": self.label,
+            "start_id": self.start_id,
+            "end_id": self.end_id,
+            "properties": self.properties,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Edge) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return (
+            f"Edge(id={self.id}, label={self.label!r}, start_id={self.start_id}, "
+            f"end_id={self.end_id}, properties={self.properties!r})"
+        )
+
+
+class Path:
+    """AGE path decoded from agtype."""
+
+    __slots__ = ("vertices", "edges")
+
+    def __init__(self, vertices: list[Vertex], edges: list[Edge]) -> None:
+        self.vertices = vertices
+        self.edges = edges
+
+    def to_list(self) -> list[dict[str, Any]]:
+        """Return the path as AGE's alternating vertex/edge list."""
+        elements: list[dict[str, Any]] = []
+        for i, vertex in enumerate(self.vertices):
+            elements.append(vertex.to_dict())
+            if i < len(self.edges):
+                elements.append(self.edges[i].to_dict())
+        return elements
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Path) and self.to_list() == other.to_list()
+
+    def __repr__(self) -> str:
+        return f"Path(vertices={self.vertices!r}, edges={self.edges!r})"
+
+
+def _loads(text: str) -> Any:
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        # agtype may emit NaN/Infinity, which only the stdlib parser accepts
+        return json.loads(text)
+
+
+def _vertex(value: dict[str, Any]) -> Vertex:
+    return Vertex(value["id"], value["label"], value.get("properties") or {})
+
+
+def _edge(value: dict[str, Any]) -> Edge:
+    return Edge(
+        value["id"],
+        value["label"],
+        value["start_id"],
+        value["end_id"],
+        value.get("properties") or {},
+    )
+
+
+def _convert(value: Any) -> Any:
+    if isinstance(value, dict):
+        tag = value.pop(_TAG, None)
+        # Properties hold plain values only, so tagged objects need no recursion
+        if tag == "v":
+            return _vertex(value)
+        if tag == "e":
+            return _edge(value)
+        return {key: _convert(item) for key, item in value.items()}
+    if isinstance(value, list):
+        if value and value[-1] == _PATH_SENTINEL:
+            elements = [_convert(item) for item in value[:-1]]
+            return Path(elements[0::2], elements[1::2])
+        return [_convert(item) for item in value]
+    return value
+
+
+def _rewrite(match: re.Match[str]) -> str:
+    index = match.lastindex
+    if index is None or index == 1:
+        # A string literal is kept as is
+        return match.group()
+    return _REWRITES[index]
+
+
+def decode_agtype(text: str) -> Any:
+    """
+    Decode agtype text into Python values.
+
+    Args:
+        text: agtype text as sent by the server
+
+    Returns:
+        Vertex, Edge, Path, or a native value (nested lists and maps may contain
+        Vertex/Edge/Path objects)
+    """
+    annotations = text.count("::")
+    if annotations == 0:
+        return _loads(text)
+    # A single top-level vertex or edge is the common column value: strip the
+    # suffix and build the object directly instead of rewriting the text
+    if annotations == 1:
+        if text.endswith("::vertex"):
+            return _vertex(_loads(text[:-8]))
+        if text.endswith("::edge"):
+            return _edge(_loads(text[:-6]))
+    text = _ANNOTATION.sub(_rewrite, text)
+    return _convert(_loads(text))
+
+
+def encode_agtype(value: Any) -> str:
+    """
+    Encode a Python value as agtype text for Cypher parameter maps.
+
+    Args:
+        value: Value to encode (already-encoded strings are passed through)
+
+    Returns:
+        agtype literal
+    """
+    if isinstance(value, str):
+        return value
+    return orjson.dumps(value, default=str).decode()
+
+
+def to_plain(value: Any) -> Any:
+    """
+    Convert decoded agtype values into plain dicts and lists.
+
+    Args:
+        value: Decoded agtype value
+
+    Returns:
+        The same value with Vertex/Edge as dicts and Path as a list
+    """
+    if isinstance(value, (Vertex, Edge)):
+        return value.to_dict()
+    if isinstance(value, Path):
+        return value.to_list()
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_plain(item) for item in value]
+    return value
+
+
+def properties_of(value: Any) -> Optional[dict[str, Any]]:
+    """
+    Extract the properties dict from a decoded row value.
+
+    Vertices and edges yield their properties; maps are returned with nested
+    graph objects converted to plain dicts. Anything else yields None.
+
+    Args:
+        value: Decoded agtype value
+
+    Returns:
+        Properties dict or None
+    """
+    if isinstance(value, (Vertex, Edge)):
+        return value.properties
+    if isinstance(value, dict):
+        properties: dict[str, Any] = to_plain(value)
+        return properties
+    return None
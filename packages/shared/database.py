@@ -4,23 +4,88 @@ Database connection pooling for KETA.
 
 import json
 import logging
+import re
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Optional, Sequence
 
 import asyncpg
 from asyncpg import Pool
 
+from packages.shared.agtype import decode_agtype, encode_agtype
+
 logger = logging.getLogger(__name__)
 
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class PoolMetrics:
+    """
+    Timing counters for pool activity.
+
+    Tracks acquire wait, per-connection AGE setup and query execution separately,
+    so that round trips spent on session setup are visible next to real work.
+    """
+
+    KINDS = ("acquire_wait", "setup", "query")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        self._count = {kind: 0 for kind in self.KINDS}
+        self._total = {kind: 0.0 for kind in self.KINDS}
+        self._max = {kind: 0.0 for kind in self.KINDS}
+
+    def record(self, kind: str, seconds: float) -> None:
+        """
+        Record a single timing sample.
+
+        Args:
+            kind: One of acquire_wait, setup, query
+            seconds: Elapsed time in seconds
+        """
+        self._count[kind] += 1
+        self._total[kind] += seconds
+        if seconds > self._max[kind]:
+            self._max[kind] = seconds
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """
+        Get a summary of recorded timings in milliseconds.
+
+        Returns:
+            Mapping of kind to count, total_ms, avg_ms and max_ms
+        """
+        summary = {}
+        for kind in self.KINDS:
+            count = self._count[kind]
+            total_ms = self._total[kind] * 1000
+            summary[kind] = {
+                "count": count,
+                "total_ms": round(total_ms, 3),
+                "avg_ms": round(total_ms / count, 3) if count else 0.0,
+                "max_ms": round(self._max[kind] * 1000, 3),
+            }
+        return summary
+
 
 class DatabasePool:
     """
     Async connection pool manager for PostgreSQL with Apache AGE.
+
+    AGE session state (``LOAD 'age'`` and the search path) is set up once per
+    physical connection when the pool opens it. Connections are tracked by backend
+    PID, so a reconnect gets a fresh setup and a connection whose session state was
+    discarded can be flagged with :meth:`invalidate_session`.
     """
 
     def __init__(self) -> None:
         self._pool: Optional[Pool] = None
         self._database_url: Optional[str] = None
+        self._ready_pids: set[int] = set()
+        self.metrics = PoolMetrics()
 
     async def initialize(
         self,
@@ -28,6 +93,7 @@ class DatabasePool:
         min_size: int = 5,
         max_size: int = 20,
         command_timeout: float = 60.0,
+        statement_cache_size: int = 512,
     ) -> None:
         """
         Initialize the connection pool.
@@ -37,6 +103,7 @@ class DatabasePool:
             min_size: Minimum number of connections in the pool
             max_size: Maximum number of connections in the pool
             command_timeout: Timeout for commands in seconds
+            statement_cache_size: Prepared statements cached per connection, keyed by SQL text
         """
         if self._pool is not None:
             logger.warning("Database pool already initialized")
@@ -45,14 +112,23 @@ class DatabasePool:
         self._database_url = database_url
 
         async def init_connection(conn):
-            """Initialize connection with type codecs."""
+            """Initialize connection with AGE session state and type codecs."""
             await self._setup_age(conn)
+            pid = conn.get_server_pid()
+            conn.add_termination_listener(lambda _conn: self._ready_pids.discard(pid))
             await conn.set_type_codec(
                 'jsonb',
                 encoder=json.dumps,
                 decoder=json.loads,
                 schema='pg_catalog'
             )
+            await conn.set_type_codec(
+                'agtype',
+                encoder=encode_agtype,
+                decoder=decode_agtype,
+                schema='ag_catalog',
+                format='text',
+            )
 
         try:
             self._pool = await asyncpg.create_pool(
@@ -60,6 +136,7 @@ class DatabasePool:
                 min_size=min_size,
                 max_size=max_size,
                 command_timeout=command_timeout,
+                statement_cache_size=statement_cache_size,
                 server_settings={
                     "search_path": "keta,ag_catalog,public",
                 },
@@ -81,14 +158,27 @@ class DatabasePool:
         Args:
             conn: Database connection
         """
+        started = time.perf_counter()
         try:
-            # Load AGE extension
-            await conn.execute("LOAD 'age';")
-            # Set search path to include ag_catalog
-            await conn.execute("SET search_path = keta, ag_catalog, public;")
+            # Load AGE extension and set search path to include ag_catalog
+            await conn.execute("LOAD 'age'; SET search_path = keta, ag_catalog, public;")
         except Exception as e:
             logger.error(f"Failed to set up Apache AGE: {e}")
             raise
+        self._ready_pids.add(conn.get_server_pid())
+        self.metrics.record("setup", time.perf_counter() - started)
+
+    def invalidate_session(self, conn: asyncpg.Connection) -> None:
+        """
+        Mark a connection's AGE session state as lost.
+
+        Call this after running DISCARD ALL, RESET search_path or similar on a
+        pooled connection; setup is re-run the next time it is acquired.
+
+        Args:
+            conn: Database connection
+        """
+        self._ready_pids.discard(conn.get_server_pid())
 
     async def close(self) -> None:
         """Close the connection pool."""
@@ -96,6 +186,7 @@ class DatabasePool:
             await self._pool.close()
             logger.info("Database pool closed")
             self._pool = None
+            self._ready_pids.clear()
 
     @asynccontextmanager
     async def acquire(self) -> AsyncGenerator[asyncpg.Connection, None]:
@@ -111,11 +202,39 @@ class DatabasePool:
         if self._pool is None:
             raise RuntimeError("Database pool not initialized")
 
+        started = time.perf_counter()
         async with self._pool.acquire() as conn:
-            # Ensure AGE is loaded for this connection
-            await self._setup_age(conn)
+            self.metrics.record("acquire_wait", time.perf_counter() - started)
+            # Pool reset (RESET ALL) restores the search_path startup setting and the
+            # AGE library stays loaded, so setup only runs for untracked sessions
+            if conn.get_server_pid() not in self._ready_pids:
+                await self._setup_age(conn)
             yield conn
 
+    @asynccontextmanager
+    async def transaction(self) -> AsyncGenerator[asyncpg.Connection, None]:
+        """
+        Acquire a connection and open a transaction on it.
+
+        The transaction commits when the block exits normally and rolls back
+        if it raises.
+
+        Yields:
+            Database connection inside the transaction
+        """
+        async with self.acquire() as conn:
+            async with conn.transaction():
+                yield conn
+
+    @asynccontextmanager
+    async def _timed_query(self) -> AsyncGenerator[None, None]:
+        """Record the duration of the wrapped query."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.metrics.record("query", time.perf_counter() - started)
+
     async def execute(self, query: str, *args) -> str:
         """
         Execute a query without returning results.
@@ -127,7 +246,7 @@ class DatabasePool:
         Returns:
             Query status
         """
-        async with self.acquire() as conn:
+        async with self.acquire() as conn, self._timed_query():
             return await conn.execute(query, *args)
 
     async def fetch(self, query: str, *args) -> list[asyncpg.Record]:
@@ -141,7 +260,7 @@ class DatabasePool:
         Returns:
             List of records
         """
-        async with self.acquire() as conn:
+        async with self.acquire() as conn, self._timed_query():
             return await conn.fetch(query, *args)
 
     async def fetchrow(self, query: str, *args) -> Optional[asyncpg.Record]:
@@ -155,7 +274,7 @@ class DatabasePool:
         Returns:
             Single record or None
         """
-        async with self.acquire() as conn:
+        async with self.acquire() as conn, self._timed_query():
             return await conn.fetchrow(query, *args)
 
     async def fetchval(self, query: str, *args, column: int = 0):
@@ -170,25 +289,78 @@ class DatabasePool:
         Returns:
             Single value
         """
-        async with self.acquire() as conn:
+        async with self.acquire() as conn, self._timed_query():
             return await conn.fetchval(query, *args, column=column)
 
-    async def execute_cypher(self, graph_name: str, cypher_query: str) -> list[asyncpg.Record]:
+    async def execute_cypher(
+        self,
+        graph_name: str,
+        cypher_query: str,
+        params: Optional[dict[str, Any]] = None,
+        columns: Sequence[str] = ("result",),
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> list[asyncpg.Record]:
         """
         Execute an Apache AGE Cypher query.
 
+        Parameters are passed through the third ``cypher()`` argument as an agtype
+        map and referenced in the query as ``$name``. Because values no longer
+        appear in the SQL text, the statement for a given template is prepared once
+        per connection and reused from asyncpg's statement cache.
+
         Args:
             graph_name: Name of the graph
             cypher_query: Cypher query
+            params: Parameter map for the query
+            columns: Names of the agtype columns the query returns, in RETURN order
+            conn: Connection to run on, e.g. one held by ``transaction()``
+                (optional, acquires from the pool if not provided)
 
         Returns:
             Query results
+
+        Raises:
+            ValueError: If a column name is not a plain identifier
         """
+        for column in columns:
+            if not _IDENTIFIER.match(column):
+                raise ValueError(f"Invalid Cypher result column name: {column!r}")
+        column_list = ", ".join(f"{column} agtype" for column in columns)
+
         # AGE requires queries to be wrapped in the cypher function
-        query = f"SELECT * FROM cypher('{graph_name}', $$ {cypher_query} $$) as (result agtype);"
+        if params is None:
+            query = (
+                f"SELECT * FROM cypher('{graph_name}', $$ {cypher_query} $$) "
+                f"as ({column_list});"
+            )
+            args: tuple = ()
+        else:
+            query = (
+                f"SELECT * FROM cypher('{graph_name}', $$ {cypher_query} $$, $1) "
+                f"as ({column_list});"
+            )
+            args = (params,)
         logger.debug(f"[DB] Executing Cypher query on graph '{graph_name}':\n{cypher_query}")
         logger.debug(f"[DB] Full SQL query:\n{query}")
-        return await self.fetch(query)
+        if conn is None:
+            return await self.fetch(query, *args)
+        async with self._timed_query():
+            records: list[asyncpg.Record] = await conn.fetch(query, *args)
+            return records
+
+    def get_metrics(self) -> dict[str, Any]:
+        """
+        Get pool sizing and timing statistics.
+
+        Returns:
+            Dictionary with pool size, idle connections, tracked AGE sessions and timings
+        """
+        return {
+            "size": self._pool.get_size() if self._pool is not None else 0,
+            "idle": self._pool.get_idle_size() if self._pool is not None else 0,
+            "age_sessions": len(self._ready_pids),
+            "timings": self.metrics.snapshot(),
+        }
 
     @property
     def is_initialized(self) -> bool:
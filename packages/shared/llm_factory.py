@@ -1,6 +1,6 @@
 from langchain_core.language_models import BaseChatModel
 
-from shared.config import LLMProvider, Settings
+from packages.shared.config import LLMProvider, Settings
 
 
 def create_llm(settings: Settings) -> BaseChatModel:
@@ -28,6 +28,7 @@ def create_llm(settings: Settings) -> BaseChatModel:
             model=settings.ollama_model,
             base_url=settings.ollama_base_url,
             temperature=settings.model_temperature,
+            num_ctx=settings.ollama_num_ctx,
         )
 
     elif settings.llm_provider == LLMProvider.OPENAI:
@@ -6,19 +6,24 @@ Shared models package.
 from packages.shared.models.core import (
     ObjectiveStatus,
     ExtractionStatus,
+    ExtractionOrder,
     ChatSessionStatus,
     MessageRole,
     AgentType,
     EntityType,
+    NameMatch,
     BaseResponse,
     ObjectiveCreate,
     ObjectiveUpdate,
     ObjectiveResponse,
     ObjectiveStats,
     SourceCreate,
+    SourceUpdate,
     SourceResponse,
+    StageProgress,
     ExtractionProgress,
     ExtractionStatusResponse,
+    ObjectiveExtractionStatus,
     ChatSessionCreate,
     ChatSessionResponse,
     SourceCitation,
@@ -38,6 +43,8 @@ from packages.shared.models.core import (
 from packages.shared.models.age import (
     AgeVertex,
     AgeEdge,
+    AgePath,
+    AgeColumnKind,
     AgeRelationshipResult,
     EntityProperties,
     RelationshipProperties,
@@ -46,6 +53,8 @@ from packages.shared.models.age import (
     AgeParseError,
     parse_agtype_to_vertex,
     parse_agtype_to_edge,
+    parse_agtype_to_path,
+    validate_agtype_column,
     validate_entity_properties,
     validate_relationship_properties,
 )
@@ -54,10 +63,12 @@ __all__ = [
     # Enums
     "ObjectiveStatus",
     "ExtractionStatus",
+    "ExtractionOrder",
     "ChatSessionStatus",
     "MessageRole",
     "AgentType",
     "EntityType",
+    "NameMatch",
     # Base models
     "BaseResponse",
     # Objective models
@@ -67,9 +78,12 @@ __all__ = [
     "ObjectiveStats",
     # Source models
     "SourceCreate",
+    "SourceUpdate",
     "SourceResponse",
+    "StageProgress",
     "ExtractionProgress",
     "ExtractionStatusResponse",
+    "ObjectiveExtractionStatus",
     # Chat models
     "ChatSessionCreate",
     "ChatSessionResponse",
@@ -89,6 +103,8 @@ __all__ = [
     # AGE models
     "AgeVertex",
     "AgeEdge",
+    "AgePath",
+    "AgeColumnKind",
     "AgeRelationshipResult",
     "EntityProperties",
     "RelationshipProperties",
@@ -97,6 +113,8 @@ __all__ = [
     "AgeParseError",
     "parse_agtype_to_vertex",
     "parse_agtype_to_edge",
+    "parse_agtype_to_path",
+    "validate_agtype_column",
     "validate_entity_properties",
     "validate_relationship_properties",
 ]
@@ -5,9 +5,12 @@ These models provide runtime validation of AGE query results to catch
 parsing issues early and ensure data integrity.
 """
 import json
+from enum import Enum
 from typing import Any, Optional, Union
 from pydantic import BaseModel, Field, field_validator, ValidationError
 
+from packages.shared.agtype import Edge, Path, Vertex, decode_agtype, to_plain
+
 
 class AgeVertex(BaseModel):
     """
@@ -190,6 +193,32 @@ class GraphStatistics(BaseModel):
         return v
 
 
+class AgePath(BaseModel):
+    """
+    Model for Apache AGE path structure.
+
+    AGE paths alternate vertices and edges:
+    [{...}::vertex, {...}::edge, {...}::vertex]::path
+    """
+
+    vertices: list[AgeVertex] = Field(default_factory=list, description="Vertices in path order")
+    edges: list[AgeEdge] = Field(default_factory=list, description="Edges in path order")
+
+    @property
+    def length(self) -> int:
+        """Number of edges in the path."""
+        return len(self.edges)
+
+
+class AgeColumnKind(str, Enum):
+    """Expected kind of a Cypher result column."""
+
+    VERTEX = "vertex"
+    EDGE = "edge"
+    PATH = "path"
+    SCALAR = "scalar"
+
+
 # Alias for consistency with AGE naming conventions
 AgeRelationshipResult = RelationshipResult
 
@@ -214,12 +243,12 @@ class AgeParseError(Exception):
         return msg
 
 
-def parse_agtype_to_vertex(agtype_data: Union[str, dict]) -> AgeVertex:
+def parse_agtype_to_vertex(agtype_data: Union[str, dict, Vertex]) -> AgeVertex:
     """
     Parse AGE agtype data to AgeVertex with validation.
     
     Args:
-        agtype_data: Raw AGE vertex data (string or dict)
+        agtype_data: Raw AGE vertex data (string, dict or decoded Vertex)
         
     Returns:
         Validated AgeVertex instance
@@ -228,11 +257,11 @@ def parse_agtype_to_vertex(agtype_data: Union[str, dict]) -> AgeVertex:
         AgeParseError: If parsing or validation fails
     """
     try:
-        # Handle string format: {...}::vertex
+        # Handle string format {...}::vertex; the codec leaves annotation text
+        # inside property strings intact
         if isinstance(agtype_data, str):
-            json_str = agtype_data.replace('::vertex', '').strip()
-            parsed = json.loads(json_str)
-        elif isinstance(agtype_data, dict):
+            parsed = decode_agtype(agtype_data)
+        elif isinstance(agtype_data, (Vertex, dict)):
             parsed = agtype_data
         else:
             raise AgeParseError(
@@ -240,10 +269,19 @@ def parse_agtype_to_vertex(agtype_data: Union[str, dict]) -> AgeVertex:
                 raw_data=str(agtype_data),
                 context={"input_type": type(agtype_data).__name__}
             )
-        
+
+        if isinstance(parsed, Vertex):
+            # Decoded by the agtype codec
+            return AgeVertex.model_validate(parsed, from_attributes=True)
+        if not isinstance(parsed, dict):
+            raise AgeParseError(
+                f"Expected a vertex, got {type(parsed).__name__}",
+                raw_data=str(agtype_data),
+            )
+
         # Validate structure
         return AgeVertex(**parsed)
-        
+
     except json.JSONDecodeError as e:
         raise AgeParseError(
             "Invalid JSON in agtype vertex data",
@@ -256,6 +294,15 @@ def parse_agtype_to_vertex(agtype_data: Union[str, dict]) -> AgeVertex:
             raw_data=str(agtype_data),
             context={"validation_errors": e.errors()}
         ) from e
+    except KeyError as e:
+        # Raised by the codec when the annotated text lacks a required key
+        raise AgeParseError(
+            "Vertex data failed validation",
+            raw_data=str(agtype_data),
+            context={"missing_field": str(e)}
+        ) from e
+    except AgeParseError:
+        raise
     except Exception as e:
         raise AgeParseError(
             f"Unexpected error parsing vertex: {type(e).__name__}",
@@ -264,12 +311,12 @@ def parse_agtype_to_vertex(agtype_data: Union[str, dict]) -> AgeVertex:
         ) from e
 
 
-def parse_agtype_to_edge(agtype_data: Union[str, dict]) -> AgeEdge:
+def parse_agtype_to_edge(agtype_data: Union[str, dict, Edge]) -> AgeEdge:
     """
     Parse AGE agtype data to AgeEdge with validation.
     
     Args:
-        agtype_data: Raw AGE edge data (string or dict)
+        agtype_data: Raw AGE edge data (string, dict or decoded Edge)
         
     Returns:
         Validated AgeEdge instance
@@ -278,11 +325,11 @@ def parse_agtype_to_edge(agtype_data: Union[str, dict]) -> AgeEdge:
         AgeParseError: If parsing or validation fails
     """
     try:
-        # Handle string format: {...}::edge
+        # Handle string format {...}::edge; the codec leaves annotation text
+        # inside property strings intact
         if isinstance(agtype_data, str):
-            json_str = agtype_data.replace('::edge', '').strip()
-            parsed = json.loads(json_str)
-        elif isinstance(agtype_data, dict):
+            parsed = decode_agtype(agtype_data)
+        elif isinstance(agtype_data, (Edge, dict)):
             parsed = agtype_data
         else:
             raise AgeParseError(
@@ -290,10 +337,19 @@ def parse_agtype_to_edge(agtype_data: Union[str, dict]) -> AgeEdge:
                 raw_data=str(agtype_data),
                 context={"input_type": type(agtype_data).__name__}
             )
-        
+
+        if isinstance(parsed, Edge):
+            # Decoded by the agtype codec
+            return AgeEdge.model_validate(parsed, from_attributes=True)
+        if not isinstance(parsed, dict):
+            raise AgeParseError(
+                f"Expected a edge, got {type(parsed).__name__}",
+                raw_data=str(agtype_data),
+            )
+
         # Validate structure
         return AgeEdge(**parsed)
-        
+
     except json.JSONDecodeError as e:
         raise AgeParseError(
             "Invalid JSON in agtype edge data",
@@ -306,6 +362,15 @@ def parse_agtype_to_edge(agtype_data: Union[str, dict]) -> AgeEdge:
             raw_data=str(agtype_data),
             context={"validation_errors": e.errors()}
         ) from e
+    except KeyError as e:
+        # Raised by the codec when the annotated text lacks a required key
+        raise AgeParseError(
+            "Edge data failed validation",
+            raw_data=str(agtype_data),
+            context={"missing_field": str(e)}
+        ) from e
+    except AgeParseError:
+        raise
     except Exception as e:
         raise AgeParseError(
             f"Unexpected error parsing edge: {type(e).__name__}",
@@ -314,6 +379,82 @@ def parse_agtype_to_edge(agtype_data: Union[str, dict]) -> AgeEdge:
         ) from e
 
 
+def parse_agtype_to_path(agtype_data: Union[str, list, Path]) -> AgePath:
+    """
+    Parse AGE agtype path data to AgePath with validation.
+
+    Args:
+        agtype_data: Raw AGE path data (string, list of vertex/edge dicts or decoded Path)
+
+    Returns:
+        Validated AgePath instance
+
+    Raises:
+        AgeParseError: If parsing or validation fails
+    """
+    try:
+        decoded = decode_agtype(agtype_data) if isinstance(agtype_data, str) else agtype_data
+        elements = decoded.to_list() if isinstance(decoded, Path) else decoded
+        if not isinstance(elements, list):
+            raise AgeParseError(
+                f"Expected list of path elements, got {type(elements)}",
+                raw_data=str(agtype_data),
+            )
+
+        # Even positions are vertices, odd positions are edges
+        return AgePath(
+            vertices=[AgeVertex(**element) for element in elements[0::2]],
+            edges=[AgeEdge(**element) for element in elements[1::2]],
+        )
+
+    except json.JSONDecodeError as e:
+        raise AgeParseError(
+            "Invalid JSON in agtype path data",
+            raw_data=str(agtype_data),
+            context={"json_error": str(e)}
+        ) from e
+    except ValidationError as e:
+        raise AgeParseError(
+            "Path data failed validation",
+            raw_data=str(agtype_data),
+            context={"validation_errors": e.errors()}
+        ) from e
+    except AgeParseError:
+        raise
+    except Exception as e:
+        raise AgeParseError(
+            f"Unexpected error parsing path: {type(e).__name__}",
+            raw_data=str(agtype_data),
+            context={"error": str(e)}
+        ) from e
+
+
+def validate_agtype_column(value: Any, kind: AgeColumnKind) -> Any:
+    """
+    Validate one result column already decoded by the agtype codec.
+
+    Args:
+        value: Decoded value (Vertex, Edge, Path or native value; None for NULL)
+        kind: Expected column kind
+
+    Returns:
+        AgeVertex, AgeEdge, AgePath or native value; None for NULL
+
+    Raises:
+        AgeParseError: If the value does not match its declared kind
+    """
+    if value is None:
+        return None
+    kind = AgeColumnKind(kind)
+    if kind == AgeColumnKind.VERTEX:
+        return parse_agtype_to_vertex(value)
+    if kind == AgeColumnKind.EDGE:
+        return parse_agtype_to_edge(value)
+    if kind == AgeColumnKind.PATH:
+        return parse_agtype_to_path(value)
+    return to_plain(value)
+
+
 def validate_entity_properties(properties: dict[str, Any]) -> EntityProperties:
     """
     Validate entity properties with clear error messages.
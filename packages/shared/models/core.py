@@ -33,6 +33,13 @@ class ExtractionStatus(str, Enum):
     FAILED = "FAILED"
 
 
+class ExtractionOrder(str, Enum):
+    """Order in which an objective's sources are extracted."""
+
+    SMALLEST_FIRST = "smallest_first"  # fewest chunks first
+    PRIORITY = "priority"  # highest metadata["priority"] first, then smallest
+
+
 class ChatSessionStatus(str, Enum):
     """Chat session status enumeration."""
 
@@ -67,6 +74,14 @@ class EntityType(str, Enum):
     EVENT = "EVENT"
 
 
+class NameMatch(str, Enum):
+    """How an entity name search term is matched."""
+
+    SUBSTRING = "substring"
+    PREFIX = "prefix"
+    FUZZY = "fuzzy"
+
+
 # ============================================
 # BASE MODELS
 # ============================================
@@ -127,6 +142,8 @@ class ObjectiveStats(BaseModel):
     message_count: int
     last_processed_at: Optional[datetime]
     last_chat_at: Optional[datetime]
+    entity_count: int = 0
+    relationship_count: int = 0
 
 
 # ============================================
@@ -143,6 +160,15 @@ class SourceCreate(BaseModel):
     metadata: dict[str, Any] = Field(default_factory=dict)
 
 
+class SourceUpdate(BaseModel):
+    """Request model for updating a source."""
+
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    description: Optional[str] = None
+    content: Optional[str] = Field(None, min_length=1)
+    metadata: Optional[dict[str, Any]] = None
+
+
 class SourceResponse(BaseModel):
     """Response model for a source."""
 
@@ -158,6 +184,15 @@ class SourceResponse(BaseModel):
     uploaded_at: datetime
     processed_at: Optional[datetime]
     metadata: dict[str, Any]
+    content_hash: Optional[str] = None
+
+
+class StageProgress(BaseModel):
+    """Progress of one extraction pipeline stage."""
+
+    queue_depth: int = 0
+    processed: int = 0
+    items_per_second: float = 0.0
 
 
 class ExtractionProgress(BaseModel):
@@ -167,7 +202,11 @@ class ExtractionProgress(BaseModel):
     processed_chunks: int = 0
     entities_extracted: int = 0
     relationships_extracted: int = 0
+    reused_chunks: int = 0
+    skipped_chunks: int = 0
+    failed_chunks: int = 0
     current_stage: Optional[str] = None
+    stages: dict[str, StageProgress] = Field(default_factory=dict)
 
 
 class ExtractionStatusResponse(BaseModel):
@@ -179,6 +218,22 @@ class ExtractionStatusResponse(BaseModel):
     error: Optional[str] = None
 
 
+class ObjectiveExtractionStatus(BaseModel):
+    """Extraction progress aggregated over an objective's sources."""
+
+    objective_id: UUID
+    total_sources: int = 0
+    pending_sources: int = 0
+    processing_sources: int = 0
+    completed_sources: int = 0
+    failed_sources: int = 0
+    total_chunks: int = 0
+    processed_chunks: int = 0
+    entities_extracted: int = 0
+    relationships_extracted: int = 0
+    percent_complete: float = 0.0
+
+
 # ============================================
 # CHAT SESSION MODELS
 # ============================================
@@ -290,6 +345,7 @@ class GraphVisualizationData(BaseModel):
 
     nodes: list[GraphVisualizationNode]
     edges: list[GraphVisualizationEdge]
+    truncated: bool = Field(False, description="Whether nodes were dropped to respect the node cap")
 
 
 class GraphStats(BaseModel):
@@ -6,6 +6,7 @@ from pydantic import ValidationError
 from packages.shared.models.age import (
     AgeVertex,
     AgeEdge,
+    AgePath,
     AgeRelationshipResult,
     EntityProperties,
     RelationshipProperties,
@@ -14,6 +15,7 @@ from packages.shared.models.age import (
     AgeParseError,
     parse_agtype_to_vertex,
     parse_agtype_to_edge,
+    parse_agtype_to_path,
     validate_entity_properties,
     validate_relationship_properties,
 )
@@ -351,6 +353,13 @@ class TestParseAgtypeToVertex:
         assert vertex.id == 123
         assert vertex.label == "Node"
 
+    def test_parse_vertex_keeps_annotations_inside_strings(self):
+        """Test that annotation text inside property strings is left intact."""
+        raw = '{"id": 1, "label": "Entity", "properties": {"name": "a::vertex b"}}::vertex'
+        vertex = parse_agtype_to_vertex(raw)
+
+        assert vertex.properties["name"] == "a::vertex b"
+
     def test_parse_vertex_invalid_json_raises_error(self):
         """Test that invalid JSON raises AgeParseError."""
         raw = '{"id": invalid}::vertex'
@@ -407,6 +416,16 @@ class TestParseAgtypeToEdge:
         assert isinstance(edge, AgeEdge)
         assert edge.properties["weight"] == 0.5
 
+    def test_parse_edge_keeps_annotations_inside_strings(self):
+        """Test that annotation text inside property strings is left intact."""
+        raw = (
+            '{"id": 10, "label": "R", "start_id": 1, "end_id": 2, '
+            '"properties": {"note": "x::edge"}}::edge'
+        )
+        edge = parse_agtype_to_edge(raw)
+
+        assert edge.properties["note"] == "x::edge"
+
     def test_parse_edge_invalid_json_raises_error(self):
         """Test that invalid JSON raises AgeParseError."""
         raw = '{"invalid json::edge'
@@ -426,6 +445,43 @@ class TestParseAgtypeToEdge:
         assert "failed validation" in str(exc_info.value)
 
 
+class TestParseAgtypeToPath:
+    """Test parse_agtype_to_path function."""
+
+    def test_parse_path_from_string(self):
+        """Test parsing a path alternating vertices and edges."""
+        raw = (
+            '[{"id": 1, "label": "Entity", "properties": {"name": "A"}}::vertex, '
+            '{"id": 10, "label": "RELATED_TO", "start_id": 1, "end_id": 2, '
+            '"properties": {}}::edge, '
+            '{"id": 2, "label": "Entity", "properties": {"name": "B"}}::vertex]::path'
+        )
+        path = parse_agtype_to_path(raw)
+
+        assert isinstance(path, AgePath)
+        assert [v.properties["name"] for v in path.vertices] == ["A", "B"]
+        assert path.edges[0].start_id == 1
+        assert path.length == 1
+
+    def test_parse_path_keeps_annotations_inside_strings(self):
+        """Test that annotation text inside property strings is left intact."""
+        raw = (
+            '[{"id": 1, "label": "Entity", "properties": {"name": "x}::vertex"}}::vertex, '
+            '{"id": 10, "label": "R", "start_id": 1, "end_id": 2, '
+            '"properties": {"note": "1.5::numeric"}}::edge, '
+            '{"id": 2, "label": "Entity", "properties": {"name": "B"}}::vertex]::path'
+        )
+        path = parse_agtype_to_path(raw)
+
+        assert path.vertices[0].properties["name"] == "x}::vertex"
+        assert path.edges[0].properties["note"] == "1.5::numeric"
+
+    def test_parse_path_not_a_list_raises_error(self):
+        """Test that non-list path data raises AgeParseError."""
+        with pytest.raises(AgeParseError):
+            parse_agtype_to_path('{"id": 1}::vertex')
+
+
 class TestValidateEntityProperties:
     """Test validate_entity_properties function."""
 
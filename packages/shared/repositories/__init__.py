@@ -6,6 +6,12 @@ from packages.shared.repositories.base import BaseRepository, GraphRepository, T
 from packages.shared.repositories.objectives import ObjectivesRepository
 from packages.shared.repositories.sources import SourcesRepository
 from packages.shared.repositories.chat import ChatSessionsRepository, ChatMessagesRepository
+from packages.shared.repositories.graph_stats import GraphStatsRepository
+from packages.shared.repositories.entity_names import EntityNamesRepository
+from packages.shared.repositories.llm_cache import LLMCacheRepository
+from packages.shared.repositories.chunk_extractions import ChunkExtractionsRepository
+from packages.shared.repositories.jobs import JobsRepository
+from packages.shared.repositories.source_chunks import SourceChunksRepository
 
 __all__ = [
     "BaseRepository",
@@ -15,4 +21,10 @@ __all__ = [
     "SourcesRepository",
     "ChatSessionsRepository",
     "ChatMessagesRepository",
+    "GraphStatsRepository",
+    "EntityNamesRepository",
+    "LLMCacheRepository",
+    "ChunkExtractionsRepository",
+    "JobsRepository",
+    "SourceChunksRepository",
 ]
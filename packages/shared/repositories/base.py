@@ -5,12 +5,14 @@ Base repository classes for KETA.
 import json
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Generic, Optional, TypeVar
+from typing import Any, Generic, Optional, Sequence, TypeVar
 from uuid import UUID
 
 import asyncpg
 
 from packages.shared.database import DatabasePool
+from packages.shared.agtype import properties_of
+from packages.shared.models.age import AgeColumnKind, validate_agtype_column
 
 T = TypeVar("T")
 
@@ -108,13 +110,16 @@ class TableRepository(BaseRepository[T], Generic[T]):
         """
         return await self.db_pool.fetchrow(query, *values)
 
-    async def update(self, id: UUID, data: dict[str, Any]) -> Optional[asyncpg.Record]:
+    async def update(
+        self, id: UUID, data: dict[str, Any], conn: Optional[asyncpg.Connection] = None
+    ) -> Optional[asyncpg.Record]:
         """
         Update a record by ID.
 
         Args:
             id: Record UUID
             data: Updated data
+            conn: Connection with an open transaction (optional)
 
         Returns:
             Updated record or None if not found
@@ -131,20 +136,26 @@ class TableRepository(BaseRepository[T], Generic[T]):
             WHERE id = $1
             RETURNING *
         """
-        return await self.db_pool.fetchrow(query, *values)
+        if conn is None:
+            return await self.db_pool.fetchrow(query, *values)
+        return await conn.fetchrow(query, *values)
 
-    async def delete(self, id: UUID) -> bool:
+    async def delete(self, id: UUID, conn: Optional[asyncpg.Connection] = None) -> bool:
         """
         Delete a record by ID.
 
         Args:
             id: Record UUID
+            conn: Connection with an open transaction (optional)
 
         Returns:
             True if deleted, False if not found
         """
         query = f"DELETE FROM keta.{self.table_name} WHERE id = $1"
-        result = await self.db_pool.execute(query, id)
+        if conn is None:
+            result = await self.db_pool.execute(query, id)
+        else:
+            result = await conn.execute(query, id)
         return result == "DELETE 1"
 
     async def count(self, where_clause: str = "", params: list = None) -> int:
@@ -273,13 +284,21 @@ class GraphRepository(BaseRepository[T], Generic[T]):
                 raise
             return None
 
-    async def execute_cypher(self, cypher_query: str, parse_results: bool = True) -> list:
+    async def execute_cypher(
+        self,
+        cypher_query: str,
+        parse_results: bool = True,
+        params: Optional[dict[str, Any]] = None,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> list:
         """
         Execute a Cypher query.
 
         Args:
-            cypher_query: Cypher query string
+            cypher_query: Cypher query string, referencing parameters as $name
             parse_results: Whether to parse agtype results
+            params: Parameter map passed to AGE as agtype
+            conn: Connection to run on (optional, acquires from the pool if not provided)
 
         Returns:
             Query results
@@ -287,7 +306,9 @@ class GraphRepository(BaseRepository[T], Generic[T]):
         logger = logging.getLogger(__name__)
         logger.debug(f"[GraphRepo] Executing Cypher on graph '{self.graph_name}':\n{cypher_query}")
         
-        results = await self.db_pool.execute_cypher(self.graph_name, cypher_query)
+        results = await self.db_pool.execute_cypher(
+            self.graph_name, cypher_query, params, conn=conn
+        )
         logger.debug(f"[GraphRepo] Query returned {len(results)} raw results")
         
         if parse_results and results:
@@ -298,7 +319,13 @@ class GraphRepository(BaseRepository[T], Generic[T]):
                 row_dict = dict(row)
 
                 if 'result' in row_dict:
-                    properties = self._parse_agtype(row_dict['result'])
+                    value = row_dict['result']
+                    # Values are normally decoded by the pool's agtype codec;
+                    # raw text is still accepted for connections without it
+                    if isinstance(value, str):
+                        properties = self._parse_agtype(value)
+                    else:
+                        properties = properties_of(value)
                     if properties:
                         parsed_results.append(properties)
                     else:
@@ -321,6 +348,46 @@ class GraphRepository(BaseRepository[T], Generic[T]):
             return parsed_results
         return results
 
+    async def execute_cypher_rows(
+        self,
+        cypher_query: str,
+        columns: Sequence[tuple[str, AgeColumnKind]],
+        params: Optional[dict[str, Any]] = None,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> list[tuple]:
+        """
+        Execute a Cypher query returning several typed columns.
+
+        Each row is decoded into a tuple in column order: vertices as AgeVertex,
+        edges as AgeEdge, paths as AgePath and everything else as native Python
+        values (so count(*) comes back as int).
+
+        Args:
+            cypher_query: Cypher query string whose RETURN matches the column list
+            columns: (name, kind) pairs describing each returned column
+            params: Parameter map passed to AGE as agtype
+            conn: Connection to run on (optional, acquires from the pool if not provided)
+
+        Returns:
+            List of decoded row tuples
+
+        Raises:
+            AgeParseError: If a value does not match its declared kind
+        """
+        logger = logging.getLogger(__name__)
+        logger.debug(f"[GraphRepo] Executing Cypher on graph '{self.graph_name}':\n{cypher_query}")
+
+        names = [name for name, _ in columns]
+        kinds = [AgeColumnKind(kind) for _, kind in columns]
+        records = await self.db_pool.execute_cypher(
+            self.graph_name, cypher_query, params, columns=names, conn=conn
+        )
+
+        return [
+            tuple(validate_agtype_column(record[i], kind) for i, kind in enumerate(kinds))
+            for record in records
+        ]
+
     async def get_by_id(self, id: UUID) -> Optional[T]:
         """
         Get a node by ID.
@@ -331,11 +398,11 @@ class GraphRepository(BaseRepository[T], Generic[T]):
         Returns:
             Node or None
         """
-        cypher = f"""
-            MATCH (n {{id: '{id}'}})
+        cypher = """
+            MATCH (n {id: $id})
             RETURN n
         """
-        results = await self.execute_cypher(cypher)
+        results = await self.execute_cypher(cypher, params={"id": str(id)})
         return results[0] if results else None
 
     async def create(self, data: dict[str, Any]) -> T:
@@ -361,13 +428,15 @@ class GraphRepository(BaseRepository[T], Generic[T]):
         Returns:
             Updated node or None
         """
-        set_clause = ", ".join(f"n.{key} = '{value}'" for key, value in data.items())
+        set_clause = ", ".join(f"n.{key} = $p_{key}" for key in data)
         cypher = f"""
-            MATCH (n {{id: '{id}'}})
+            MATCH (n {{id: $id}})
             SET {set_clause}
             RETURN n
         """
-        results = await self.execute_cypher(cypher)
+        params = {f"p_{key}": value for key, value in data.items()}
+        params["id"] = str(id)
+        results = await self.execute_cypher(cypher, params=params)
         return results[0] if results else None
 
     async def delete(self, id: UUID) -> bool:
@@ -380,10 +449,12 @@ class GraphRepository(BaseRepository[T], Generic[T]):
         Returns:
             True if deleted, False otherwise
         """
-        cypher = f"""
-            MATCH (n {{id: '{id}'}})
+        cypher = """
+            MATCH (n {id: $id})
             DETACH DELETE n
             RETURN count(n) as deleted
         """
-        results = await self.execute_cypher(cypher)
-        return results[0].get("deleted", 0) > 0 if results else False
+        rows = await self.execute_cypher_rows(
+            cypher, [("deleted", AgeColumnKind.SCALAR)], params={"id": str(id)}
+        )
+        return rows[0][0] > 0 if rows else False
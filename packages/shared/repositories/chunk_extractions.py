@@ -0,0 +1,130 @@
+"""
+Chunk extractions repository implementation.
+"""
+
+from typing import Any, Optional
+
+import asyncpg
+
+from packages.shared.database import DatabasePool
+
+
+class ChunkExtractionsRepository:
+    """
+    Repository for the chunk_extractions table.
+
+    Holds the entities and relationships extracted from each chunk, keyed by
+    the chunk's content hash, the extraction mode, and the model and prompt
+    hash of the extractors that produced them.
+    """
+
+    def __init__(self, db_pool: DatabasePool) -> None:
+        self.db_pool = db_pool
+
+    async def get_many(
+        self, chunk_hashes: list[str], extraction_mode: str, model: str, prompt_hash: str
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Fetch extractions to reuse and record their reuse.
+
+        Args:
+            chunk_hashes: Chunk content hashes
+            extraction_mode: Extraction mode the results must come from
+            model: Model the results must come from
+            prompt_hash: Hash of the extractors' prompts the results must come from
+
+        Returns:
+            Mapping of chunk hash to {"entities", "relationships"} for known chunks
+        """
+        if not chunk_hashes:
+            return {}
+
+        query = """
+            UPDATE keta.chunk_extractions
+            SET reuse_count = reuse_count + 1, last_used_at = NOW()
+            WHERE chunk_hash = ANY($1::text[])
+              AND extraction_mode = $2 AND model = $3 AND prompt_hash = $4
+            RETURNING chunk_hash, entities, relationships
+        """
+        records = await self.db_pool.fetch(
+            query, list(set(chunk_hashes)), extraction_mode, model, prompt_hash
+        )
+        return {
+            r["chunk_hash"]: {"entities": r["entities"], "relationships": r["relationships"]}
+            for r in records
+        }
+
+    async def get_latest(
+        self, chunk_hashes: list[str], extraction_mode: str
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Fetch the most recently used extraction of each chunk, from any model.
+
+        For bookkeeping reads that need what a checkpointed chunk was extracted
+        as, even if the model or prompts have changed since; not counted as reuse.
+
+        Args:
+            chunk_hashes: Chunk content hashes
+            extraction_mode: Extraction mode the results must come from
+
+        Returns:
+            Mapping of chunk hash to {"entities", "relationships"} for known chunks
+        """
+        if not chunk_hashes:
+            return {}
+
+        query = """
+            SELECT DISTINCT ON (chunk_hash) chunk_hash, entities, relationships
+            FROM keta.chunk_extractions
+            WHERE chunk_hash = ANY($1::text[]) AND extraction_mode = $2
+            ORDER BY chunk_hash, last_used_at DESC
+        """
+        records = await self.db_pool.fetch(query, list(set(chunk_hashes)), extraction_mode)
+        return {
+            r["chunk_hash"]: {"entities": r["entities"], "relationships": r["relationships"]}
+            for r in records
+        }
+
+    async def put_many(
+        self,
+        extractions: dict[str, dict[str, Any]],
+        extraction_mode: str,
+        model: str,
+        prompt_hash: str,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> None:
+        """
+        Store extractions; a chunk stored concurrently under the same key wins.
+
+        Args:
+            extractions: Mapping of chunk hash to {"entities", "relationships"}
+            extraction_mode: Extraction mode that produced the results
+            model: Model that produced the results
+            prompt_hash: Hash of the provider, temperature and extractor prompts
+            conn: Connection with an open transaction (optional)
+        """
+        if not extractions:
+            return
+
+        query = """
+            INSERT INTO keta.chunk_extractions
+                (chunk_hash, extraction_mode, model, prompt_hash, entities, relationships)
+            VALUES ($1, $2, $3, $4, $5, $6)
+            ON CONFLICT (chunk_hash, extraction_mode, model, prompt_hash) DO NOTHING
+        """
+        args = [
+            (
+                chunk_hash,
+                extraction_mode,
+                model,
+                prompt_hash,
+                result["entities"],
+                result["relationships"],
+            )
+            for chunk_hash, result in extractions.items()
+        ]
+        if conn is None:
+            async with self.db_pool.acquire() as conn:
+                await conn.executemany(query, args)
+        else:
+            await conn.executemany(query, args)
@@ -0,0 +1,189 @@
+"""
+Entity name index repository implementation.
+"""
+
+from typing import Any, Optional
+from uuid import UUID
+
+import asyncpg
+
+from packages.shared.database import DatabasePool
+from packages.shared.models import NameMatch
+
+
+def _like_escape(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class EntityNamesRepository:
+    """
+    Repository for the entity_names table.
+
+    Mirrors the name, type and objective_ids of every Entity vertex so name
+    searches run on a pg_trgm index instead of scanning the label table. The
+    graph write paths update it on the connection of their own transaction.
+    """
+
+    def __init__(self, db_pool: DatabasePool) -> None:
+        self.db_pool = db_pool
+
+    async def upsert(
+        self,
+        entities: list[dict[str, Any]],
+        objective_id: Optional[UUID] = None,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> None:
+        """
+        Insert entities or add the objective to existing ones.
+
+        Existing rows keep their name and type, matching the graph's MERGE.
+
+        Args:
+            entities: Dicts with id, name and type
+            objective_id: Objective to add to objective_ids (optional)
+            conn: Connection with an open transaction (optional)
+        """
+        if not entities:
+            return
+
+        query = """
+            INSERT INTO keta.entity_names (entity_id, name, entity_type, objective_ids)
+            SELECT t.entity_id, t.name, t.entity_type,
+                   CASE WHEN $4::uuid IS NULL THEN '{}'::uuid[] ELSE ARRAY[$4::uuid] END
+            FROM unnest($1::uuid[], $2::text[], $3::text[]) AS t(entity_id, name, entity_type)
+            ON CONFLICT (entity_id) DO UPDATE
+            SET objective_ids = CASE
+                    WHEN $4::uuid IS NULL OR $4::uuid = ANY(keta.entity_names.objective_ids)
+                        THEN keta.entity_names.objective_ids
+                    ELSE array_append(keta.entity_names.objective_ids, $4::uuid)
+                END
+        """
+        args = (
+            [UUID(str(e["id"])) for e in entities],
+            [e["name"] for e in entities],
+            [e["type"] for e in entities],
+            objective_id,
+        )
+        if conn is None:
+            await self.db_pool.execute(query, *args)
+        else:
+            await conn.execute(query, *args)
+
+    async def set_objectives(
+        self,
+        objective_ids_by_entity: dict[str, list[str]],
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> None:
+        """
+        Overwrite objective_ids, e.g. after a source was removed.
+
+        Args:
+            objective_ids_by_entity: Objective UUID strings per entity UUID string
+            conn: Connection with an open transaction (optional)
+        """
+        if not objective_ids_by_entity:
+            return
+
+        # One (entity, objective) pair per objective; a NULL objective keeps entities
+        # left without objectives in the aggregate
+        no_objective: list[Optional[str]] = [None]
+        pairs = [
+            (entity_id, objective_id)
+            for entity_id, objective_ids in objective_ids_by_entity.items()
+            for objective_id in objective_ids or no_objective
+        ]
+        query = """
+            UPDATE keta.entity_names AS n
+            SET objective_ids = agg.objective_ids
+            FROM (
+                SELECT t.entity_id,
+                       coalesce(
+                           array_agg(t.objective_id) FILTER (WHERE t.objective_id IS NOT NULL),
+                           '{}'
+                       ) AS objective_ids
+                FROM unnest($1::uuid[], $2::uuid[]) AS t(entity_id, objective_id)
+                GROUP BY t.entity_id
+            ) AS agg
+            WHERE n.entity_id = agg.entity_id
+        """
+        args = (
+            [UUID(entity_id) for entity_id, _ in pairs],
+            [UUID(objective_id) if objective_id else None for _, objective_id in pairs],
+        )
+        if conn is None:
+            await self.db_pool.execute(query, *args)
+        else:
+            await conn.execute(query, *args)
+
+    async def delete(
+        self, entity_ids: list[str], conn: Optional[asyncpg.Connection] = None
+    ) -> None:
+        """
+        Remove entities from the index.
+
+        Args:
+            entity_ids: Entity UUID strings
+            conn: Connection with an open transaction (optional)
+        """
+        if not entity_ids:
+            return
+
+        query = "DELETE FROM keta.entity_names WHERE entity_id = ANY($1::uuid[])"
+        args = ([UUID(entity_id) for entity_id in entity_ids],)
+        if conn is None:
+            await self.db_pool.execute(query, *args)
+        else:
+            await conn.execute(query, *args)
+
+    async def search(
+        self,
+        term: str,
+        match: NameMatch = NameMatch.SUBSTRING,
+        objective_id: Optional[UUID] = None,
+        entity_type: Optional[str] = None,
+        limit: int = 10,
+    ) -> list[tuple[str, float]]:
+        """
+        Find entities by name, best matches first.
+
+        SUBSTRING and PREFIX use case-insensitive LIKE, FUZZY uses the pg_trgm
+        similarity operator; all three are served by the trigram index and
+        ranked by trigram similarity to the term.
+
+        Args:
+            term: Search term
+            match: How the term is matched
+            objective_id: Only entities of this objective (optional)
+            entity_type: Only entities of this type (optional)
+            limit: Maximum number of results
+
+        Returns:
+            List of (entity UUID string, similarity) tuples
+        """
+        conditions: list[str] = []
+        args: list[Any] = [term.lower()]
+        if match == NameMatch.FUZZY:
+            conditions.append("lower(name) % $1")
+        else:
+            pattern = _like_escape(term.lower()) + "%"
+            if match == NameMatch.SUBSTRING:
+                pattern = "%" + pattern
+            args.append(pattern)
+            conditions.append(f"lower(name) LIKE ${len(args)}")
+        if objective_id:
+            args.append([objective_id])
+            conditions.append(f"objective_ids @> ${len(args)}::uuid[]")
+        if entity_type:
+            args.append(entity_type)
+            conditions.append(f"entity_type = ${len(args)}")
+        args.append(limit)
+
+        query = f"""
+            SELECT entity_id::text AS entity_id, similarity(lower(name), $1) AS score
+            FROM keta.entity_names
+            WHERE {" AND ".join(conditions)}
+            ORDER BY score DESC, name
+            LIMIT ${len(args)}
+        """
+        records = await self.db_pool.fetch(query, *args)
+        return [(r["entity_id"], r["score"]) for r in records]
@@ -0,0 +1,131 @@
+"""
+Graph statistics repository implementation.
+"""
+
+from typing import Optional
+from uuid import UUID
+
+import asyncpg
+
+from packages.shared.database import DatabasePool
+from packages.shared.models.age import GraphStatistics
+
+ENTITY = "ENTITY"
+RELATIONSHIP = "RELATIONSHIP"
+
+
+class GraphStatsRepository:
+    """
+    Repository for the graph_stats table.
+
+    Holds per-objective entity and relationship counts by type. The graph write
+    paths apply deltas on the connection of their own transaction, so the counts
+    commit or roll back together with the graph change.
+    """
+
+    def __init__(self, db_pool: DatabasePool) -> None:
+        self.db_pool = db_pool
+
+    async def apply_deltas(
+        self,
+        objective_id: UUID,
+        element_kind: str,
+        deltas: dict[str, int],
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> None:
+        """
+        Add signed per-type deltas to an objective's counts.
+
+        Args:
+            objective_id: Objective UUID
+            element_kind: ENTITY or RELATIONSHIP
+            deltas: Count change per entity or relationship type
+            conn: Connection with an open transaction (optional)
+        """
+        deltas = {element_type: delta for element_type, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        query = """
+            INSERT INTO keta.graph_stats (objective_id, element_kind, element_type, element_count)
+            SELECT $1, $2, t.element_type, t.delta
+            FROM unnest($3::text[], $4::bigint[]) AS t(element_type, delta)
+            ON CONFLICT (objective_id, element_kind, element_type) DO UPDATE
+            SET element_count = GREATEST(
+                    keta.graph_stats.element_count + EXCLUDED.element_count, 0
+                ),
+                updated_at = NOW()
+        """
+        args = (objective_id, element_kind, list(deltas.keys()), list(deltas.values()))
+        if conn is None:
+            await self.db_pool.execute(query, *args)
+        else:
+            await conn.execute(query, *args)
+
+    async def get_objective_stats(self, objective_id: UUID) -> GraphStatistics:
+        """
+        Read an objective's counts.
+
+        Args:
+            objective_id: Objective UUID
+
+        Returns:
+            GraphStatistics with totals and per-type counts
+        """
+        query = """
+            SELECT element_kind, element_type, element_count
+            FROM keta.graph_stats
+            WHERE objective_id = $1 AND element_count > 0
+        """
+        records = await self.db_pool.fetch(query, objective_id)
+
+        entity_type_counts = {
+            r["element_type"]: r["element_count"] for r in records if r["element_kind"] == ENTITY
+        }
+        relationship_type_counts = {
+            r["element_type"]: r["element_count"]
+            for r in records
+            if r["element_kind"] == RELATIONSHIP
+        }
+        return GraphStatistics(
+            entity_count=sum(entity_type_counts.values()),
+            relationship_count=sum(relationship_type_counts.values()),
+            entity_type_counts=entity_type_counts,
+            relationship_type_counts=relationship_type_counts,
+        )
+
+    async def replace_objective_stats(
+        self,
+        objective_id: UUID,
+        stats: GraphStatistics,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> None:
+        """
+        Overwrite an objective's counts, e.g. with counts recomputed from the graph.
+
+        Args:
+            objective_id: Objective UUID
+            stats: Counts to store
+            conn: Connection with an open transaction (optional, opens one if not provided)
+        """
+        if conn is None:
+            async with self.db_pool.transaction() as conn:
+                return await self.replace_objective_stats(objective_id, stats, conn)
+
+        rows = [
+            (objective_id, ENTITY, element_type, count)
+            for element_type, count in stats.entity_type_counts.items()
+        ] + [
+            (objective_id, RELATIONSHIP, element_type, count)
+            for element_type, count in stats.relationship_type_counts.items()
+        ]
+        await conn.execute("DELETE FROM keta.graph_stats WHERE objective_id = $1", objective_id)
+        if rows:
+            await conn.executemany(
+                """
+                INSERT INTO keta.graph_stats
+                    (objective_id, element_kind, element_type, element_count)
+                VALUES ($1, $2, $3, $4)
+                """,
+                rows,
+            )
@@ -0,0 +1,204 @@
+"""
+Jobs repository implementation.
+"""
+
+from typing import Any, Optional
+from uuid import UUID
+
+import asyncpg
+
+from packages.shared.database import DatabasePool
+from packages.shared.repositories.base import TableRepository
+
+EXTRACT_SOURCE = "extract_source"
+
+
+class JobsRepository(TableRepository):
+    """
+    Repository for the jobs table.
+
+    Workers claim queued jobs with FOR UPDATE SKIP LOCKED, so any number of
+    them can poll the table without handing out a job twice. A claim is a
+    lease: the worker extends it with heartbeats, and a RUNNING job whose lease
+    expired is claimable again. Every claim counts as an attempt. Runnable
+    jobs are claimed lowest priority value first, then oldest first.
+    """
+
+    def __init__(self, db_pool: DatabasePool) -> None:
+        super().__init__(db_pool, "jobs")
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: dict[str, Any],
+        max_attempts: int = 3,
+        priority: int = 0,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> Optional[asyncpg.Record]:
+        """
+        Queue a job, unless one of the same kind is already active for its source.
+
+        Args:
+            kind: Job kind, e.g. EXTRACT_SOURCE
+            payload: JSON-serializable job arguments
+            max_attempts: Claims after which a failing job is given up
+            priority: Lower is claimed first
+            conn: Connection with an open transaction (optional)
+
+        Returns:
+            Created job record, or None if a QUEUED or RUNNING job exists for the
+            payload's source_id
+        """
+        query = """
+            INSERT INTO keta.jobs (kind, payload, max_attempts, priority)
+            VALUES ($1, $2, $3, $4)
+            ON CONFLICT DO NOTHING
+            RETURNING *
+        """
+        if conn is None:
+            return await self.db_pool.fetchrow(query, kind, payload, max_attempts, priority)
+        return await conn.fetchrow(query, kind, payload, max_attempts, priority)
+
+    async def enqueue_many(
+        self,
+        kind: str,
+        jobs: list[tuple[dict[str, Any], int]],
+        max_attempts: int = 3,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> list[asyncpg.Record]:
+        """
+        Queue jobs of one kind in a single statement.
+
+        Args:
+            kind: Job kind, e.g. EXTRACT_SOURCE
+            jobs: (payload, priority) pairs
+            max_attempts: Claims after which a failing job is given up
+            conn: Connection with an open transaction (optional)
+
+        Returns:
+            Created job records; sources with an active job are skipped
+        """
+        if not jobs:
+            return []
+
+        query = """
+            INSERT INTO keta.jobs (kind, payload, max_attempts, priority)
+            SELECT $1, j.payload, $3, j.priority
+            FROM unnest($2::jsonb[], $4::bigint[]) AS j(payload, priority)
+            ON CONFLICT DO NOTHING
+            RETURNING *
+        """
+        payloads = [payload for payload, _ in jobs]
+        priorities = [priority for _, priority in jobs]
+        if conn is None:
+            return await self.db_pool.fetch(query, kind, payloads, max_attempts, priorities)
+        records: list[asyncpg.Record] = await conn.fetch(
+            query, kind, payloads, max_attempts, priorities
+        )
+        return records
+
+    async def claim(self, worker_id: str, lease_seconds: int) -> Optional[asyncpg.Record]:
+        """
+        Claim the runnable job with the lowest priority value, oldest first.
+
+        Runnable are QUEUED jobs due to run and RUNNING jobs whose lease expired.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+            lease_seconds: Lease length
+
+        Returns:
+            Claimed job record or None if there is nothing to do
+        """
+        query = """
+            UPDATE keta.jobs
+            SET status = 'RUNNING',
+                attempts = attempts + 1,
+                locked_by = $1,
+                locked_until = NOW() + make_interval(secs => $2),
+                heartbeat_at = NOW(),
+                updated_at = NOW()
+            WHERE id = (
+                SELECT id FROM keta.jobs
+                WHERE (status = 'QUEUED' AND run_after <= NOW())
+                   OR (status = 'RUNNING' AND locked_until < NOW())
+                ORDER BY priority, run_after, created_at
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING *
+        """
+        return await self.db_pool.fetchrow(query, worker_id, float(lease_seconds))
+
+    async def heartbeat(self, job_id: UUID, worker_id: str, lease_seconds: int) -> bool:
+        """
+        Extend a job's lease.
+
+        Args:
+            job_id: Job UUID
+            worker_id: Worker holding the lease
+            lease_seconds: New lease length from now
+
+        Returns:
+            False if the worker no longer holds the lease
+        """
+        query = """
+            UPDATE keta.jobs
+            SET locked_until = NOW() + make_interval(secs => $3),
+                heartbeat_at = NOW(),
+                updated_at = NOW()
+            WHERE id = $1 AND locked_by = $2 AND status = 'RUNNING'
+        """
+        result = await self.db_pool.execute(query, job_id, worker_id, float(lease_seconds))
+        return result == "UPDATE 1"
+
+    async def complete(self, job_id: UUID, worker_id: str) -> bool:
+        """
+        Mark a job SUCCEEDED.
+
+        Args:
+            job_id: Job UUID
+            worker_id: Worker holding the lease
+
+        Returns:
+            False if the worker no longer holds the lease
+        """
+        query = """
+            UPDATE keta.jobs
+            SET status = 'SUCCEEDED', locked_by = NULL, locked_until = NULL,
+                finished_at = NOW(), updated_at = NOW()
+            WHERE id = $1 AND locked_by = $2 AND status = 'RUNNING'
+        """
+        return await self.db_pool.execute(query, job_id, worker_id) == "UPDATE 1"
+
+    async def fail(
+        self, job_id: UUID, worker_id: str, error: str, retry_delay_seconds: float
+    ) -> Optional[str]:
+        """
+        Record a failed attempt; requeue the job unless it is out of attempts.
+
+        Args:
+            job_id: Job UUID
+            worker_id: Worker holding the lease
+            error: Error message
+            retry_delay_seconds: Delay before the job is runnable again
+
+        Returns:
+            New status (QUEUED or FAILED), or None if the worker no longer holds the lease
+        """
+        query = """
+            UPDATE keta.jobs
+            SET status = CASE WHEN attempts < max_attempts THEN 'QUEUED' ELSE 'FAILED' END,
+                run_after = NOW() + make_interval(secs => $4),
+                finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE NOW() END,
+                locked_by = NULL,
+                locked_until = NULL,
+                last_error = $3,
+                updated_at = NOW()
+            WHERE id = $1 AND locked_by = $2 AND status = 'RUNNING'
+            RETURNING status
+        """
+        status: Optional[str] = await self.db_pool.fetchval(
+            query, job_id, worker_id, error, float(retry_delay_seconds)
+        )
+        return status
@@ -0,0 +1,121 @@
+"""
+LLM response cache repository implementation.
+"""
+
+import json
+from typing import Any, Optional
+
+from packages.shared.database import DatabasePool
+
+
+class LLMCacheRepository:
+    """
+    Repository for the llm_cache table.
+
+    Stores structured LLM outputs under a content hash computed by the caller.
+    Reads bump the entry's hit count and recency and count the hit or miss in
+    llm_cache_counters; eviction drops the least recently used entries once the
+    table outgrows a byte budget.
+    """
+
+    def __init__(self, db_pool: DatabasePool) -> None:
+        self.db_pool = db_pool
+
+    async def get(self, cache_key: str) -> Optional[dict[str, Any]]:
+        """
+        Look up a cached response and record the hit or miss.
+
+        Args:
+            cache_key: Content hash of the request
+
+        Returns:
+            Cached response or None on a miss
+        """
+        query = """
+            WITH hit AS (
+                UPDATE keta.llm_cache
+                SET hit_count = hit_count + 1, last_used_at = NOW()
+                WHERE cache_key = $1
+                RETURNING response
+            ), counted AS (
+                UPDATE keta.llm_cache_counters
+                SET hits = hits + (SELECT COUNT(*) FROM hit),
+                    misses = misses + 1 - (SELECT COUNT(*) FROM hit)
+            )
+            SELECT response FROM hit
+        """
+        response: Optional[dict[str, Any]] = await self.db_pool.fetchval(query, cache_key)
+        return response
+
+    async def put(
+        self,
+        cache_key: str,
+        provider: str,
+        model: str,
+        prompt_hash: str,
+        response: dict[str, Any],
+    ) -> None:
+        """
+        Store a response; an entry written concurrently under the same key wins.
+
+        Args:
+            cache_key: Content hash of the request
+            provider: LLM provider the response came from
+            model: Model name
+            prompt_hash: Hash of the prompt template and output schema
+            response: Structured output as a JSON-serializable dict
+        """
+        query = """
+            INSERT INTO keta.llm_cache
+                (cache_key, provider, model, prompt_hash, response, size_bytes)
+            VALUES ($1, $2, $3, $4, $5, $6)
+            ON CONFLICT (cache_key) DO NOTHING
+        """
+        size_bytes = len(json.dumps(response).encode())
+        await self.db_pool.execute(
+            query, cache_key, provider, model, prompt_hash, response, size_bytes
+        )
+
+    async def evict(self, max_bytes: int) -> int:
+        """
+        Delete least recently used entries until the total size fits max_bytes.
+
+        Args:
+            max_bytes: Size budget for all cached responses
+
+        Returns:
+            Number of deleted entries
+        """
+        query = """
+            WITH ranked AS (
+                SELECT cache_key,
+                       SUM(size_bytes) OVER (ORDER BY last_used_at DESC, cache_key) AS running_bytes
+                FROM keta.llm_cache
+            )
+            DELETE FROM keta.llm_cache AS c
+            USING ranked
+            WHERE c.cache_key = ranked.cache_key AND ranked.running_bytes > $1
+        """
+        result = await self.db_pool.execute(query, max_bytes)
+        return int(result.split()[-1])
+
+    async def get_stats(self) -> dict[str, Any]:
+        """
+        Summarize the stored entries and the lookups of all workers.
+
+        Returns:
+            Dictionary with entries, size_bytes, hits, misses and hit_rate
+        """
+        query = """
+            SELECT (SELECT COUNT(*) FROM keta.llm_cache) AS entries,
+                   (SELECT COALESCE(SUM(size_bytes), 0) FROM keta.llm_cache) AS size_bytes,
+                   COALESCE(SUM(hits), 0) AS hits,
+                   COALESCE(SUM(misses), 0) AS misses
+            FROM keta.llm_cache_counters
+        """
+        # An aggregate without GROUP BY always returns one row
+        records = await self.db_pool.fetch(query)
+        stats = dict(records[0])
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
@@ -36,13 +36,31 @@ class ObjectivesRepository(TableRepository):
         """
         Get statistics for an objective.
 
+        Reads the trigger-maintained objective_counters row, so the cost does not
+        grow with the number of sources, sessions or messages.
+
         Args:
             objective_id: Objective UUID
 
         Returns:
             Statistics record or None
         """
-        query = "SELECT * FROM keta.objective_stats WHERE id = $1"
+        query = """
+            SELECT
+                o.id, o.name, o.status,
+                oc.source_count, oc.completed_sources, oc.failed_sources,
+                oc.session_count, oc.message_count,
+                oc.last_processed_at, oc.last_chat_at,
+                COALESCE(SUM(gs.element_count) FILTER (WHERE gs.element_kind = 'ENTITY'), 0)
+                    AS entity_count,
+                COALESCE(SUM(gs.element_count) FILTER (WHERE gs.element_kind = 'RELATIONSHIP'), 0)
+                    AS relationship_count
+            FROM keta.objectives o
+            JOIN keta.objective_counters oc ON oc.objective_id = o.id
+            LEFT JOIN keta.graph_stats gs ON gs.objective_id = o.id
+            WHERE o.id = $1
+            GROUP BY o.id, oc.objective_id
+        """
         return await self.db_pool.fetchrow(query, objective_id)
 
     async def list_by_status(
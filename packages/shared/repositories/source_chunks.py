@@ -0,0 +1,121 @@
+"""
+Source chunks repository implementation.
+"""
+
+from typing import Any, Optional
+from uuid import UUID
+
+import asyncpg
+
+from packages.shared.database import DatabasePool
+
+CHUNK_COMPLETED = "COMPLETED"
+CHUNK_FAILED = "FAILED"
+
+
+class SourceChunksRepository:
+    """
+    Repository for the source_chunks table.
+
+    One checkpoint per chunk of a source, written in the transaction that
+    writes the chunk to the knowledge graph. A COMPLETED chunk's results are
+    in the graph and, if it had any, in chunk_extractions under its hash and
+    extraction mode; a FAILED chunk is extracted again by the next run.
+    """
+
+    def __init__(self, db_pool: DatabasePool) -> None:
+        self.db_pool = db_pool
+
+    async def get_completed(self, source_id: UUID) -> dict[str, Optional[str]]:
+        """
+        Get the chunks of a source that are already in the knowledge graph.
+
+        Args:
+            source_id: Source UUID
+
+        Returns:
+            Mapping of chunk hash to the extraction mode it was extracted in
+        """
+        query = """
+            SELECT chunk_hash, extraction_mode
+            FROM keta.source_chunks
+            WHERE source_id = $1 AND status = 'COMPLETED'
+        """
+        records = await self.db_pool.fetch(query, source_id)
+        return {r["chunk_hash"]: r["extraction_mode"] for r in records}
+
+    async def record(
+        self,
+        source_id: UUID,
+        chunks: list[dict[str, Any]],
+        extraction_mode: str,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> None:
+        """
+        Record the outcome of extracting chunks.
+
+        Args:
+            source_id: Source UUID
+            chunks: Dicts with chunk_hash, chunk_index, status and error
+            extraction_mode: Extraction mode the chunks were extracted in
+            conn: Connection with an open transaction (optional)
+        """
+        if not chunks:
+            return
+
+        query = """
+            INSERT INTO keta.source_chunks
+                (source_id, chunk_hash, chunk_index, status, extraction_mode, error)
+            VALUES ($1, $2, $3, $4, $5, $6)
+            ON CONFLICT (source_id, chunk_hash) DO UPDATE
+            SET chunk_index = EXCLUDED.chunk_index,
+                status = EXCLUDED.status,
+                extraction_mode = EXCLUDED.extraction_mode,
+                error = EXCLUDED.error,
+                attempts = keta.source_chunks.attempts + 1,
+                updated_at = NOW()
+        """
+        args = [
+            (
+                source_id,
+                chunk["chunk_hash"],
+                chunk["chunk_index"],
+                chunk["status"],
+                extraction_mode,
+                chunk.get("error"),
+            )
+            for chunk in chunks
+        ]
+        if conn is None:
+            async with self.db_pool.acquire() as conn:
+                await conn.executemany(query, args)
+        else:
+            await conn.executemany(query, args)
+
+    async def delete(
+        self,
+        source_id: UUID,
+        chunk_hashes: Optional[list[str]] = None,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> None:
+        """
+        Delete checkpoints of a source.
+
+        Args:
+            source_id: Source UUID
+            chunk_hashes: Chunks to forget (optional, defaults to all of them)
+            conn: Connection with an open transaction (optional)
+        """
+        if chunk_hashes is None:
+            query = "DELETE FROM keta.source_chunks WHERE source_id = $1"
+            args: tuple = (source_id,)
+        else:
+            query = """
+                DELETE FROM keta.source_chunks
+                WHERE source_id = $1 AND chunk_hash = ANY($2::text[])
+            """
+            args = (source_id, chunk_hashes)
+        if conn is None:
+            await self.db_pool.execute(query, *args)
+        else:
+            await conn.execute(query, *args)
@@ -2,7 +2,7 @@
 Sources repository implementation.
 """
 
-from typing import Optional
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
 import asyncpg
@@ -10,6 +10,9 @@ import asyncpg
 from packages.shared.database import DatabasePool
 from packages.shared.repositories.base import TableRepository
 
+# Characters of content read per query when streaming a source
+CONTENT_SLICE_CHARS = 4 * 1024 * 1024
+
 
 class SourcesRepository(TableRepository):
     """
@@ -97,6 +100,170 @@ class SourcesRepository(TableRepository):
 
         return await self.update(source_id, updates)
 
+    async def queue_source_for_extraction(
+        self, source_id: UUID, conn: Optional[asyncpg.Connection] = None
+    ) -> Optional[asyncpg.Record]:
+        """
+        Mark a source as queued for extraction unless it is already PROCESSING.
+
+        The source row is locked, so concurrent calls never queue it twice.
+
+        Args:
+            source_id: Source UUID
+            conn: Connection with an open transaction (optional)
+
+        Returns:
+            The source's previous_status and chunk_count, or None if it is
+            missing or already PROCESSING
+        """
+        query = """
+            UPDATE keta.sources s
+            SET extraction_status = 'PROCESSING',
+                extraction_progress = '{"current_stage": "queued"}'::jsonb
+            FROM (
+                SELECT id, extraction_status FROM keta.sources WHERE id = $1 FOR UPDATE
+            ) AS previous
+            WHERE s.id = previous.id AND previous.extraction_status <> 'PROCESSING'
+            RETURNING previous.extraction_status AS previous_status,
+                      cardinality(s.chunk_hashes) AS chunk_count
+        """
+        if conn is None:
+            return await self.db_pool.fetchrow(query, source_id)
+        return await conn.fetchrow(query, source_id)
+
+    async def queue_for_extraction(
+        self, objective_id: UUID, conn: Optional[asyncpg.Connection] = None
+    ) -> list[asyncpg.Record]:
+        """
+        Mark an objective's PENDING and FAILED sources as queued for extraction.
+
+        Sources already PROCESSING or COMPLETED are left alone, so concurrent
+        calls never queue a source twice.
+
+        Args:
+            objective_id: Objective UUID
+            conn: Connection with an open transaction (optional)
+
+        Returns:
+            The queued sources' id, metadata and chunk_count
+        """
+        query = """
+            UPDATE keta.sources
+            SET extraction_status = 'PROCESSING',
+                extraction_progress = '{"current_stage": "queued"}'::jsonb
+            WHERE objective_id = $1 AND extraction_status IN ('PENDING', 'FAILED')
+            RETURNING id, metadata, cardinality(chunk_hashes) AS chunk_count
+        """
+        if conn is None:
+            return await self.db_pool.fetch(query, objective_id)
+        records: list[asyncpg.Record] = await conn.fetch(query, objective_id)
+        return records
+
+    async def get_extraction_summary(self, objective_id: UUID) -> asyncpg.Record:
+        """
+        Aggregate extraction status and progress over an objective's sources.
+
+        Completed sources count all their chunks as processed; others count
+        what their extraction progress reports.
+
+        Args:
+            objective_id: Objective UUID
+
+        Returns:
+            Record with source counts by status and chunk, entity and
+            relationship totals
+        """
+        query = """
+            SELECT
+                COUNT(*) AS total_sources,
+                COUNT(*) FILTER (WHERE extraction_status = 'PENDING') AS pending_sources,
+                COUNT(*) FILTER (WHERE extraction_status = 'PROCESSING') AS processing_sources,
+                COUNT(*) FILTER (WHERE extraction_status = 'COMPLETED') AS completed_sources,
+                COUNT(*) FILTER (WHERE extraction_status = 'FAILED') AS failed_sources,
+                COALESCE(SUM(chunks.total), 0) AS total_chunks,
+                COALESCE(SUM(
+                    CASE WHEN extraction_status = 'COMPLETED' THEN chunks.total
+                         ELSE LEAST(chunks.processed, chunks.total) END
+                ), 0) AS processed_chunks,
+                COALESCE(SUM((extraction_progress->>'entities_extracted')::int), 0)
+                    AS entities_extracted,
+                COALESCE(SUM((extraction_progress->>'relationships_extracted')::int), 0)
+                    AS relationships_extracted
+            FROM keta.sources,
+                LATERAL (
+                    SELECT
+                        GREATEST(
+                            cardinality(chunk_hashes),
+                            COALESCE((extraction_progress->>'total_chunks')::int, 0)
+                        ) AS total,
+                        COALESCE((extraction_progress->>'processed_chunks')::int, 0) AS processed
+                ) AS chunks
+            WHERE objective_id = $1
+        """
+        return await self.db_pool.fetchrow(query, objective_id)
+
+    async def get_without_content(self, source_id: UUID) -> Optional[asyncpg.Record]:
+        """
+        Get a source without loading its content.
+
+        Args:
+            source_id: Source UUID
+
+        Returns:
+            Source record with every column but content, plus chunk_count, or None
+        """
+        query = """
+            SELECT id, objective_id, name, description, content_type, extraction_status,
+                   extraction_progress, extraction_error, uploaded_at, processed_at,
+                   metadata, content_hash, cardinality(chunk_hashes) AS chunk_count
+            FROM keta.sources
+            WHERE id = $1
+        """
+        return await self.db_pool.fetchrow(query, source_id)
+
+    async def get_content_slice(self, source_id: UUID, start: int, length: int) -> str:
+        """
+        Read part of a source's content.
+
+        Args:
+            source_id: Source UUID
+            start: Offset of the first character, from 0
+            length: Maximum number of characters
+
+        Returns:
+            The characters read, empty past the end of the content
+        """
+        query = """
+            SELECT substring(content FROM $2 FOR $3)
+            FROM keta.sources
+            WHERE id = $1
+        """
+        return await self.db_pool.fetchval(query, source_id, start + 1, length) or ""
+
+    async def iter_content(
+        self, source_id: UUID, slice_chars: int = CONTENT_SLICE_CHARS
+    ) -> AsyncIterator[str]:
+        """
+        Stream a source's content in consecutive slices.
+
+        Only one slice is in memory at a time, however large the source.
+
+        Args:
+            source_id: Source UUID
+            slice_chars: Characters per slice
+
+        Yields:
+            Slices of the content, in order
+        """
+        start = 0
+        while True:
+            text = await self.get_content_slice(source_id, start, slice_chars)
+            if text:
+                yield text
+            if len(text) < slice_chars:
+                return
+            start += slice_chars
+
     async def get_by_objective_and_name(
         self, objective_id: UUID, name: str
     ) -> Optional[asyncpg.Record]:
@@ -0,0 +1,108 @@
+"""Unit tests for the agtype codec."""
+import math
+
+from packages.shared.agtype import (
+    Edge,
+    Path,
+    Vertex,
+    decode_agtype,
+    encode_agtype,
+    properties_of,
+    to_plain,
+)
+from packages.shared.models.age import AgeColumnKind, AgeVertex, validate_agtype_column
+
+VERTEX = '{"id": 1, "label": "Entity", "properties": {"name": "Alice", "type": "PERSON"}}::vertex'
+EDGE = (
+    '{"id": 3, "label": "RELATED_TO", "end_id": 2, "start_id": 1, '
+    '"properties": {"weight": 1.5}}::edge'
+)
+VERTEX_2 = '{"id": 2, "label": "Entity", "properties": {"name": "Acme"}}::vertex'
+
+
+class TestDecodeAgtype:
+    """Tests for decode_agtype."""
+
+    def test_plain_values(self):
+        assert decode_agtype('"works_at"') == "works_at"
+        assert decode_agtype("42") == 42
+        assert decode_agtype("null") is None
+        assert decode_agtype('{"a": [1, 2]}') == {"a": [1, 2]}
+
+    def test_annotations_inside_strings_are_kept(self):
+        assert decode_agtype('{"description": "uses std::numeric_limits"}') == {
+            "description": "uses std::numeric_limits"
+        }
+        text = (
+            '[{"id": 1, "label": "Entity", '
+            '"properties": {"note": "a}::vertex \\" b]::path"}}::vertex,'
+            ' 1.5::numeric]'
+        )
+        assert decode_agtype(text) == [
+            Vertex(1, "Entity", {"note": 'a}::vertex " b]::path'}),
+            1.5,
+        ]
+
+    def test_vertex(self):
+        vertex = decode_agtype(VERTEX)
+        assert vertex == Vertex(1, "Entity", {"name": "Alice", "type": "PERSON"})
+
+    def test_edge(self):
+        edge = decode_agtype(EDGE)
+        assert isinstance(edge, Edge)
+        assert (edge.start_id, edge.end_id) == (1, 2)
+        assert edge.properties == {"weight": 1.5}
+
+    def test_path(self):
+        path = decode_agtype(f"[{VERTEX}, {EDGE}, {VERTEX_2}]::path")
+        assert isinstance(path, Path)
+        assert [v.id for v in path.vertices] == [1, 2]
+        assert [e.id for e in path.edges] == [3]
+
+    def test_nested_graph_objects(self):
+        value = decode_agtype(f'{{"source_entity": {VERTEX}, "relationship": {EDGE}}}')
+        assert isinstance(value["source_entity"], Vertex)
+        assert isinstance(value["relationship"], Edge)
+        assert "\x00agtype" not in value
+
+    def test_list_of_vertices(self):
+        value = decode_agtype(f"[{VERTEX}, {VERTEX_2}]")
+        assert [v.properties["name"] for v in value] == ["Alice", "Acme"]
+
+    def test_numeric(self):
+        assert decode_agtype("3.14::numeric") == 3.14
+        assert decode_agtype('{"total": 10::numeric}') == {"total": 10}
+
+    def test_special_floats(self):
+        assert math.isnan(decode_agtype("NaN"))
+        assert decode_agtype("-Infinity") == float("-inf")
+
+    def test_annotation_text_inside_strings(self):
+        value = decode_agtype('{"note": "a::b"}')
+        assert value == {"note": "a::b"}
+
+
+class TestHelpers:
+    """Tests for encode_agtype, to_plain and properties_of."""
+
+    def test_encode_round_trip(self):
+        params = {"name": "O'Brien", "ids": ["a", "b"], "confidence": 0.9}
+        assert decode_agtype(encode_agtype(params)) == params
+
+    def test_to_plain(self):
+        path = decode_agtype(f"[{VERTEX}, {EDGE}, {VERTEX_2}]::path")
+        plain = to_plain({"path": path})
+        assert plain["path"][1]["label"] == "RELATED_TO"
+        assert len(plain["path"]) == 3
+
+    def test_properties_of(self):
+        assert properties_of(decode_agtype(VERTEX)) == {"name": "Alice", "type": "PERSON"}
+        assert properties_of(decode_agtype(f'{{"e": {VERTEX}}}'))["e"]["id"] == 1
+        assert properties_of(decode_agtype("5")) is None
+
+    def test_validate_decoded_column(self):
+        vertex = validate_agtype_column(decode_agtype(VERTEX), AgeColumnKind.VERTEX)
+        assert isinstance(vertex, AgeVertex)
+        assert vertex.properties["name"] == "Alice"
+        assert validate_agtype_column("works_at", AgeColumnKind.SCALAR) == "works_at"
+        assert validate_agtype_column(None, AgeColumnKind.EDGE) is None
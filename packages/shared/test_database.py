@@ -0,0 +1,163 @@
+"""Unit tests for database pool session tracking and metrics."""
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+
+from packages.shared.agtype import encode_agtype
+from packages.shared.database import DatabasePool, PoolMetrics
+
+
+class FakeConnection:
+    """Minimal stand-in for an asyncpg connection."""
+
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self.executed: list[str] = []
+
+    def get_server_pid(self) -> int:
+        return self.pid
+
+    async def execute(self, query: str, *args) -> str:
+        self.executed.append(query)
+        return "OK"
+
+    async def fetch(self, query: str, *args) -> list:
+        self.executed.append(query)
+        self.last_args = args
+        return []
+
+
+class FakePool:
+    """Pool that always hands out the same connection."""
+
+    def __init__(self, conn: FakeConnection) -> None:
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+    def get_size(self) -> int:
+        return 1
+
+    def get_idle_size(self) -> int:
+        return 1
+
+
+@pytest.fixture
+def pool_with_conn():
+    conn = FakeConnection(pid=4242)
+    pool = DatabasePool()
+    pool._pool = FakePool(conn)
+    return pool, conn
+
+
+class TestSessionSetup:
+    """Test that AGE setup runs once per physical connection."""
+
+    async def test_setup_runs_on_first_acquire_only(self, pool_with_conn):
+        pool, conn = pool_with_conn
+
+        await pool.fetch("SELECT 1")
+        await pool.fetch("SELECT 2")
+        await pool.execute("SELECT 3")
+
+        setup_queries = [q for q in conn.executed if "LOAD 'age'" in q]
+        assert len(setup_queries) == 1
+        assert conn.executed[-1] == "SELECT 3"
+
+    async def test_setup_reruns_after_invalidate(self, pool_with_conn):
+        pool, conn = pool_with_conn
+
+        await pool.fetch("SELECT 1")
+        pool.invalidate_session(conn)
+        await pool.fetch("SELECT 2")
+
+        setup_queries = [q for q in conn.executed if "LOAD 'age'" in q]
+        assert len(setup_queries) == 2
+
+    async def test_reconnect_with_new_pid_runs_setup(self, pool_with_conn):
+        pool, conn = pool_with_conn
+
+        await pool.fetch("SELECT 1")
+        conn.pid = 4343
+        await pool.fetch("SELECT 2")
+
+        setup_queries = [q for q in conn.executed if "LOAD 'age'" in q]
+        assert len(setup_queries) == 2
+
+    async def test_metrics_record_acquire_setup_and_query(self, pool_with_conn):
+        pool, _ = pool_with_conn
+
+        await pool.fetch("SELECT 1")
+        await pool.fetch("SELECT 2")
+
+        timings = pool.get_metrics()["timings"]
+        assert timings["acquire_wait"]["count"] == 2
+        assert timings["setup"]["count"] == 1
+        assert timings["query"]["count"] == 2
+        assert pool.get_metrics()["age_sessions"] == 1
+
+
+class TestPoolMetrics:
+    """Test PoolMetrics aggregation."""
+
+    def test_snapshot_in_milliseconds(self):
+        metrics = PoolMetrics()
+        metrics.record("query", 0.002)
+        metrics.record("query", 0.004)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["query"]["count"] == 2
+        assert snapshot["query"]["total_ms"] == pytest.approx(6.0)
+        assert snapshot["query"]["avg_ms"] == pytest.approx(3.0)
+        assert snapshot["query"]["max_ms"] == pytest.approx(4.0)
+        assert snapshot["setup"]["count"] == 0
+        assert snapshot["setup"]["avg_ms"] == 0.0
+
+
+class TestParameterizedCypher:
+    """Test Cypher parameter passing."""
+
+    async def test_params_passed_as_third_cypher_argument(self, pool_with_conn):
+        pool, conn = pool_with_conn
+
+        await pool.execute_cypher("g", "MATCH (e {name: $name}) RETURN e", {"name": "O'Brien"})
+
+        assert "$$, $1) as (result agtype)" in conn.executed[-1]
+        assert "O'Brien" not in conn.executed[-1]
+        assert conn.last_args == ({"name": "O'Brien"},)
+
+    async def test_same_template_produces_identical_sql(self, pool_with_conn):
+        pool, conn = pool_with_conn
+
+        await pool.execute_cypher("g", "MATCH (e {id: $id}) RETURN e", {"id": "a"})
+        await pool.execute_cypher("g", "MATCH (e {id: $id}) RETURN e", {"id": "b"})
+
+        assert conn.executed[-1] == conn.executed[-2]
+
+    async def test_query_without_params_has_no_placeholder(self, pool_with_conn):
+        pool, conn = pool_with_conn
+
+        await pool.execute_cypher("g", "MATCH (n) RETURN n")
+
+        assert "$1" not in conn.executed[-1]
+        assert conn.last_args == ()
+
+    def test_encode_agtype_map(self):
+        encoded = encode_agtype({"name": "Müller", "ids": ["a", "b"], "confidence": 0.5})
+        assert json.loads(encoded) == {"name": "Müller", "ids": ["a", "b"], "confidence": 0.5}
+
+    async def test_declared_columns_in_column_list(self, pool_with_conn):
+        pool, conn = pool_with_conn
+
+        await pool.execute_cypher("g", "MATCH (a)-[r]->(b) RETURN a, r, b", columns=["a", "r", "b"])
+
+        assert "as (a agtype, r agtype, b agtype)" in conn.executed[-1]
+
+    async def test_invalid_column_name_rejected(self, pool_with_conn):
+        pool, _ = pool_with_conn
+
+        with pytest.raises(ValueError):
+            await pool.execute_cypher("g", "RETURN 1", columns=["x agtype); DROP TABLE y; --"])
@@ -0,0 +1,136 @@
+"""Unit tests for token-budgeted chunking."""
+import pytest
+
+from packages.shared.config import ChunkingStrategy, LLMProvider, Settings
+from packages.shared.text_processing import (
+    MIN_CHUNK_TOKENS,
+    TAIL_CHUNKS,
+    EstimateTokenizer,
+    HuggingFaceTokenizer,
+    TokenChunker,
+    chunk_source,
+    chunk_token_budget,
+    model_context_tokens,
+)
+
+
+class WordTokenizer:
+    """One token per whitespace-separated word."""
+
+    def count_tokens(self, text: str) -> int:
+        return len(text.split())
+
+
+class WideCharTokenizer:
+    """One token per ASCII character and three per other character, as for CJK text."""
+
+    def count_tokens(self, text: str) -> int:
+        return sum(1 if ord(char) < 128 else 3 for char in text)
+
+
+def sentences(count: int) -> str:
+    return "".join(f"Sentence {i} has five words. " for i in range(count))
+
+
+class TestTokenChunker:
+    """Test chunk count, budget, overlap and coverage."""
+
+    def test_text_within_budget_is_one_chunk(self):
+        text = sentences(10)
+        assert TokenChunker(WordTokenizer(), max_tokens=50).chunk(text) == [text.strip()]
+
+    def test_uses_the_fewest_chunks_and_evens_them_out(self):
+        # 100 sentences of 5 tokens: 500 tokens fit 3 chunks of at most 200
+        chunker = TokenChunker(WordTokenizer(), max_tokens=200, overlap_tokens=0)
+
+        chunks = chunker.chunk(sentences(100))
+
+        sizes = [WordTokenizer().count_tokens(chunk) for chunk in chunks]
+        assert len(chunks) == 3
+        # The largest chunk holds ceil(100 / 3) sentences, not the 40 greedy packing would
+        assert max(sizes) == 34 * 5
+        assert " ".join(chunks) == sentences(100).strip()
+
+    def test_consecutive_chunks_share_whole_sentences(self):
+        chunker = TokenChunker(WordTokenizer(), max_tokens=100, overlap_tokens=10)
+
+        chunks = chunker.chunk(sentences(60))
+
+        assert all(WordTokenizer().count_tokens(chunk) <= 100 for chunk in chunks)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            first_sentence = chunk.split(". ")[0] + "."
+            assert first_sentence in previous
+        assert chunks[0].startswith("Sentence 0 ")
+        assert chunks[-1].endswith("Sentence 59 has five words.")
+
+    def test_oversized_sentences_are_split(self):
+        text = "x" * 5000
+        chunks = TokenChunker(EstimateTokenizer(), max_tokens=300, overlap_tokens=0).chunk(text)
+
+        assert "".join(chunks) == text
+        assert all(EstimateTokenizer().count_tokens(chunk) <= 300 for chunk in chunks)
+
+    def test_pieces_of_multi_token_characters_are_split(self):
+        text = "知识图谱" * 500 + " 🙂🙂 " * 200
+        chunker = TokenChunker(WideCharTokenizer(), max_tokens=300, overlap_tokens=0)
+
+        chunks = chunker.chunk(text)
+
+        # Chunks are stripped, so only the spaces at their edges are missing
+        assert "".join(chunks).replace(" ", "") == text.replace(" ", "")
+        assert all(WideCharTokenizer().count_tokens(chunk) <= 300 for chunk in chunks)
+
+    def test_chunks_do_not_depend_on_slicing(self):
+        text = (sentences(300) + "\n\n" + "y" * 900 + " tail words\n") * 3
+        chunker = TokenChunker(EstimateTokenizer(), max_tokens=120)
+        chunks = chunker.chunk(text)
+
+        for size in (1, 37, 1000):
+            slices = [text[i : i + size] for i in range(0, len(text), size)]
+            assert list(chunker.stream(slices)) == chunks
+        assert len(chunks) > TAIL_CHUNKS + 1
+
+    def test_huggingface_tokenizer_counts_from_a_local_file(self, tmp_path):
+        tokenizers = pytest.importorskip("tokenizers")
+        from tokenizers.models import WordLevel
+        from tokenizers.pre_tokenizers import Whitespace
+
+        tokenizer = tokenizers.Tokenizer(WordLevel({"[UNK]": 0, "ada": 1}, unk_token="[UNK]"))
+        tokenizer.pre_tokenizer = Whitespace()
+        path = tmp_path / "tokenizer.json"
+        tokenizer.save(str(path))
+
+        assert HuggingFaceTokenizer(str(path)).count_tokens("ada wrote notes.") == 4
+
+
+class TestChunkBudget:
+    """Test the per-chunk token budget derived from the configured model."""
+
+    def test_budget_reserves_prompt_and_output(self):
+        settings = Settings(llm_provider=LLMProvider.LOCAL, ollama_num_ctx=8192)
+
+        assert chunk_token_budget(settings) == 8192 - 1024 - 4096
+
+    def test_long_context_models_are_capped(self):
+        settings = Settings(llm_provider=LLMProvider.AZURE, mistral_model="mistral-large-latest")
+
+        assert model_context_tokens(settings) == 131072
+        assert chunk_token_budget(settings) == settings.chunk_max_tokens
+
+    def test_small_windows_keep_a_minimum_budget(self):
+        settings = Settings(llm_context_tokens=2048)
+
+        assert chunk_token_budget(settings) == MIN_CHUNK_TOKENS
+
+    def test_character_strategy_keeps_the_fixed_size_chunker(self):
+        settings = Settings(chunking=ChunkingStrategy.CHARACTERS, max_chunk_size=1000)
+        text = sentences(200)
+
+        assert len(list(chunk_source(text, settings))) > len(list(chunk_source(text, Settings())))
+
+    def test_character_chunks_do_not_depend_on_slicing(self):
+        settings = Settings(chunking=ChunkingStrategy.CHARACTERS, max_chunk_size=1000)
+        text = sentences(500)
+        slices = [text[i : i + 777] for i in range(0, len(text), 777)]
+
+        assert list(chunk_source(slices, settings)) == list(chunk_source(text, settings))
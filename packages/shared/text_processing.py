@@ -2,11 +2,138 @@
 Text processing utilities for KETA.
 """
 
+import hashlib
 import logging
-from typing import Iterator
+import math
+import re
+from collections import deque
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    Optional,
+    Protocol,
+    Union,
+)
+
+from packages.shared.config import ChunkingStrategy, LLMProvider, Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
+# Characters shared by consecutive chunks of a source
+CHUNK_OVERLAP = 500
+
+# Tokens shared by consecutive token-budgeted chunks (about CHUNK_OVERLAP characters)
+CHUNK_OVERLAP_TOKENS = 128
+
+# Smallest chunk budget, however small the context window left after the reserves
+MIN_CHUNK_TOKENS = 256
+
+# Context windows by model name prefix; the longest matching prefix wins
+MODEL_CONTEXT_TOKENS = {
+    "mistral-large": 131072,
+    "mistral-medium": 131072,
+    "mistral-small": 32768,
+    "open-mistral-nemo": 131072,
+    "ministral": 131072,
+    "gpt-4o": 128000,
+    "gpt-4.1": 1047576,
+    "gpt-3.5-turbo": 16385,
+}
+DEFAULT_CONTEXT_TOKENS = 32768
+
+# Characters of consecutive whole sentences joined into one token chunker piece, at most
+SENTENCE_RUN_CHARS = 256
+
+# Greedy token chunks held back so the last ones can be evened out
+TAIL_CHUNKS = 3
+
+# Characters per slice when chunking text that is already in memory
+TEXT_SLICE_CHARS = 1024 * 1024
+
+
+class _CharacterChunkStream:
+    """
+    Incremental state of the fixed-size character chunker.
+
+    Text is fed in slices of any size; a chunk is cut once the text past its
+    start is longer than max_chunk_size, so the chunks do not depend on where
+    the slices end.
+    """
+
+    def __init__(self, max_chunk_size: int, overlap: int) -> None:
+        self.max_chunk_size = max_chunk_size
+        self.overlap = overlap
+        self.buffer = ""
+        self.consumed = 0
+        self.count = 0
+
+    def feed(self, text: str) -> list[str]:
+        self.buffer += text
+        return self._drain(closed=False)
+
+    def close(self) -> list[str]:
+        if not self.consumed and len(self.buffer) <= self.max_chunk_size:
+            # Text that fits one chunk is kept as it is
+            chunks = [self.buffer]
+            self.count = 1
+        else:
+            chunks = self._drain(closed=True)
+        logger.info(f"Split text into {self.count} chunks (max_size={self.max_chunk_size})")
+        return chunks
+
+    def _drain(self, closed: bool) -> list[str]:
+        text = self.buffer
+        text_length = len(text)
+        chunks = []
+        start = 0
+
+        # Until the stream ends, only cut where more text is known to follow
+        while start < text_length and (closed or text_length - start > self.max_chunk_size):
+            # Calculate end position
+            end = min(start + self.max_chunk_size, text_length)
+
+            # Try to find a good breaking point (sentence or paragraph end)
+            if end < text_length:
+                # Look for sentence endings within the last 20% of the chunk
+                search_start = max(start + int(self.max_chunk_size * 0.8), start)
+                chunk_portion = text[search_start:end]
+
+                # Try to find sentence breaks
+                for delimiter in ["\n\n", "\n", ". ", "! ", "? "]:
+                    last_break = chunk_portion.rfind(delimiter)
+                    if last_break != -1:
+                        end = search_start + last_break + len(delimiter)
+                        break
+
+            chunk = text[start:end].strip()
+            if chunk:
+                chunks.append(chunk)
+
+            # Move to next chunk with overlap
+            start = end - self.overlap if end < text_length else text_length
+
+        self.count += len(chunks)
+        self.consumed += start
+        self.buffer = text[start:]
+        return chunks
+
+
+def _iter_stream(stream: Any, slices: Iterable[str]) -> Iterator[str]:
+    """Feed slices of text to a chunk stream and yield its chunks."""
+    for text in slices:
+        yield from stream.feed(text)
+    yield from stream.close()
+
+
+def _slices(text: str) -> Iterator[str]:
+    """Cut text in memory into the slices chunk streams are fed."""
+    for start in range(0, len(text), TEXT_SLICE_CHARS):
+        yield text[start : start + TEXT_SLICE_CHARS]
+
 
 def chunk_text(text: str, max_chunk_size: int = 10000, overlap: int = 500) -> list[str]:
     """
@@ -20,58 +147,411 @@ def chunk_text(text: str, max_chunk_size: int = 10000, overlap: int = 500) -> li
     Returns:
         List of text chunks
     """
-    if len(text) <= max_chunk_size:
-        return [text]
+    return [chunk for _, chunk in chunk_text_iterator(text, max_chunk_size, overlap)]
 
-    chunks = []
-    start = 0
-    text_length = len(text)
 
-    while start < text_length:
-        # Calculate end position
-        end = min(start + max_chunk_size, text_length)
+def chunk_text_iterator(
+    text: str, max_chunk_size: int = 10000, overlap: int = 500
+) -> Iterator[tuple[int, str]]:
+    """
+    Iterator version of chunk_text that yields (index, chunk) tuples.
 
-        # Try to find a good breaking point (sentence or paragraph end)
-        if end < text_length:
-            # Look for sentence endings within the last 20% of the chunk
-            search_start = max(start + int(max_chunk_size * 0.8), start)
-            chunk_portion = text[search_start:end]
+    Args:
+        text: Text to chunk
+        max_chunk_size: Maximum characters per chunk
+        overlap: Number of overlapping characters between chunks
+
+    Yields:
+        Tuple of (chunk_index, chunk_text)
+    """
+    stream = _CharacterChunkStream(max_chunk_size, overlap)
+    yield from enumerate(_iter_stream(stream, _slices(text)))
+
+
+class Tokenizer(Protocol):
+    """Counts the tokens a model sees for a text."""
+
+    def count_tokens(self, text: str) -> int: ...
+
+
+class EstimateTokenizer:
+    """
+    Tokenizer-free estimate of about 4 characters per token, rounded up.
+    """
+
+    def count_tokens(self, text: str) -> int:
+        return math.ceil(len(text) / 4)
+
+
+class HuggingFaceTokenizer:
+    """
+    Exact token counts from a local tokenizer.json, such as the one published
+    with a model's weights. Loading never touches the network.
+    """
 
-            # Try to find sentence breaks
-            for delimiter in ["\n\n", "\n", ". ", "! ", "? "]:
-                last_break = chunk_portion.rfind(delimiter)
-                if last_break != -1:
-                    end = search_start + last_break + len(delimiter)
-                    break
+    def __init__(self, path: str) -> None:
+        """
+        Load the tokenizer.
 
-        chunk = text[start:end].strip()
+        Args:
+            path: Path to a tokenizer.json file
+        """
+        try:
+            from tokenizers import Tokenizer as _Tokenizer
+        except ImportError:
+            raise ImportError(
+                "tokenizers is not installed. Install it with: pip install tokenizers"
+            )
+        self._tokenizer = _Tokenizer.from_file(path)
+
+    def count_tokens(self, text: str) -> int:
+        return len(self._tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+@lru_cache(maxsize=4)
+def get_tokenizer(path: Optional[str] = None) -> Tokenizer:
+    """
+    Get the tokenizer for a tokenizer.json path, or the estimate without one.
+
+    Args:
+        path: Path to a tokenizer.json file (optional)
+
+    Returns:
+        Cached tokenizer
+    """
+    if path:
+        return HuggingFaceTokenizer(path)
+    return EstimateTokenizer()
+
+
+def model_context_tokens(settings: Settings) -> int:
+    """
+    Get the context window of the configured model.
+
+    Settings.llm_context_tokens overrides the lookup. Ollama gets
+    Settings.ollama_num_ctx; hosted models are looked up in MODEL_CONTEXT_TOKENS.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Context window in tokens
+    """
+    if settings.llm_context_tokens:
+        return settings.llm_context_tokens
+    if settings.llm_provider == LLMProvider.LOCAL:
+        return settings.ollama_num_ctx
+
+    model = (
+        settings.openai_model
+        if settings.llm_provider == LLMProvider.OPENAI
+        else settings.mistral_model
+    )
+    prefixes = [prefix for prefix in MODEL_CONTEXT_TOKENS if model.startswith(prefix)]
+    if not prefixes:
+        return DEFAULT_CONTEXT_TOKENS
+    return MODEL_CONTEXT_TOKENS[max(prefixes, key=len)]
+
+
+def chunk_token_budget(settings: Settings) -> int:
+    """
+    Get the tokens of source text one extraction call can take.
+
+    The model's context window less the prompt and output reserves, capped at
+    Settings.chunk_max_tokens.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Token budget per chunk
+    """
+    available = (
+        model_context_tokens(settings)
+        - settings.chunk_prompt_reserve_tokens
+        - settings.extraction_output_tokens
+    )
+    return max(MIN_CHUNK_TOKENS, min(available, settings.chunk_max_tokens))
+
+
+class TokenChunker:
+    """
+    Splits text into the fewest chunks that fit a token budget.
+
+    Text is cut into pieces at paragraph, line and sentence ends, joining
+    short sentences up to SENTENCE_RUN_CHARS, or at words or characters for
+    runs longer than max_tokens characters. A piece still over the budget,
+    when characters take several tokens each (CJK, emoji), is halved until
+    its parts fit. Pieces are packed greedily at the full budget; the last
+    TAIL_CHUNKS + 1 chunks are then evened out by packing them at the smallest
+    budget that keeps their count, so the last chunk is not a sliver.
+    Consecutive chunks share up to overlap_tokens of whole pieces.
+
+    Text can be streamed in slices of any size: pieces are only cut where the
+    text seen is long enough to decide, so the chunks never depend on the
+    slicing, and at most the held back chunks are kept in memory.
+
+    Tokens are counted per piece, which can differ from the count of the
+    joined chunk by a token per piece for subword tokenizers; the prompt
+    reserve absorbs the difference.
+    """
+
+    def __init__(
+        self, tokenizer: Tokenizer, max_tokens: int, overlap_tokens: int = CHUNK_OVERLAP_TOKENS
+    ) -> None:
+        """
+        Initialize the chunker.
+
+        Args:
+            tokenizer: Token counter
+            max_tokens: Token budget per chunk
+            overlap_tokens: Tokens shared by consecutive chunks, at most
+        """
+        self.tokenizer = tokenizer
+        self.max_tokens = max(1, max_tokens)
+        self.overlap_tokens = min(overlap_tokens, self.max_tokens // 4)
+        # Fits the budget while characters take at most a token; _split handles the rest
+        self.piece_chars = self.max_tokens
+        run_chars = min(SENTENCE_RUN_CHARS, self.max_tokens // 4)
+        # Sentences up to run_chars; else one sentence, words or characters up to piece_chars
+        self.piece = re.compile(
+            r"(?s).{{0,{r}}}(?:\n|[.!?] |\Z)"
+            r"|.{{0,{n}}}?(?:\n|[.!?] |\Z)"
+            r"|.{{1,{n}}}\s"
+            r"|.{{1,{n}}}".format(r=run_chars, n=self.piece_chars)
+        )
+
+    def chunk(self, text: str) -> list[str]:
+        """
+        Split text into chunks.
+
+        Args:
+            text: Text to chunk
+
+        Returns:
+            List of text chunks
+        """
+        return list(self.stream(_slices(text)))
+
+    def stream(self, slices: Iterable[str]) -> Iterator[str]:
+        """
+        Split text fed in slices into chunks.
+
+        Args:
+            slices: Consecutive slices of the text
+
+        Yields:
+            Text chunks
+        """
+        yield from _iter_stream(_TokenChunkStream(self), slices)
+
+    def _split(self, piece: str, tokens: int) -> Iterator[tuple[str, int]]:
+        """Halve a piece, preferring a space, until its parts fit the budget."""
+        if tokens <= self.max_tokens or len(piece) == 1:
+            yield piece, tokens
+            return
+        middle = len(piece) // 2
+        middle = piece.rfind(" ", 0, middle) + 1 or middle
+        for part in (piece[:middle], piece[middle:]):
+            yield from self._split(part, self.tokenizer.count_tokens(part))
+
+    def _pack(self, counts: list[int], budget: int) -> list[tuple[int, int]]:
+        """Greedily pack pieces into (start, end) spans of at most budget tokens."""
+        spans: list[tuple[int, int]] = []
+        i = 0
+        while i < len(counts):
+            start, tokens = i, 0
+            if spans:
+                # Carry whole trailing pieces of the previous chunk as overlap
+                previous_start = spans[-1][0]
+                while (
+                    start - 1 > previous_start
+                    and tokens + counts[start - 1] <= self.overlap_tokens
+                    and tokens + counts[start - 1] + counts[i] <= budget
+                ):
+                    start -= 1
+                    tokens += counts[start]
+            while i < len(counts) and tokens + counts[i] <= budget:
+                tokens += counts[i]
+                i += 1
+            if start == i:
+                # A piece over the budget still makes progress as its own chunk
+                i += 1
+            spans.append((start, i))
+        return spans
+
+
+class _TokenChunkStream:
+    """
+    Incremental state of TokenChunker.stream.
+
+    Packs pieces as they are cut the way TokenChunker._pack does, holding back
+    the last TAIL_CHUNKS greedy chunks and the one being filled until the
+    stream ends.
+    """
+
+    def __init__(self, chunker: TokenChunker) -> None:
+        self.chunker = chunker
+        self.buffer = ""
+        # Greedy chunks as (pieces, token counts, overlap), the first overlap
+        # pieces carried over from the chunk before
+        self.held: deque[tuple[list[str], list[int], int]] = deque()
+        self.pieces: list[str] = []
+        self.counts: list[int] = []
+        self.overlap = 0
+        self.tokens = 0
+        self.count = 0
+
+    def feed(self, text: str) -> list[str]:
+        self.buffer += text
+        return self._drain(closed=False)
+
+    def close(self) -> list[str]:
+        chunks = self._drain(closed=True)
+        if self.pieces:
+            self.held.append((self.pieces, self.counts, self.overlap))
+            self.pieces, self.counts = [], []
+        self._balance(chunks)
+        logger.info(f"Split text into {self.count} chunks (max_tokens={self.chunker.max_tokens})")
+        return chunks
+
+    def _drain(self, closed: bool) -> list[str]:
+        buffer = self.buffer
+        match_piece = self.chunker.piece.match
+        count_tokens = self.chunker.tokenizer.count_tokens
+        budget = self.chunker.max_tokens
+        # No piece match reaches further than this past its start
+        end = len(buffer) if closed else len(buffer) - self.chunker.piece_chars - 2
+        chunks: list[str] = []
+        position = 0
+        while position < end:
+            match = match_piece(buffer, position)
+            # The last alternative matches any character, so this only fails if the
+            # pattern is edited to allow a piece that is empty or never matches
+            if match is None or match.end() == position:
+                raise RuntimeError(f"Token chunker cut no piece at offset {position}")
+            position = match.end()
+            piece = match.group()
+            tokens = count_tokens(piece)
+            if tokens > budget:
+                for part, part_tokens in self.chunker._split(piece, tokens):
+                    self._add(part, part_tokens, chunks)
+            else:
+                self._add(piece, tokens, chunks)
+        self.buffer = buffer[position:]
+        return chunks
+
+    def _add(self, piece: str, tokens: int, chunks: list[str]) -> None:
+        """Append a piece to the chunk being filled, starting the next one if it is full."""
+        if len(self.pieces) > self.overlap and self.tokens + tokens > self.chunker.max_tokens:
+            self._start_chunk(tokens, chunks)
+        self.pieces.append(piece)
+        self.counts.append(tokens)
+        self.tokens += tokens
+
+    def _start_chunk(self, tokens: int, chunks: list[str]) -> None:
+        """Hold back the full chunk and start the next one, before a piece of tokens."""
+        pieces, counts = self.pieces, self.counts
+        # Carry whole trailing pieces of the previous chunk as overlap
+        start, carried = len(pieces), 0
+        while (
+            start - 1 > 0
+            and carried + counts[start - 1] <= self.chunker.overlap_tokens
+            and carried + counts[start - 1] + tokens <= self.chunker.max_tokens
+        ):
+            start -= 1
+            carried += counts[start]
+        self.held.append((pieces, counts, self.overlap))
+        self.pieces, self.counts = pieces[start:], counts[start:]
+        self.overlap = len(self.pieces)
+        self.tokens = carried
+        if len(self.held) > TAIL_CHUNKS:
+            self._emit(self.held.popleft()[0], chunks)
+
+    def _balance(self, chunks: list[str]) -> None:
+        """Repack the held back chunks at the smallest budget that keeps their count."""
+        if not self.held:
+            return
+        held = list(self.held)
+        self.held.clear()
+        pieces = held[0][0] + [piece for p, _, overlap in held[1:] for piece in p[overlap:]]
+        counts = held[0][1] + [tokens for _, c, overlap in held[1:] for tokens in c[overlap:]]
+
+        chunker = self.chunker
+        spans = chunker._pack(counts, chunker.max_tokens)
+        low = max(max(counts), math.ceil(sum(counts) / len(spans)))
+        high = chunker.max_tokens
+        while low < high:
+            budget = (low + high) // 2
+            if len(chunker._pack(counts, budget)) <= len(spans):
+                high = budget
+            else:
+                low = budget + 1
+
+        for a, b in chunker._pack(counts, high):
+            self._emit(pieces[a:b], chunks)
+
+    def _emit(self, pieces: list[str], chunks: list[str]) -> None:
+        chunk = "".join(pieces).strip()
         if chunk:
+            self.count += 1
             chunks.append(chunk)
 
-        # Move to next chunk with overlap
-        start = end - overlap if end < text_length else text_length
 
-    logger.info(f"Split text into {len(chunks)} chunks (max_size={max_chunk_size})")
-    return chunks
+def _open_chunk_stream(settings: Settings) -> Any:
+    """Start chunking a source with the configured chunker."""
+    if settings.chunking == ChunkingStrategy.CHARACTERS:
+        return _CharacterChunkStream(settings.max_chunk_size, CHUNK_OVERLAP)
+    chunker = TokenChunker(get_tokenizer(settings.tokenizer_path), chunk_token_budget(settings))
+    return _TokenChunkStream(chunker)
 
 
-def chunk_text_iterator(
-    text: str, max_chunk_size: int = 10000, overlap: int = 500
+def chunk_source(
+    content: Union[str, Iterable[str]], settings: Optional[Settings] = None
 ) -> Iterator[tuple[int, str]]:
     """
-    Iterator version of chunk_text that yields (index, chunk) tuples.
+    Chunk a source's content the way extraction does.
+
+    Sources are hashed and extracted chunk by chunk, so everything that needs
+    a source's chunks must use this function or stream_source_chunks. The
+    chunks are the same however the content is sliced.
 
     Args:
-        text: Text to chunk
-        max_chunk_size: Maximum characters per chunk
-        overlap: Number of overlapping characters between chunks
+        content: Source content, or consecutive slices of it
+        settings: Application settings (optional, defaults to get_settings())
+
+    Yields:
+        Tuple of (chunk_index, chunk_text)
+    """
+    stream = _open_chunk_stream(settings or get_settings())
+    slices = _slices(content) if isinstance(content, str) else content
+    yield from enumerate(_iter_stream(stream, slices))
+
+
+async def stream_source_chunks(
+    slices: AsyncIterable[str], settings: Optional[Settings] = None
+) -> AsyncIterator[tuple[int, str]]:
+    """
+    Chunk a source's content read in slices, such as from the database.
+
+    Only the slice being read and the chunks not yet yielded are in memory.
+
+    Args:
+        slices: Consecutive slices of the source content
+        settings: Application settings (optional, defaults to get_settings())
 
     Yields:
         Tuple of (chunk_index, chunk_text)
     """
-    chunks = chunk_text(text, max_chunk_size, overlap)
-    for index, chunk in enumerate(chunks):
+    stream = _open_chunk_stream(settings or get_settings())
+    index = 0
+    async for text in slices:
+        for chunk in stream.feed(text):
+            yield index, chunk
+            index += 1
+    for chunk in stream.close():
         yield index, chunk
+        index += 1
 
 
 def extract_text_snippet(text: str, max_length: int = 500) -> str:
@@ -112,3 +592,16 @@ def count_tokens_estimate(text: str) -> int:
         Estimated token count
     """
     return len(text) // 4
+
+
+def content_hash(text: str) -> str:
+    """
+    Hash text for deduplication.
+
+    Args:
+        text: Source content or chunk text
+
+    Returns:
+        SHA-256 hex digest of the UTF-8 encoded text
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
@@ -42,3 +42,16 @@ def calculate_f1(predicted_entities: Set[Tuple[str, int, int]],
         "false_positives": false_positives,
         "false_negatives": false_negatives
     }
+
+def entities_to_token_spans(extracted: List[dict], text: str) -> Set[Tuple[str, int, int]]:
+    spans = set()
+    text_lower = text.lower()
+    for entity in extracted:
+        entity_name = entity['name']
+        entity_text_lower = entity_name.lower()
+        if entity_text_lower in text_lower:
+            start_char = text_lower.index(entity_text_lower)
+            start_token_idx = len(text[:start_char].split())
+            end_token_idx = start_token_idx + len(entity_name.split()) - 1
+            spans.add((entity_name, start_token_idx, end_token_idx))
+    return spans
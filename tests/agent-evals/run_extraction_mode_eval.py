@@ -0,0 +1,96 @@
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from datasets import load_dataset
+from dotenv import load_dotenv
+from langchain_core.callbacks import get_usage_metadata_callback
+from langchain_openai import ChatOpenAI
+
+load_dotenv()
+
+# The repository root and this directory are not installed packages
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+from metrics import calculate_f1, entities_to_token_spans, extract_entities_from_tags  # noqa: E402
+from packages.agents.tools.extraction import (  # noqa: E402
+    EntityExtractor,
+    JointExtractor,
+    RelationshipExtractor,
+)
+
+SAMPLES = 10
+
+
+async def two_call(entity_extractor, relationship_extractor, text):
+    entities = await entity_extractor.extract(text)
+    relationships = await relationship_extractor.extract(text, entities)
+    return entities, relationships
+
+
+async def evaluate(label, extract, samples):
+    latencies, tokens, f1_scores, relationship_counts = [], [], [], []
+
+    for idx in range(len(samples['tokens'])):
+        text = " ".join(samples['tokens'][idx])
+        ground_truth = extract_entities_from_tags(samples['tokens'][idx], samples['ner_tags'][idx])
+
+        with get_usage_metadata_callback() as usage:
+            started = time.perf_counter()
+            entities, relationships = await extract(text)
+            latencies.append(time.perf_counter() - started)
+        tokens.append(sum(u.get("total_tokens", 0) for u in usage.usage_metadata.values()))
+
+        f1_scores.append(calculate_f1(entities_to_token_spans(entities, text), ground_truth)['f1'])
+        relationship_counts.append(len(relationships))
+
+    return {
+        "mode": label,
+        "latency": statistics.mean(latencies),
+        "tokens": statistics.mean(tokens),
+        "f1": statistics.mean(f1_scores),
+        "relationships": statistics.mean(relationship_counts),
+    }
+
+
+async def main():
+    print("Loading Few-NERD dataset...")
+    dataset = load_dataset("DFKI-SLT/few-nerd", "supervised")
+    samples = dataset['test'][:SAMPLES]
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY environment variable not set")
+
+    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.0, api_key=api_key)
+    entity_extractor = EntityExtractor(llm)
+    relationship_extractor = RelationshipExtractor(llm)
+    joint_extractor = JointExtractor(llm)
+
+    results = [
+        await evaluate(
+            "two_call",
+            lambda text: two_call(entity_extractor, relationship_extractor, text),
+            samples,
+        ),
+        await evaluate("joint", joint_extractor.extract, samples),
+    ]
+
+    print(f"\n{'='*80}")
+    print(f"EXTRACTION MODE COMPARISON ({SAMPLES} samples, means per sample)")
+    print(f"{'='*80}")
+    print(
+        f"{'mode':<10} {'latency (s)':>12} {'tokens':>10} {'entity F1':>10} "
+        f"{'relationships':>14}"
+    )
+    for r in results:
+        print(
+            f"{r['mode']:<10} {r['latency']:>12.2f} {r['tokens']:>10.0f} "
+            f"{r['f1']:>10.3f} {r['relationships']:>14.1f}"
+        )
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+"""
+Benchmark per-message agent setup overhead.
+
+Compares building a fresh AgentOrchestrator for every chat message (LLM clients, prompt
+templates, structured-output chains and LangGraph compilation) with looking up the shared
+orchestrator held by the application-scoped AgentRegistry.
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from packages.agents.orchestrator import AgentOrchestrator
+from packages.agents.registry import AgentRegistry
+from packages.shared.database import DatabasePool
+
+ITERATIONS = 50
+
+
+def time_call(fn, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    print(
+        f"{label:<28} mean={statistics.mean(timings):9.3f} ms  "
+        f"p50={statistics.median(timings):9.3f} ms  max={max(timings):9.3f} ms"
+    )
+
+
+def main() -> None:
+    # Agents are only constructed here, so the pool never needs to connect
+    db_pool = DatabasePool()
+
+    registry = AgentRegistry()
+    registry.initialize(db_pool)
+    print(f"Registry startup (one-off):   {registry.setup_seconds * 1000:9.3f} ms\n")
+
+    per_request = time_call(lambda: AgentOrchestrator(db_pool), ITERATIONS)
+    shared = time_call(lambda: registry.orchestrator, ITERATIONS)
+
+    print(f"Per-message setup over {ITERATIONS} messages")
+    report("Orchestrator per request", per_request)
+    report("Shared agent registry", shared)
+
+
+if __name__ == "__main__":
+    main()
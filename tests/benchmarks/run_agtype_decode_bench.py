@@ -0,0 +1,106 @@
+"""
+Benchmark agtype result decoding.
+
+Compares the string-replace + json.loads parsing previously done per row in the
+repositories with the driver-level agtype codec registered on every pooled connection,
+on a 10k-row result of vertices and relationship rows.
+"""
+
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from packages.shared.agtype import decode_agtype
+from packages.shared.models.age import (
+    parse_agtype_to_edge,
+    parse_agtype_to_vertex,
+    validate_agtype_column,
+    AgeColumnKind,
+)
+from packages.shared.repositories.base import GraphRepository
+
+ROWS = 10_000
+ITERATIONS = 15
+
+
+def make_vertex(i: int) -> str:
+    properties = {
+        "id": f"00000000-0000-0000-0000-{i:012d}",
+        "name": f"Entity {i}",
+        "type": "PERSON",
+        "description": "A person mentioned in the source document",
+        "confidence": 0.92,
+        "source_ids": ["11111111-1111-1111-1111-111111111111"],
+    }
+    vertex = {"id": 844424930131969 + i, "label": "Entity", "properties": properties}
+    return json.dumps(vertex) + "::vertex"
+
+
+def make_edge(i: int) -> str:
+    properties = {"relationship_type": "WORKS_AT", "confidence": 0.81, "weight": 1.5}
+    edge = {
+        "id": 1125899906842625 + i,
+        "label": "RELATED_TO",
+        "start_id": 844424930131969 + i,
+        "end_id": 844424930131970 + i,
+        "properties": properties,
+    }
+    return json.dumps(edge) + "::edge"
+
+
+def time_call(fn, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    print(
+        f"{label:<36} mean={statistics.mean(timings):9.1f} ms  "
+        f"p50={statistics.median(timings):9.1f} ms  "
+        f"rows/s={ROWS / (statistics.median(timings) / 1000):12,.0f}"
+    )
+
+
+def main() -> None:
+    vertices = [make_vertex(i) for i in range(ROWS)]
+    relationships = [(make_vertex(i), make_edge(i), make_vertex(i + 1)) for i in range(ROWS)]
+    repo = GraphRepository.__new__(GraphRepository)
+
+    def legacy_properties() -> None:
+        for text in vertices:
+            repo._parse_agtype(text)
+
+    def codec_properties() -> None:
+        for text in vertices:
+            decode_agtype(text).properties
+
+    def legacy_relationships() -> None:
+        for source, edge, target in relationships:
+            parse_agtype_to_vertex(source)
+            parse_agtype_to_edge(edge)
+            parse_agtype_to_vertex(target)
+
+    def codec_relationships() -> None:
+        for source, edge, target in relationships:
+            validate_agtype_column(decode_agtype(source), AgeColumnKind.VERTEX)
+            validate_agtype_column(decode_agtype(edge), AgeColumnKind.EDGE)
+            validate_agtype_column(decode_agtype(target), AgeColumnKind.VERTEX)
+
+    print(f"Decoding {ROWS:,} rows, {ITERATIONS} iterations\n")
+    print("Vertex properties (execute_cypher)")
+    report("String replace + json.loads", time_call(legacy_properties, ITERATIONS))
+    report("agtype codec", time_call(codec_properties, ITERATIONS))
+    print("\nRelationship rows (execute_cypher_rows)")
+    report("String replace + json.loads", time_call(legacy_relationships, ITERATIONS))
+    report("agtype codec", time_call(codec_relationships, ITERATIONS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark graph writes for one extraction chunk.
+
+Compares the per-entity write path (find_entity_by_name, create_entity and two link
+queries per entity, one create_relationship per relationship) with the batched
+upsert_entities / link_mentions / create_relationships calls on one transaction.
+
+Requires the docker stack: writes go to a scratch graph that is dropped afterwards.
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from packages.graph.repository import KnowledgeGraphRepository
+from packages.shared.config import get_settings
+from packages.shared.database import DatabasePool
+
+GRAPH_NAME = "keta_bench_graph"
+ENTITIES = 500
+RELATIONSHIPS = 250
+ITERATIONS = 3
+
+
+def make_chunk() -> tuple[list[dict], list[dict]]:
+    run = uuid4().hex[:8]
+    entities = [
+        {
+            "id": str(uuid4()),
+            "name": f"Entity {run} {i}",
+            "type": "PERSON",
+            "confidence": 0.9,
+            "extraction_method": "llm_structured",
+        }
+        for i in range(ENTITIES)
+    ]
+    relationships = [
+        {
+            "entity1_name": entities[i]["name"],
+            "entity2_name": entities[i + 1]["name"],
+            "relationship_type": "WORKS_WITH",
+            "description": "Benchmark relationship",
+            "confidence": 0.8,
+        }
+        for i in range(RELATIONSHIPS)
+    ]
+    return entities, relationships
+
+
+async def per_entity(repo: KnowledgeGraphRepository, source_id, entities, relationships) -> None:
+    name_to_id = {}
+    for entity in entities:
+        existing = await repo.find_entity_by_name(entity["name"])
+        entity_id = existing.id if existing else entity["id"]
+        if not existing:
+            await repo.create_entity(
+                entity_id=entity_id,
+                name=entity["name"],
+                entity_type=entity["type"],
+                source_ids=[source_id],
+                confidence=entity["confidence"],
+            )
+            await repo.link_entity_to_document(entity_id, source_id)
+            await repo.link_entity_to_source(entity_id, source_id, confidence=entity["confidence"])
+        name_to_id[entity["name"]] = entity_id
+    for rel in relationships:
+        await repo.create_relationship(
+            entity1_id=name_to_id[rel["entity1_name"]],
+            entity2_id=name_to_id[rel["entity2_name"]],
+            relationship_type=rel["relationship_type"],
+            description=rel["description"],
+            source_ids=[source_id],
+            confidence=rel["confidence"],
+        )
+
+
+async def bulk(repo: KnowledgeGraphRepository, source_id, entities, relationships) -> None:
+    async with repo.db_pool.transaction() as conn:
+        name_to_id = await repo.upsert_entities(entities, source_id, conn=conn)
+        await repo.link_mentions(
+            source_id,
+            [{"entity_id": entity_id} for entity_id in name_to_id.values()],
+            conn=conn,
+        )
+        await repo.create_relationships(
+            [
+                {
+                    **rel,
+                    "entity1_id": name_to_id[rel["entity1_name"]],
+                    "entity2_id": name_to_id[rel["entity2_name"]],
+                }
+                for rel in relationships
+            ],
+            source_ids=[source_id],
+            conn=conn,
+        )
+
+
+async def measure(label: str, write, repo: KnowledgeGraphRepository) -> None:
+    timings = []
+    for _ in range(ITERATIONS):
+        source_id = uuid4()
+        await repo.create_document(source_id, "Benchmark document")
+        entities, relationships = make_chunk()
+        started = time.perf_counter()
+        await write(repo, source_id, entities, relationships)
+        timings.append(time.perf_counter() - started)
+    p50 = statistics.median(timings)
+    print(f"{label:<20} p50={p50 * 1000:9.1f} ms  entities/s={ENTITIES / p50:10,.0f}")
+
+
+async def main() -> None:
+    db_pool = DatabasePool()
+    await db_pool.initialize(get_settings().database_url, min_size=1, max_size=2)
+    await db_pool.execute(f"SELECT create_graph('{GRAPH_NAME}');")
+    try:
+        repo = KnowledgeGraphRepository(db_pool, GRAPH_NAME)
+        print(f"Writing a chunk of {ENTITIES} entities and {RELATIONSHIPS} relationships\n")
+        await measure("Per-entity writes", per_entity, repo)
+        await measure("Batched UNWIND", bulk, repo)
+    finally:
+        await db_pool.execute(f"SELECT drop_graph('{GRAPH_NAME}', true);")
+        await db_pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
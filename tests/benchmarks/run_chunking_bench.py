@@ -0,0 +1,92 @@
+"""
+Benchmark chunks and LLM calls per 1 MB of text: fixed-size character chunks vs.
+token-budgeted chunks for the configured model profiles.
+
+The character chunker cuts every max_chunk_size characters whatever the model's
+context window; the token chunker fills each model's budget (context window
+less prompt and output reserves, capped at chunk_max_tokens) with the fewest
+chunks. Tokens are counted with --tokenizer (a local tokenizer.json) or the
+~4 characters per token estimate.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from packages.shared.config import ChunkingStrategy, LLMProvider, Settings
+from packages.shared.text_processing import chunk_source, chunk_token_budget, get_tokenizer
+
+WORDS = (
+    "Ada Lovelace Charles Babbage Analytical Engine London Royal Society mathematician "
+    "program machine notes translation Menabrea algorithm Bernoulli numbers engine design "
+    "punched cards Jacquard loom computation symbols operations variables result the a of "
+    "and with for in on by which was were has had describes published"
+).split()
+
+PROFILES = {
+    "characters (max_chunk_size=10000)": {"chunking": ChunkingStrategy.CHARACTERS},
+    "tokens, ollama num_ctx=8192": {"llm_provider": LLMProvider.LOCAL, "ollama_num_ctx": 8192},
+    "tokens, ollama num_ctx=32768": {"llm_provider": LLMProvider.LOCAL, "ollama_num_ctx": 32768},
+    "tokens, mistral-large-latest": {
+        "llm_provider": LLMProvider.AZURE,
+        "mistral_model": "mistral-large-latest",
+    },
+}
+
+
+def make_text(size: int) -> str:
+    """Deterministic prose of paragraphs of 3-8 sentences of 6-30 words."""
+    rng = random.Random(0)
+    paragraphs = []
+    length = 0
+    while length < size:
+        sentences = []
+        for _ in range(rng.randint(3, 8)):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(6, 30))]
+            sentences.append(" ".join(words).capitalize() + rng.choice([".", ".", ".", "?", "!"]))
+        paragraph = " ".join(sentences)
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return "\n\n".join(paragraphs)[:size]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mb", type=float, default=1.0, help="Text size in MB")
+    parser.add_argument("--tokenizer", help="Path to a tokenizer.json for exact token counts")
+    args = parser.parse_args()
+
+    text = make_text(int(args.mb * 1024 * 1024))
+    tokenizer = get_tokenizer(args.tokenizer)
+    total_tokens = tokenizer.count_tokens(text)
+    print(
+        f"{len(text) / 1024 / 1024:.2f} MB, {total_tokens} tokens "
+        f"({'tokenizer.json' if args.tokenizer else '~4 characters per token'})\n"
+    )
+    print(
+        f"{'profile':<36}{'budget':>8}{'chunks':>8}{'calls 2x':>10}{'calls 1x':>10}"
+        f"{'mean tok':>10}{'max tok':>9}{'time':>9}"
+    )
+
+    for name, overrides in PROFILES.items():
+        settings = Settings(tokenizer_path=args.tokenizer, **overrides)
+        budget = chunk_token_budget(settings)
+        started = time.perf_counter()
+        chunks = [chunk for _, chunk in chunk_source(text, settings)]
+        elapsed = time.perf_counter() - started
+        sizes = [tokenizer.count_tokens(chunk) for chunk in chunks]
+        print(
+            f"{name:<36}"
+            f"{budget if settings.chunking == ChunkingStrategy.TOKENS else '-':>8}"
+            f"{len(chunks):>8}{2 * len(chunks):>10}{len(chunks):>10}"
+            f"{sum(sizes) / len(sizes):>10.0f}{max(sizes):>9}{elapsed:>8.2f}s"
+        )
+
+    print("\ncalls 2x: two_call extraction mode; calls 1x: joint mode")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark extraction wall-clock time against Settings.extraction_concurrency.
+
+Runs ExtractionAgent.execute over a multi-chunk document with a fake LLM that sleeps
+for a fixed latency per call, and in-memory stand-ins for the sources and graph
+repositories, so only the scheduling of LLM calls is measured.
+"""
+
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from uuid import uuid4
+
+from langchain_core.runnables import RunnableLambda
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from packages.agents.extraction_agent import ExtractionAgent
+from packages.agents.tools.extraction import EntityExtractionOutput, RelationshipExtractionOutput
+from packages.shared.config import ChunkingStrategy, get_settings
+
+CHUNKS = 20
+LLM_LATENCY = 0.2  # seconds per call
+CONCURRENCY_LEVELS = (1, 2, 4, 8)
+
+
+class FakeLLM:
+    """Structured-output LLM that waits LLM_LATENCY and returns two entities, one relationship."""
+
+    def with_structured_output(self, schema):
+        async def respond(_prompt):
+            await asyncio.sleep(LLM_LATENCY)
+            if schema is EntityExtractionOutput:
+                return EntityExtractionOutput(
+                    entities=[
+                        {"name": "Ada Lovelace", "type": "PERSON", "confidence": 0.9},
+                        {"name": "Analytical Engine", "type": "PRODUCT", "confidence": 0.8},
+                    ]
+                )
+            return RelationshipExtractionOutput(
+                relationships=[
+                    {
+                        "entity1_name": "Ada Lovelace",
+                        "entity2_name": "Analytical Engine",
+                        "relationship_type": "WORKED_ON",
+                        "description": "Ada Lovelace wrote programs for the Analytical Engine",
+                        "confidence": 0.8,
+                    }
+                ]
+            )
+
+        return RunnableLambda(respond)
+
+
+class FakeDatabasePool:
+    @asynccontextmanager
+    async def transaction(self):
+        yield None
+
+
+class FakeSourcesRepository:
+    def __init__(self, content: str) -> None:
+        self.content = content
+        self.source = {"name": "bench", "objective_id": uuid4(), "chunk_count": 0}
+
+    async def get_without_content(self, source_id):
+        return self.source
+
+    async def get_content_slice(self, source_id, start, length):
+        return self.content[start : start + length]
+
+    async def iter_content(self, source_id):
+        yield self.content
+
+    async def update_extraction_status(self, source_id, status, progress=None, error=None):
+        pass
+
+
+class FakeObjectivesRepository:
+    async def get_by_id(self, objective_id):
+        return {"id": objective_id, "metadata": {}}
+
+
+class FakeChunkExtractionsRepository:
+    """Never finds a chunk, so every run calls the LLM for every chunk."""
+
+    async def get_many(self, chunk_hashes, extraction_mode, model, prompt_hash):
+        return {}
+
+    async def get_latest(self, chunk_hashes, extraction_mode):
+        return {}
+
+    async def put_many(self, extractions, extraction_mode, model, prompt_hash, conn=None):
+        pass
+
+
+class FakeSourceChunksRepository:
+    """Has no checkpoints, so every run extracts every chunk."""
+
+    async def get_completed(self, source_id):
+        return {}
+
+    async def record(self, source_id, chunks, extraction_mode, conn=None):
+        pass
+
+
+class FakeGraphRepository:
+    async def create_document(self, **kwargs):
+        pass
+
+    async def upsert_entities(self, entities, source_id, objective_id=None, conn=None):
+        return {entity["name"]: uuid4() for entity in entities}
+
+    async def link_mentions(self, *args, **kwargs):
+        pass
+
+    async def create_relationships(self, relationships, *args, **kwargs):
+        return len(relationships)
+
+
+async def run(concurrency: int, content: str) -> float:
+    settings = get_settings()
+    settings.extraction_concurrency = concurrency
+    # Every run extracts the same chunks; the cache would turn later runs into lookups
+    settings.llm_cache_enabled = False
+    agent = ExtractionAgent(FakeDatabasePool(), llm=FakeLLM())
+    agent.sources_repo = FakeSourcesRepository(content)
+    agent.objectives_repo = FakeObjectivesRepository()
+    agent.chunk_extractions_repo = FakeChunkExtractionsRepository()
+    agent.source_chunks_repo = FakeSourceChunksRepository()
+    agent.graph_repo = FakeGraphRepository()
+
+    started = time.perf_counter()
+    state = await agent.execute({"source_id": uuid4(), "agent_path": [], "errors": []})
+    elapsed = time.perf_counter() - started
+    assert not state.get("errors"), state["errors"]
+    return elapsed
+
+
+async def main() -> None:
+    settings = get_settings()
+    settings.chunking = ChunkingStrategy.CHARACTERS
+    # Sentence-sized text with no overlap pressure: CHUNKS chunks of max_chunk_size characters
+    sentence = "Ada Lovelace wrote the first program for the Analytical Engine. "
+    content = sentence * (settings.max_chunk_size * CHUNKS // len(sentence))
+
+    print(f"{CHUNKS} chunks, 2 LLM calls per chunk, {LLM_LATENCY * 1000:.0f} ms per call\n")
+    baseline = None
+    for concurrency in CONCURRENCY_LEVELS:
+        elapsed = await run(concurrency, content)
+        baseline = baseline or elapsed
+        print(
+            f"extraction_concurrency={concurrency:<3} wall={elapsed:7.2f} s  "
+            f"speedup={baseline / elapsed:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""
+Benchmark objective stats latency as chat history grows.
+
+Fills a scratch objective with sources, sessions and up to 100k messages and times
+ObjectivesRepository.get_stats (trigger-maintained objective_counters) against the
+previous sources x sessions x messages join at each size.
+
+Requires the docker stack: the scratch objective is deleted afterwards.
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from packages.shared.config import get_settings
+from packages.shared.database import DatabasePool
+from packages.shared.repositories import ObjectivesRepository
+
+SOURCES = 50
+SESSIONS = 100
+MESSAGE_STEPS = (1_000, 10_000, 100_000)
+ITERATIONS = 20
+
+JOIN_QUERY = """
+    SELECT
+        o.id,
+        COUNT(DISTINCT s.id) AS source_count,
+        COUNT(DISTINCT s.id) FILTER (WHERE s.extraction_status = 'COMPLETED') AS completed_sources,
+        COUNT(DISTINCT s.id) FILTER (WHERE s.extraction_status = 'FAILED') AS failed_sources,
+        COUNT(DISTINCT cs.id) AS session_count,
+        COUNT(DISTINCT cm.id) AS message_count,
+        MAX(s.processed_at) AS last_processed_at,
+        MAX(cs.last_message_at) AS last_chat_at
+    FROM keta.objectives o
+    LEFT JOIN keta.sources s ON o.id = s.objective_id
+    LEFT JOIN keta.chat_sessions cs ON o.id = cs.objective_id
+    LEFT JOIN keta.chat_messages cm ON cs.id = cm.session_id AND cm.deleted_at IS NULL
+    WHERE o.id = $1
+    GROUP BY o.id
+"""
+
+
+async def add_messages(db_pool: DatabasePool, session_ids: list, count: int) -> None:
+    await db_pool.execute(
+        """
+        INSERT INTO keta.chat_messages (session_id, role, content)
+        SELECT ($1::uuid[])[1 + i % array_length($1::uuid[], 1)], 'user', 'benchmark message'
+        FROM generate_series(1, $2) AS i
+        """,
+        session_ids,
+        count,
+    )
+
+
+async def time_query(run) -> float:
+    timings = []
+    for _ in range(ITERATIONS):
+        started = time.perf_counter()
+        await run()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+async def main() -> None:
+    db_pool = DatabasePool()
+    await db_pool.initialize(get_settings().database_url, min_size=1, max_size=2)
+    repo = ObjectivesRepository(db_pool)
+    objective_id = await db_pool.fetchval(
+        "INSERT INTO keta.objectives (name) VALUES ($1) RETURNING id", f"bench-{uuid4().hex[:8]}"
+    )
+    try:
+        await db_pool.execute(
+            """
+            INSERT INTO keta.sources (objective_id, name, content, extraction_status)
+            SELECT $1, 'source ' || i, 'benchmark',
+                   CASE WHEN i % 5 = 0 THEN 'FAILED' ELSE 'COMPLETED' END
+            FROM generate_series(1, $2) AS i
+            """,
+            objective_id,
+            SOURCES,
+        )
+        rows = await db_pool.fetch(
+            """
+            INSERT INTO keta.chat_sessions (objective_id, last_message_at)
+            SELECT $1, NOW() FROM generate_series(1, $2)
+            RETURNING id
+            """,
+            objective_id,
+            SESSIONS,
+        )
+        session_ids = [row["id"] for row in rows]
+
+        print(f"{SOURCES} sources, {SESSIONS} sessions\n")
+        print(f"{'messages':>10} {'counters p50':>14} {'join p50':>12}")
+        inserted = 0
+        for total in MESSAGE_STEPS:
+            await add_messages(db_pool, session_ids, total - inserted)
+            inserted = total
+            await db_pool.execute("ANALYZE keta.chat_messages")
+
+            stats = await repo.get_stats(objective_id)
+            assert stats["message_count"] == total, stats["message_count"]
+            counters = await time_query(lambda: repo.get_stats(objective_id))
+            joined = await time_query(lambda: db_pool.fetchrow(JOIN_QUERY, objective_id))
+            print(f"{total:>10,} {counters:>11.2f} ms {joined:>9.2f} ms")
+    finally:
+        await db_pool.execute("DELETE FROM keta.objectives WHERE id = $1", objective_id)
+        await db_pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())